@@ -0,0 +1,141 @@
+import threading
+from urllib.parse import urljoin
+
+import lxml.html
+import requests
+from requests.adapters import HTTPAdapter
+
+# Calea rapidă pentru acteinterne.pmb.ro, fără browser: formularul `cauta`
+# se trimite direct peste o sesiune HTTP cu conexiuni refolosite, lista de
+# rezultate se parsează cu lxml, iar PDF-ul se scrie în depozit pe bucăți.
+# Când ceva nu se poate rezolva așa (formular negăsit, rezultate randate din
+# JavaScript, link fără PDF), metodele întorc None și apelantul trece pe
+# Playwright.
+
+PREFIXE_ACTE = ("DISPOZITIE", "DL10")
+MARIME_BUCATA = 64 * 1024
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+def _e_pdf(resp):
+    tip = resp.headers.get("Content-Type", "").lower()
+    return "application/pdf" in tip or resp.url.lower().split("?")[0].endswith(".pdf")
+
+
+def link_pdf(html, url):
+    """Caută în pagina unui act linkul spre PDF, în ordinea din `download_pdf_from_page`:
+    embed/iframe, apoi primul <a> spre .pdf sau „Vezi documentul”."""
+    doc = lxml.html.fromstring(html)
+    for el in doc.xpath("//embed[@type='application/pdf'] | //iframe[contains(@src, '.pdf')]"):
+        src = el.get("src")
+        if src:
+            return urljoin(url, src), True
+    for a in doc.iter("a"):
+        href = a.get("href") or ""
+        if ".pdf" in href.lower():
+            return urljoin(url, href), True
+        if "vezi documentul" in a.text_content().strip().lower() and href and not href.startswith(("#", "javascript:")):
+            # încă o pagină intermediară; se urmărește o singură dată
+            return urljoin(url, href), False
+    return None, False
+
+
+class ClientActe:
+    """Sesiune HTTP către acteinterne.pmb.ro, sigură de folosit din mai multe thread-uri."""
+
+    def __init__(self, base_url, conexiuni=8, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.sesiune = requests.Session()
+        self.sesiune.headers["User-Agent"] = USER_AGENT
+        adaptor = HTTPAdapter(pool_connections=conexiuni, pool_maxsize=conexiuni)
+        self.sesiune.mount("http://", adaptor)
+        self.sesiune.mount("https://", adaptor)
+        self.lock = threading.Lock()
+        self._formular = None
+
+    def formular(self):
+        """(metodă, action, câmpuri implicite) ale formularului `cauta`, citite o singură dată."""
+        with self.lock:
+            if self._formular is None:
+                resp = self.sesiune.get(self.base_url, timeout=self.timeout)
+                resp.raise_for_status()
+                doc = lxml.html.fromstring(resp.content, base_url=resp.url)
+                forms = doc.xpath("//form[@name='cauta']")
+                if not forms:
+                    return None
+                form = forms[0]
+                campuri = {
+                    el.get("name"): el.get("value") or ""
+                    for el in form.xpath(".//input[@name] | .//select[@name]")
+                    if (el.get("type") or "").lower() not in ("submit", "button", "image", "checkbox", "radio")
+                }
+                action = urljoin(resp.url, form.get("action") or resp.url)
+                self._formular = ((form.get("method") or "get").lower(), action, campuri)
+            return self._formular
+
+    def cauta(self, dpg_nr, an):
+        """Lista (text, url) a linkurilor DISPOZITIE/DL10 pentru DPG-ul și anul date.
+
+        None dacă formularul nu a fost găsit sau pagina nu are niciun link
+        (posibil randată din JavaScript) – cazuri lăsate pe seama browserului.
+        """
+        formular = self.formular()
+        if formular is None:
+            return None
+        metoda, action, campuri = formular
+        date_form = dict(campuri, nr=str(dpg_nr), data_aprob=str(an))
+        if metoda == "post":
+            resp = self.sesiune.post(action, data=date_form, timeout=self.timeout)
+        else:
+            resp = self.sesiune.get(action, params=date_form, timeout=self.timeout)
+        resp.raise_for_status()
+        doc = lxml.html.fromstring(resp.content, base_url=resp.url)
+        anchors = doc.xpath("//a")
+        if not anchors:
+            return None
+        rezultate = []
+        for a in anchors:
+            text = a.text_content().strip()
+            if text.upper().startswith(PREFIXE_ACTE):
+                href = a.get("href") or ""
+                if not href or href.startswith(("#", "javascript:")):
+                    return None  # link deschis din JavaScript: doar browserul îl poate urma
+                rezultate.append((text, urljoin(resp.url, href)))
+        return rezultate
+
+    def _scrie(self, resp, depozit):
+        """Scrie corpul în depozit pe bucăți, verificând lungimea față de Content-Length."""
+        # cu Content-Encoding, Content-Length e lungimea comprimată: nu se poate compara
+        asteptat = None if resp.headers.get("Content-Encoding") else resp.headers.get("Content-Length")
+        h, marime = depozit.scrie_flux(resp.iter_content(MARIME_BUCATA), asteptat)
+        return h, marime, resp.url
+
+    def descarca_act(self, url, depozit):
+        """Urmează linkul unui act până la PDF și îl salvează în `depozit`.
+
+        Întoarce (hash, mărime, url PDF) sau None dacă PDF-ul nu a fost găsit.
+        """
+        for _ in range(3):
+            with self.sesiune.get(url, timeout=self.timeout, stream=True) as resp:
+                resp.raise_for_status()
+                if _e_pdf(resp):
+                    return self._scrie(resp, depozit)
+                url, direct = link_pdf(resp.content, resp.url)
+            if url is None:
+                return None
+            if direct:
+                with self.sesiune.get(url, timeout=self.timeout, stream=True) as resp:
+                    resp.raise_for_status()
+                    return self._scrie(resp, depozit)
+        return None
+
+    def descarca_pdf(self, url_pdf, depozit):
+        """Descarcă direct un PDF cu URL deja cunoscut (ex. din cache); None dacă nu mai e PDF."""
+        with self.sesiune.get(url_pdf, timeout=self.timeout, stream=True) as resp:
+            if not resp.ok or not _e_pdf(resp):
+                return None
+            return self._scrie(resp, depozit)
+
+    def close(self):
+        self.sesiune.close()
@@ -1,93 +1,50 @@
 # acte_interne_resume.py
 import asyncio
-import pandas as pd
-import os
-import re
-from datetime import datetime
+import time
 from urllib.parse import urljoin
 from playwright.async_api import async_playwright
 
-CSV_PATH = "dosare.csv"
-OUTPUT_DIR = "pdfs"
-BASE_URL = "https://acteinterne.pmb.ro/legis"
-ERROR_LOG = "erori.txt"
-PROCESATE_LOG = "procesate.txt"
+import tabel
+from acte_http import ClientActe
+from cache_acte import CacheActe
+from coada import CoadaJoburi, OK, FAILED, CANCELLED
+from depozit_pdf import DepozitPdf
+from jurnal import JurnalEvenimente
+from referinte_acte import parse_year_from_iso
+import referinte_acte
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+TABEL_PATH = tabel.cale("dosare")
+# PDF-urile stau o singură dată, sub hash-ul conținutului; indexul leagă
+# fiecare dosar care citează un act de același blob (vezi depozit_pdf.py)
+DEPOZIT_DIR = "pdfs_depozit"
+BASE_URL = "https://acteinterne.pmb.ro/legis"
+# Evenimente structurate (etape "acte", "acte.cautare", "acte.pdf") în loc de
+# erori.txt / procesate.txt; eșecurile de reluat: python jurnal.py esuate acte
+JURNAL_DB = "evenimente.sqlite"
 
-# === CONFIG pentru reluare ===
-START_ROW = 1438 # de unde vrei să începi (index 0-based, deci 96 = linia 97)
-# sau poți să pui START_DOSAR = "77" și să folosești extract_dosar_number
+# === CONFIG ===
+# Registrul joburilor (DPG, dată) înlocuiește START_ROW și setul `processed`:
+# la repornire se reiau doar joburile neterminate.
+LEDGER_DB = "joburi_acte.sqlite"
+REIA_ESUATE = False         # True = repune în coadă și joburile eșuate data trecută
+WORKERS = 4                 # câte contexte/pagini de browser lucrează în paralel
+HEADLESS = True
+MAX_CERERI_SIMULTANE = 4    # navigări/descărcări în zbor, peste toate paginile
+CERERI_PE_SECUNDA = 2.0     # ritm maxim de cereri către acteinterne.pmb.ro
+MARIME_COADA = 2 * WORKERS  # joburi rezervate din registru și ținute în memorie
+RAPORT_SECUNDE = 60
+# Calea rapidă: căutare + PDF direct peste HTTP; browserul doar pentru ce nu se rezolvă așa
+FAST_PATH_HTTP = True
+CONEXIUNI_HTTP = 8
+# Cache (DPG, an) -> rezultate și pagină act -> URL PDF; reluările sar peste
+# formular și tab-uri pentru actele deja rezolvate. Invalidare manuală:
+#   python cache_acte.py invalideaza [dpg [an]]
+CACHE_ACTE = "cache_acte.sqlite"
+CACHE_TTL_ZILE = 30
 
 # ==== utilitare ====
-def sanitize_filename(name: str) -> str:
-    name = re.sub(r"[^\w\-.]", "_", name)
-    return name[:200]
-
-def parse_year_from_iso(iso_date: str):
-    if not iso_date:
-        return None
-    try:
-        return datetime.fromisoformat(iso_date).year
-    except Exception:
-        return None
-
-def normalize_date(date_str: str):
-    if not date_str:
-        return None
-    s = date_str.strip()
-    formats = ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y")
-    for fmt in formats:
-        try:
-            return datetime.strptime(s, fmt).date().isoformat()
-        except Exception:
-            pass
-    m = re.search(r"(\d{4}-\d{2}-\d{2})", s)
-    if m:
-        return m.group(1)
-    m = re.search(r"(\d{2}/\d{2}/\d{4})", s)
-    if m:
-        try:
-            return datetime.strptime(m.group(1), "%d/%m/%Y").date().isoformat()
-        except Exception:
-            pass
-    m = re.search(r"(\d{2}-\d{2}-\d{4})", s)
-    if m:
-        try:
-            return datetime.strptime(m.group(1), "%d-%m-%Y").date().isoformat()
-        except Exception:
-            pass
-    return None
-
-def extract_dosar_number(dosar_text: str) -> str:
-    if not dosar_text:
-        return "DOSAR_UNKNOWN"
-    m = re.match(r"^\s*(\d+)", str(dosar_text))
-    if m:
-        return m.group(1)
-    cleaned = re.split(r"[\/\s]", str(dosar_text).strip())[0]
-    cleaned = re.sub(r"[^\w\-\.]", "_", cleaned)
-    return cleaned or "DOSAR_UNKNOWN"
-
-def extract_all_dpgs(text: str):
-    if not text or str(text).strip().upper() == "NONE":
-        return []
-    text = str(text)
-    pattern = re.compile(
-        r"DPG[:\s]*([0-9]+)(?:[^;\n\r]*?Dat[ăa][:]?\s*"
-        r"([0-9]{4}-[0-9]{2}-[0-9]{2}|[0-9]{2}/[0-9]{2}/[0-9]{4}|[0-9]{4}/[0-9]{2}/[0-9]{2}|[0-9]{2}-[0-9]{2}-[0-9]{4}))?",
-        flags=re.IGNORECASE,
-    )
-    results = []
-    for m in pattern.finditer(text):
-        dpg = m.group(1)
-        date_raw = m.group(2) if m.group(2) else None
-        date_iso = normalize_date(date_raw) if date_raw else None
-        year = parse_year_from_iso(date_iso) if date_iso else None
-        results.append({"dpg": dpg, "date_raw": date_raw, "date_iso": date_iso, "year": year})
-    return results
-
-async def download_pdf_from_page(new_page, base_url, target_name):
+async def download_pdf_from_page(new_page, depozit):
+    """Găsește PDF-ul din tab-ul actului și îl pune în depozit: (hash, mărime, url) sau None."""
     await new_page.wait_for_load_state("domcontentloaded")
     try:
         await new_page.wait_for_load_state("networkidle", timeout=2000)
@@ -132,42 +89,66 @@ async def download_pdf_from_page(new_page, base_url, target_name):
         resp = await new_page.request.get(pdf_url)
         if resp.ok:
             data = await resp.body()
-            filename = sanitize_filename(target_name)
-            path = os.path.join(OUTPUT_DIR, filename)
-            with open(path, "wb") as f:
-                f.write(data)
-            return path
+            asteptat = None if resp.headers.get("content-encoding") else resp.headers.get("content-length")
+            h, marime = depozit.scrie_flux([data], asteptat)
+            return h, marime, pdf_url
     except Exception as e:
         return None
     return None
 
-async def search_and_download_for_dpg(page, context, dpg_nr, date_iso, dosar_num, processed_set, solicitant):
-    key = (dpg_nr, date_iso)
-    if key in processed_set:
-        return
-    if not date_iso:
-        return
+class LimitatorCereri:
+    """Limitează cererile către server: cel mult `simultane` în zbor și
+    cel mult `pe_secunda` porniri pe secundă, indiferent de câte pagini lucrează."""
+
+    def __init__(self, simultane, pe_secunda):
+        self.semafor = asyncio.Semaphore(simultane)
+        self.interval = 1.0 / pe_secunda if pe_secunda else 0.0
+        self.urmatoarea = 0.0
+        self.lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.semafor.acquire()
+        async with self.lock:
+            acum = time.monotonic()
+            asteptare = self.urmatoarea - acum
+            self.urmatoarea = max(acum, self.urmatoarea) + self.interval
+        if asteptare > 0:
+            await asyncio.sleep(asteptare)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.semafor.release()
+
+
+async def search_and_download_for_dpg(page, context, dpg_nr, date_iso, dosar_num, limitator, depozit, cache, jurnal):
+    """Caută actul (DPG, dată) și pune în depozit PDF-urile găsite.
+
+    Lista de rezultate și URL-urile PDF rezolvate se salvează în `cache`,
+    evenimentele în `jurnal` (JurnalEvenimente).
+    Întoarce (stare, motiv, nr_pdfuri) pentru registrul de joburi.
+    """
     year = parse_year_from_iso(date_iso)
     if not year:
-        return
-    processed_set.add(key)
+        return CANCELLED, "fără an", 0
     try:
-        await page.goto(BASE_URL)
-        await page.fill("input[name='nr']", str(dpg_nr))
-        await page.fill("input[name='data_aprob']", str(year))
-        await page.click("form[name='cauta'] input[type='submit'], form[name='cauta'] button")
+        async with limitator:
+            await page.goto(BASE_URL)
+            await page.fill("input[name='nr']", str(dpg_nr))
+            await page.fill("input[name='data_aprob']", str(year))
+            await page.click("form[name='cauta'] input[type='submit'], form[name='cauta'] button")
     except Exception as e:
-        with open(ERROR_LOG, "a", encoding="utf-8") as f:
-            f.write(f"[ERR] Formular {dpg_nr}/{year} Dosar {dosar_num}: {e}\n")
-        return
+        jurnal.scrie("acte.cautare", FAILED, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr, eroare=e)
+        return FAILED, f"formular: {e}", 0
     try:
         await page.wait_for_selector("a", timeout=10000)
-    except Exception:
-        with open(ERROR_LOG, "a", encoding="utf-8") as f:
-            f.write(f"[WARN] Nu au apărut linkuri {dpg_nr}/{year} Dosar {dosar_num}\n")
-        return
+    except Exception as e:
+        jurnal.scrie("acte.cautare", FAILED, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                     eroare=e, mesaj="nu au apărut linkuri")
+        return FAILED, "fără linkuri", 0
     anchors = await page.query_selector_all("a")
     found = False
+    salvate = 0
+    rezultate = []  # (text, url act) pentru cache; None dacă un link nu are URL
     for a in anchors:
         try:
             text = (await a.inner_text()).strip()
@@ -176,64 +157,227 @@ async def search_and_download_for_dpg(page, context, dpg_nr, date_iso, dosar_num
         tupper = text.upper()
         if tupper.startswith("DISPOZITIE") or tupper.startswith("DL10"):
             found = True
+            href = (await a.get_attribute("href")) or ""
+            url_act = urljoin(page.url, href) if href and not href.startswith(("#", "javascript:")) else None
+            if rezultate is not None:
+                rezultate = rezultate + [(text, url_act)] if url_act else None
+            t0 = time.perf_counter()
             try:
-                async with context.expect_page() as new_page_info:
-                    await a.click()
-                new_page = await new_page_info.value
-                target_name = f"{dosar_num}_{dpg_nr}_{date_iso}.pdf"
-                saved = await download_pdf_from_page(new_page, new_page.url, target_name)
+                async with limitator:
+                    async with context.expect_page() as new_page_info:
+                        await a.click()
+                    new_page = await new_page_info.value
+                    saved = await download_pdf_from_page(new_page, depozit)
                 if saved:
-                    with open(PROCESATE_LOG, "a", encoding="utf-8") as f:
-                        f.write(f"{dosar_num},{dpg_nr},{date_iso},{target_name}\n")
+                    h, marime, pdf_url = saved
+                    depozit.adauga_act(dpg_nr, date_iso, h, marime, pdf_url)
+                    if url_act:
+                        cache.salveaza_pdf(url_act, pdf_url)
+                    salvate += 1
+                    jurnal.scrie("acte.pdf", OK, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                                 latenta=time.perf_counter() - t0, mesaj=h)
                 else:
-                    with open(ERROR_LOG, "a", encoding="utf-8") as f:
-                        f.write(f"[WARN] Nu am găsit PDF link '{text}' DPG {dpg_nr}/{year} Dosar {dosar_num}\n")
+                    jurnal.scrie("acte.pdf", FAILED, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                                 latenta=time.perf_counter() - t0, mesaj=f"nu am găsit PDF link '{text}'")
                 try:
                     await new_page.close()
                 except Exception:
                     pass
             except Exception as e:
-                with open(ERROR_LOG, "a", encoding="utf-8") as f:
-                    f.write(f"[ERR] Problema tab link '{text}' DPG {dpg_nr}/{year} Dosar {dosar_num}: {e}\n")
+                jurnal.scrie("acte.pdf", FAILED, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                             latenta=time.perf_counter() - t0, eroare=e, mesaj=f"tab link '{text}': {e}")
+    if rezultate is not None:
+        cache.salveaza_cautare(dpg_nr, year, rezultate)
     if not found:
-        with open(ERROR_LOG, "a", encoding="utf-8") as f:
-            f.write(f"[INFO] Nu s-au găsit DISPOZITIE/DL10 pentru {dpg_nr}/{year} Dosar {dosar_num}\n")
+        return CANCELLED, "fără DISPOZITIE/DL10", 0
+    if not salvate:
+        return FAILED, "niciun PDF salvat", 0
+    return OK, None, salvate
+
+async def descarca_http(client, dpg_nr, date_iso, dosar_num, limitator, depozit, cache, jurnal, live=True):
+    """Același job ca `search_and_download_for_dpg`, fără browser.
+
+    Întâi se folosește cache-ul (rezultatele căutării și URL-urile PDF); cu
+    `live=False` nu se face nicio căutare sau rezolvare nouă peste HTTP.
+    Întoarce (stare, motiv, nr_pdfuri) sau None dacă jobul trebuie reluat în Playwright.
+    """
+    year = parse_year_from_iso(date_iso)
+    if not year:
+        return CANCELLED, "fără an", 0
+    rezultate = cache.cauta(dpg_nr, year)
+    if rezultate is None:
+        if not live:
+            return None
+        async with limitator:
+            rezultate = await asyncio.to_thread(client.cauta, dpg_nr, year)
+        if rezultate is None:
+            return None
+        cache.salveaza_cautare(dpg_nr, year, rezultate)
+    if not rezultate:
+        return CANCELLED, "fără DISPOZITIE/DL10", 0
+    salvate = 0
+    for text, url in rezultate:
+        t0 = time.perf_counter()
+        saved = None
+        url_pdf = cache.pdf(url)
+        if url_pdf:
+            async with limitator:
+                saved = await asyncio.to_thread(client.descarca_pdf, url_pdf, depozit)
+        if saved is None:
+            if not live:
+                return None
+            async with limitator:
+                saved = await asyncio.to_thread(client.descarca_act, url, depozit)
+            if saved is None:
+                return None
+            cache.salveaza_pdf(url, saved[2])
+        h, marime, pdf_url = saved
+        depozit.adauga_act(dpg_nr, date_iso, h, marime, pdf_url)
+        salvate += 1
+        jurnal.scrie("acte.pdf", OK, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                     latenta=time.perf_counter() - t0, mesaj=h)
+    return OK, None, salvate
 
 # ==== flux principal ====
-async def main():
-    df = pd.read_csv(CSV_PATH, dtype=str, encoding="utf-8").fillna("")
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context()
-        page = await context.new_page()
-        processed = set()
-
-        for idx, row in df.iterrows():
-            if idx < START_ROW:
-                continue  # sari peste ce e deja procesat
-
-            dosar_text = row.get("Dosar PMB", "")
-            dosar_num = extract_dosar_number(dosar_text)
-            solicitant = row.get("Solicitant", "").strip() or "SOLICITANT_UNKNOWN"
-            solutie = row.get("Soluție", "")
-            istorie = row.get("Istorie acte", "")
-
-            dpgs = []
-            dpgs += extract_all_dpgs(solutie)
-            dpgs += extract_all_dpgs(istorie)
-            if not dpgs:
+def referinte_din_tabel(acte):
+    """(dpg, data_iso, dosar) unice din tabelul actelor (referinte_acte.py), în ordinea tabelului.
+
+    Un act citat de mai multe dosare apare o dată pentru fiecare dosar.
+    Intrările fără dată nu pot fi căutate (căutarea cere anul) și se sar.
+    """
+    unice = acte[acte["an"].notna()].drop_duplicates(["dpg", "data", "dosar"])
+    return list(zip(unice["dpg"], unice["data"], unice["dosar"]))
+
+
+async def alimenteaza(ledger, coada):
+    """Mută joburi `pending` din registru în coada asyncio (mărginită)."""
+    while True:
+        job = await asyncio.to_thread(ledger.ia_urmatorul)
+        if job is None:
+            break
+        await coada.put(job)
+    for _ in range(WORKERS):
+        await coada.put(None)
+
+
+async def worker(browser, ledger, coada, limitator, contor, depozit, cache, client, jurnal):
+    # contextul de browser se deschide doar la primul job care are nevoie de el
+    context = page = None
+    try:
+        while True:
+            job = await coada.get()
+            if job is None:
+                break
+            dpg_nr, date_iso, dosar_num = job
+            t0 = time.perf_counter()
+            clasa_eroare = None
+            if depozit.are_act(dpg_nr, date_iso):
+                # deja descărcat (ex. importat din vechiul folder pdfs/)
+                ledger.marcheaza(dpg_nr, date_iso, OK, "deja în depozit")
+                contor["joburi"] += 1
                 continue
+            rezultat = None
+            try:
+                rezultat = await descarca_http(
+                    client, dpg_nr, date_iso, dosar_num, limitator, depozit, cache, jurnal, live=FAST_PATH_HTTP
+                )
+            except Exception as e:
+                jurnal.scrie("acte.http", FAILED, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                             eroare=e, mesaj=f"{e}; trec pe browser")
+            if rezultat is None:
+                contor["fallback"] += 1
+                if context is None:
+                    context = await browser.new_context()
+                    page = await context.new_page()
+                try:
+                    rezultat = await search_and_download_for_dpg(
+                        page, context, dpg_nr, date_iso, dosar_num, limitator, depozit, cache, jurnal
+                    )
+                except Exception as e:
+                    rezultat = FAILED, f"{type(e).__name__}: {e}", 0
+                    clasa_eroare = type(e).__name__
+                    # o pagină într-o stare proastă nu se mai refolosește
+                    try:
+                        await page.close()
+                    except Exception:
+                        pass
+                    page = await context.new_page()
+            stare, motiv, salvate = rezultat
+            ledger.marcheaza(dpg_nr, date_iso, stare, motiv, pdfuri=salvate)
+            jurnal.scrie("acte", stare, f"{dpg_nr}/{date_iso}", dosar_num, dpg_nr,
+                         latenta=time.perf_counter() - t0, eroare=clasa_eroare, mesaj=motiv)
+            contor["joburi"] += 1
+            contor["pdfuri"] += salvate
+    finally:
+        if context is not None:
+            await context.close()
+
+
+async def raporteaza(ledger, coada, contor, cache, start):
+    while True:
+        await asyncio.sleep(RAPORT_SECUNDE)
+        minute = (time.time() - start) / 60
+        print(f"📊 {contor['pdfuri']} PDF-uri din {contor['joburi']} joburi, "
+              f"{contor['pdfuri'] / minute:.1f} PDF-uri/min, {contor['fallback']} prin browser | "
+              f"coadă: {coada.qsize()} în memorie, {ledger.numar_pending()} în registru | {cache.raport()}")
 
-            seen_local = set()
-            for entry in dpgs:
-                dpg_nr = entry["dpg"]
-                date_iso = entry["date_iso"]
-                if (dpg_nr, date_iso) in seen_local:
-                    continue
-                seen_local.add((dpg_nr, date_iso))
-                await search_and_download_for_dpg(page, context, dpg_nr, date_iso, dosar_num, processed, solicitant)
 
-        await browser.close()
+async def main():
+    with JurnalEvenimente(JURNAL_DB) as jurnal:
+        # referințele (DPG, dată) vin din tabelul actelor, reconstruit doar dacă tabelul sursă s-a schimbat
+        referinte = referinte_din_tabel(referinte_acte.incarca(TABEL_PATH))
+        ledger = CoadaJoburi(LEDGER_DB)
+        depozit = DepozitPdf(DEPOZIT_DIR)
+        cache = CacheActe(CACHE_ACTE, ttl=CACHE_TTL_ZILE * 24 * 3600)
+        try:
+            await descarca_toate(referinte, ledger, depozit, cache, jurnal)
+        finally:
+            ledger.close()
+            depozit.close()
+            cache.close()
+
+
+async def descarca_toate(referinte, ledger, depozit, cache, jurnal):
+    # un singur job per act; toate dosarele care îl citează se leagă în depozit
+    ledger.adauga(referinte)
+    depozit.leaga((dosar, dpg, data) for dpg, data, dosar in referinte)
+    if REIA_ESUATE:
+        n = ledger.reia_esuate()
+        print(f"🔁 {n} joburi eșuate repuse în coadă")
+    print(f"📋 Registru: {ledger.statistici()}")
+
+    coada = asyncio.Queue(maxsize=MARIME_COADA)
+    limitator = LimitatorCereri(MAX_CERERI_SIMULTANE, CERERI_PE_SECUNDA)
+    contor = {"joburi": 0, "pdfuri": 0, "fallback": 0}
+    # clientul HTTP se folosește și fără calea rapidă, pentru PDF-urile cu URL din cache
+    client = ClientActe(BASE_URL, conexiuni=CONEXIUNI_HTTP)
+    start = time.time()
+
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=HEADLESS)
+            raport = asyncio.create_task(raporteaza(ledger, coada, contor, cache, start))
+            try:
+                await asyncio.gather(
+                    alimenteaza(ledger, coada),
+                    *(worker(browser, ledger, coada, limitator, contor, depozit, cache, client, jurnal)
+                      for _ in range(WORKERS)),
+                )
+            finally:
+                raport.cancel()
+                await browser.close()
+    finally:
+        client.close()
+
+    minute = (time.time() - start) / 60
+    print(f"✅ Gata: {contor['pdfuri']} PDF-uri în {minute:.1f} min "
+          f"({contor['pdfuri'] / minute if minute else 0:.1f} PDF-uri/min)")
+    print(f"📋 Registru: {ledger.statistici()}")
+    s = depozit.statistici()
+    print(f"🗄️  Depozit: {s['acte']} acte, {s['blob_uri']} PDF-uri unice "
+          f"({s['octeti'] / 2**20:.1f} MB), {s['legaturi']} legături dosar-act")
+    print(f"🗃️  {cache.raport()}")
+    print(f"🧾 Jurnal acte: {jurnal.statistici('acte')}")
 
 if __name__ == "__main__":
     asyncio.run(main())
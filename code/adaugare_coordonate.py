@@ -1,93 +1,113 @@
-import pandas as pd
 import time
 import re
 from geopy.geocoders import Nominatim
 from geopy.extra.rate_limiter import RateLimiter
-import os
 import sys
 
+import tabel
+from cache_geocodare import CacheGeocodare
+from jurnal import JurnalEvenimente, JURNAL_DB
+from jurnal_coordonate import JurnalCoordonate, JURNAL_COORDONATE, OK, NEGASIT, FAILED
+
 # ---------------- CONFIG ----------------
-CSV_PATH = "dosare_geocode_cu_pdfuri.csv"
+TABEL_PATH = tabel.cale("dosare_geocode_cu_pdfuri")
 TXT_INPUT = "negasite_clean.txt"
-TXT_FAILED = "negasite2.txt"
+TXT_FAILED = "negasite2.txt"   # exportat la final din jurnal: doar eșecurile
+ETAPA = "geocodare.coordonate"
+REIA_ESUATE = False  # True = reîncearcă și rândurile cu eroare data trecută
 USER_AGENT = "geo_updater_pmb/1.0"
 # ----------------------------------------
 
-# Încarcă CSV-ul complet
-df = pd.read_csv(CSV_PATH)
+# Doar numărul de rânduri, pentru validarea liniilor; coordonatele găsite se
+# adaugă în jurnalul de corecții și se scriu în tabel o singură dată, la final
+numar_randuri = len(tabel.citeste(TABEL_PATH, columns=["latitude"]))
 
-# Încarcă progresul din negasite2.txt (dacă există)
-processed_lines = set()
-if os.path.exists(TXT_FAILED):
-    with open(TXT_FAILED, "r", encoding="utf-8") as f:
-        for line in f:
-            if line.startswith(("DONE:", "FAIL:", "ERROR:")):
-                num = re.findall(r"\d+", line)
-                if num:
-                    processed_lines.add(int(num[0]))
+# Progresul vine din jurnalul de corecții: orice linie cu o intrare (găsită,
+# negăsită sau eroare) a fost deja procesată
+corectii = JurnalCoordonate(JURNAL_COORDONATE)
+processed_lines = corectii.procesate(fara_stari=(FAILED,) if REIA_ESUATE else ())
+jurnal = JurnalEvenimente(JURNAL_DB)
 
 # Inițializează geolocatorul
 geolocator = Nominatim(user_agent=USER_AGENT)
-geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1, swallow_exceptions=False)
+# aceleași rezultate ca providerul "nominatim" din co.py (serverul public)
+cache = CacheGeocodare(provider="nominatim")
 
 # Citește toate liniile din fișierul negasite_clean.txt
 with open(TXT_INPUT, "r", encoding="utf-8") as f:
     lines = f.readlines()
 
 total = len(lines)
-out = open(TXT_FAILED, "a", encoding="utf-8")
 
 print(f"🚀 Începem procesarea ({total} adrese totale)...\n")
 
-# Parcurgem toate adresele
-for idx, line in enumerate(lines, start=1):
-    # Extrage linia și adresa
-    match = re.match(r"Linia\s+(\d+):\s*(.*)", line.strip(), flags=re.IGNORECASE)
-    if not match:
-        continue
-
-    linie_idx = int(match.group(1))
-    adresa = match.group(2).strip()
-
-    # Sărim dacă a fost deja procesată
-    if linie_idx in processed_lines:
-        continue
-
-    # Afișare progres în terminal
-    progress = idx / total * 100
-    sys.stdout.write(f"\r⏳ {idx}/{total} ({progress:.1f}%) — Linia {linie_idx}: {adresa[:60]}...")
-    sys.stdout.flush()
-
-    try:
-        location = geocode(f"{adresa}, București, România")
-        if location:
-            lat, lon = location.latitude, location.longitude
-            print(f"\n✅ Găsit: {adresa} -> ({lat:.6f}, {lon:.6f})")
-
-            # Actualizează CSV-ul (scădem 1 pentru a compensa headerul)
-            row_idx = linie_idx - 1
-            if 0 <= row_idx < len(df):
-                df.at[row_idx, "latitude"] = lat
-                df.at[row_idx, "longitude"] = lon
-                df.to_csv(CSV_PATH, index=False)  # salvăm imediat
-                out.write(f"DONE: Linia {linie_idx}: {adresa} -> ({lat:.6f}, {lon:.6f})\n")
-            else:
-                print(f"⚠️  Linia {linie_idx} e în afara limitelor CSV-ului.")
-                out.write(f"ERROR: Linia {linie_idx}: {adresa} — index invalid\n")
+# Parcurgem toate adresele; compactarea rulează și la Ctrl+C / eroare,
+# deci tot ce s-a găsit ajunge în tabel
+try:
+    for idx, line in enumerate(lines, start=1):
+        # Extrage linia și adresa
+        match = re.match(r"Linia\s+(\d+):\s*(.*)", line.strip(), flags=re.IGNORECASE)
+        if not match:
+            continue
+
+        linie_idx = int(match.group(1))
+        adresa = match.group(2).strip()
+
+        # Sărim dacă a fost deja procesată
+        if linie_idx in processed_lines:
+            continue
+
+        # Afișare progres în terminal
+        progress = idx / total * 100
+        sys.stdout.write(f"\r⏳ {idx}/{total} ({progress:.1f}%) — Linia {linie_idx}: {adresa[:60]}...")
+        sys.stdout.flush()
+
+        t0 = time.perf_counter()
+        din_cache = False
+        try:
+            location, din_cache = cache.geocodeaza(f"{adresa}, București, România", geocode)
+            if location:
+                lat, lon = location.latitude, location.longitude
+                print(f"\n✅ Găsit: {adresa} -> ({lat:.6f}, {lon:.6f})")
+
+                # Corecția intră în jurnal (scădem 1 pentru a compensa headerul)
+                if 0 <= linie_idx - 1 < numar_randuri:
+                    corectii.adauga(linie_idx, OK, lat, lon, adresa)
+                    jurnal.scrie(ETAPA, OK, linie_idx, latenta=time.perf_counter() - t0,
+                                 mesaj=f"{adresa} -> ({lat:.6f}, {lon:.6f})")
+                else:
+                    print(f"⚠️  Linia {linie_idx} e în afara limitelor CSV-ului.")
+                    corectii.adauga(linie_idx, FAILED, adresa=adresa, eroare="IndexInvalid")
+                    jurnal.scrie(ETAPA, FAILED, linie_idx, eroare="IndexInvalid", mesaj=adresa)
 
-        else:
-            print(f"\n❌ Nu s-au găsit coordonate pentru: {adresa}")
+            else:
+                print(f"\n❌ Nu s-au găsit coordonate pentru: {adresa}")
+                corectii.adauga(linie_idx, NEGASIT, adresa=adresa)
+                jurnal.scrie(ETAPA, NEGASIT, linie_idx, latenta=time.perf_counter() - t0, mesaj=adresa)
+
+        except Exception as e:
+            print(f"\n⚠️  Eroare la linia {linie_idx}: {e}")
+            corectii.adauga(linie_idx, FAILED, adresa=adresa, eroare=e)
+            jurnal.scrie(ETAPA, FAILED, linie_idx, latenta=time.perf_counter() - t0, eroare=e, mesaj=adresa)
+
+        processed_lines.add(linie_idx)
+        if not din_cache:
+            time.sleep(1)  # pauză pentru a respecta limita Nominatim
+finally:
+    # O singură scriere a tabelului, cu toate corecțiile din jurnal
+    actualizate = corectii.compacteaza(TABEL_PATH)
+    print(f"\n🗜️  {actualizate} rânduri actualizate în {TABEL_PATH}")
+
+# Lista eșecurilor, pentru o trecere ulterioară (query în jurnal, nu parsare de text)
+with open(TXT_FAILED, "w", encoding="utf-8") as out:
+    for linie_idx, stare, adresa, eroare in corectii.esuate():
+        if stare == NEGASIT:
             out.write(f"FAIL: Linia {linie_idx}: {adresa}\n")
-
-    except Exception as e:
-        print(f"\n⚠️  Eroare la linia {linie_idx}: {e}")
-        out.write(f"ERROR: Linia {linie_idx}: {adresa} — {e}\n")
-
-    out.flush()
-    processed_lines.add(linie_idx)
-    time.sleep(1)  # pauză pentru a respecta limita Nominatim
-
-# Salvare finală
-df.to_csv(CSV_PATH, index=False)
-out.close()
+        else:
+            out.write(f"ERROR: Linia {linie_idx}: {adresa} — {eroare}\n")
+corectii.close()
+jurnal.close()
+print(f"\n{cache.raport()}")
+cache.close()
 print("\n🏁 Proces complet! CSV actualizat și 'negasite2.txt' generat.")
@@ -0,0 +1,179 @@
+import os
+import sys
+import threading
+import zlib
+
+# Arhivă pentru corpusul responses/: în loc de zeci de mii de fișiere HTML
+# separate, paginile stau comprimate (zlib, fiecare înregistrare separat, deci
+# se pot citi individual) în câteva fișiere mari ("shard-uri"), plus un index
+# text cu o linie per dosar: id, shard, offset, lungime.
+#
+# Indexul e append-only; la o re-descărcare ultima linie pentru un id câștigă.
+# Datele se scriu înaintea liniei de index, deci un crash lasă cel mult niște
+# octeți orfani la finalul unui shard și, eventual, o ultimă linie de index
+# neterminată (fără "\n"). O astfel de linie se ignoră la citire și se taie
+# din fișier când arhiva se redeschide pentru scriere, ca următoarea intrare
+# să nu se lipească de ea.
+
+INDEX_FILE = "index.tsv"
+MARIME_SHARD = 256 * 1024 * 1024
+NIVEL_COMPRESIE = 6
+
+
+def nume_shard(nr):
+    return f"shard-{nr:05d}.z"
+
+
+def citeste_index(folder, repara=False):
+    """Întoarce dict id -> (shard, offset, lungime).
+
+    Doar liniile complete (terminate cu "\n", patru numere) contează; cu
+    `repara`, o ultimă linie neterminată se taie din fișier.
+    """
+    index = {}
+    path = os.path.join(folder, INDEX_FILE)
+    if not os.path.exists(path):
+        return index
+    with open(path, "rb") as f:
+        continut = f.read()
+    capat = continut.rfind(b"\n") + 1  # după ultima linie completă
+    for numar, line in enumerate(continut[:capat].splitlines(), 1):
+        try:
+            dosar_id, shard, offset, lungime = (int(p) for p in line.split(b"\t"))
+        except ValueError:
+            print(f"⚠️ {path}: linia {numar} e invalidă și se ignoră: {line[:80]!r}")
+            continue
+        index[dosar_id] = (shard, offset, lungime)
+    if capat < len(continut):
+        print(f"⚠️ {path}: ultima linie e neterminată (crash la scriere) și se ignoră")
+        if repara:
+            with open(path, "r+b") as f:
+                f.truncate(capat)
+    return index
+
+
+class ScriitorArhiva:
+    """Adaugă pagini în arhivă; sigur de folosit din mai multe thread-uri."""
+
+    def __init__(self, folder, marime_shard=MARIME_SHARD):
+        self.folder = folder
+        self.marime_shard = marime_shard
+        self.lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        citeste_index(folder, repara=True)
+
+        shards = sorted(f for f in os.listdir(folder) if f.startswith("shard-"))
+        self.shard = int(shards[-1][6:11]) if shards else 0
+        self.f_shard = open(os.path.join(folder, nume_shard(self.shard)), "ab")
+        self.f_index = open(os.path.join(folder, INDEX_FILE), "a", encoding="utf-8")
+
+    def adauga(self, dosar_id, html):
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+        data = zlib.compress(html, NIVEL_COMPRESIE)
+        with self.lock:
+            if self.f_shard.tell() + len(data) > self.marime_shard and self.f_shard.tell() > 0:
+                self.f_shard.close()
+                self.shard += 1
+                self.f_shard = open(os.path.join(self.folder, nume_shard(self.shard)), "ab")
+            offset = self.f_shard.tell()
+            self.f_shard.write(data)
+            self.f_shard.flush()
+            self.f_index.write(f"{int(dosar_id)}\t{self.shard}\t{offset}\t{len(data)}\n")
+            self.f_index.flush()
+
+    def close(self):
+        with self.lock:
+            self.f_shard.close()
+            self.f_index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CititorArhiva:
+    """Acces aleator (`citeste`) și parcurgere ordonată după id (`itereaza`)."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.index = citeste_index(folder)
+        self._fisiere = {}
+        self._lock = threading.Lock()  # doar pentru seek + read, unde nu există os.pread
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, dosar_id):
+        return dosar_id in self.index
+
+    def ids(self):
+        return sorted(self.index)
+
+    def _fisier(self, shard):
+        f = self._fisiere.get(shard)
+        if f is None:
+            f = open(os.path.join(self.folder, nume_shard(shard)), "rb")
+            self._fisiere[shard] = f
+        return f
+
+    def citeste_bytes(self, dosar_id):
+        shard, offset, lungime = self.index[dosar_id]
+        if hasattr(os, "pread"):
+            # pread nu folosește poziția comună a fișierului, deci cititorul poate
+            # fi moștenit de procese fork-uite fără să-și încurce citirile
+            return zlib.decompress(os.pread(self._fisier(shard).fileno(), lungime, offset))
+        # Windows: fără pread (și fără fork), fiecare proces are propriul cititor;
+        # thread-urile aceluiași cititor își serializează seek + read
+        with self._lock:
+            f = self._fisier(shard)
+            f.seek(offset)
+            return zlib.decompress(f.read(lungime))
+
+    def citeste(self, dosar_id):
+        return self.citeste_bytes(dosar_id).decode("utf-8")
+
+    def itereaza(self, ids=None):
+        """Generează (id, html) în ordinea crescătoare a id-urilor."""
+        for dosar_id in (self.ids() if ids is None else ids):
+            if dosar_id in self.index:
+                yield dosar_id, self.citeste(dosar_id)
+
+    def close(self):
+        for f in self._fisiere.values():
+            f.close()
+        self._fisiere.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def importa_folder(folder_html, folder_arhiva, suprascrie=False):
+    """Mută în arhivă fișierele `{id}.html` existente (ordonate după id).
+
+    Id-urile aflate deja în arhivă (re-descărcări mai noi) se sar, dacă nu
+    se cere `suprascrie`.
+    """
+    existente = set() if suprascrie else set(citeste_index(folder_arhiva))
+    ids = sorted(
+        int(name[:-5]) for name in os.listdir(folder_html)
+        if name.endswith(".html") and name[:-5].isdigit() and int(name[:-5]) not in existente
+    )
+    with ScriitorArhiva(folder_arhiva) as scriitor:
+        for dosar_id in ids:
+            with open(os.path.join(folder_html, f"{dosar_id}.html"), "rb") as f:
+                scriitor.adauga(dosar_id, f.read())
+    return len(ids)
+
+
+if __name__ == "__main__":
+    # python arhiva.py responses responses_arhiva
+    sursa = sys.argv[1] if len(sys.argv) > 1 else "responses"
+    destinatie = sys.argv[2] if len(sys.argv) > 2 else "responses_arhiva"
+    n = importa_folder(sursa, destinatie)
+    print(f"✅ Importate {n} pagini din {sursa} în {destinatie}")
@@ -0,0 +1,1124 @@
+import argparse
+import math
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from date_sintetice import (NUME, PRENUME, SOLUTII, STRAZI, TIPURI, _adresa, adrese_sintetice,
+                            dosare_cu_acte, genereaza_corpus, pagina_sintetica, solutii_sintetice, texte_acte)
+
+# Benchmark-uri pentru etapele pipeline-ului. Dacă nu există date reale,
+# se generează un corpus sintetic cu aceeași structură ca paginile www3.pmb.ro.
+# Generatoarele sunt în date_sintetice.py; testele diferențiale (implementarea
+# nouă vs cea originală) din tests/ le folosesc și ele: `python -m pytest tests`.
+#
+#   python benchmark.py arhiva --n 5000
+#   python benchmark.py arhiva --loose responses --arhiva responses_arhiva
+#   python benchmark.py fragment --n 1000
+#   python benchmark.py parse --n 4000 --workers 1 2 4 8
+#   python benchmark.py parser --n 2000 [--arhiva responses_arhiva]
+#   python benchmark.py tabel --randuri 200000
+#   python benchmark.py solutii --randuri 3000000
+#   python benchmark.py pdfuri --randuri 43000 --pdfuri 5000 --factor 10
+#   python benchmark.py acte --n 200 --workers 4 --latenta 50
+#   python benchmark.py nomenclator --strazi 3000 --interogari 20000 [--osm bucuresti.osm.bz2]
+#   python benchmark.py adrese --strazi 3000 --n 20000
+#   python benchmark.py grupare --proprietati 20000 --variante 6
+#   python benchmark.py normalizare --n 100000 [--golden normalizare_golden.tsv] [--procese 4]
+#   python benchmark.py coordonate --randuri 50000 --hituri 300
+#   python benchmark.py geocodare --n 5000 --latenta 50 --simultane 1 8 32 --erori 0.05
+
+
+def _ocupat_pe_disc(paths):
+    """Spațiul alocat efectiv pe disc (blocuri), nu doar suma dimensiunilor."""
+    return sum(os.stat(p).st_blocks * 512 for p in paths)
+
+
+def _goleste_cache(paths):
+    # cât se poate fără root: cerem kernelului să uite paginile din cache
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for p in paths:
+        fd = os.open(p, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def bench_arhiva(args):
+    from arhiva import CititorArhiva, importa_folder
+
+    tmp = None
+    loose = args.loose
+    if loose is None:
+        tmp = tempfile.mkdtemp(prefix="bench_arhiva_")
+        loose = os.path.join(tmp, "responses")
+        print(f"Generez {args.n} pagini sintetice în {loose} ...")
+        genereaza_corpus(loose, args.n)
+    arhiva = args.arhiva or os.path.join(tmp or tempfile.mkdtemp(prefix="bench_arhiva_"), "arhiva")
+    if not os.path.isdir(arhiva):
+        t0 = time.perf_counter()
+        importa_folder(loose, arhiva)
+        print(f"Import în arhivă: {time.perf_counter() - t0:.2f}s")
+
+    fisiere_loose = [os.path.join(loose, f) for f in os.listdir(loose) if f.endswith(".html")]
+    fisiere_arhiva = [os.path.join(arhiva, f) for f in os.listdir(arhiva)]
+    max_id = max(int(os.path.basename(f)[:-5]) for f in fisiere_loose)
+
+    # scanarea veche din date.py: os.path.exists + open pentru fiecare id
+    _goleste_cache(fisiere_loose)
+    t0 = time.perf_counter()
+    octeti_loose = 0
+    for i in range(1, max_id + 1):
+        path = os.path.join(loose, f"{i}.html")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            octeti_loose += len(f.read())
+    t_loose = time.perf_counter() - t0
+
+    _goleste_cache(fisiere_arhiva)
+    t0 = time.perf_counter()
+    octeti_arhiva = 0
+    with CititorArhiva(arhiva) as cititor:
+        for _, html in cititor.itereaza():
+            octeti_arhiva += len(html)
+    t_arhiva = time.perf_counter() - t0
+    assert octeti_loose == octeti_arhiva, "arhiva nu conține aceleași pagini"
+
+    disc_loose = _ocupat_pe_disc(fisiere_loose)
+    disc_arhiva = _ocupat_pe_disc(fisiere_arhiva)
+    print(f"{'':10}{'fișiere':>10}{'scan rece (s)':>16}{'pe disc (MB)':>15}")
+    print(f"{'loose':10}{len(fisiere_loose):>10}{t_loose:>16.2f}{disc_loose / 2**20:>15.1f}")
+    print(f"{'arhivă':10}{len(fisiere_arhiva):>10}{t_arhiva:>16.2f}{disc_arhiva / 2**20:>15.1f}")
+    print(f"Spațiu: {disc_loose / disc_arhiva:.1f}x mai mic, scan: {t_loose / t_arhiva:.1f}x mai rapid")
+
+    if tmp and not args.pastreaza:
+        shutil.rmtree(tmp)
+
+
+def _pagini(args):
+    """(id, html) din arhiva dată cu --arhiva sau din corpusul sintetic."""
+    if getattr(args, "arhiva", None):
+        from arhiva import CititorArhiva
+
+        with CititorArhiva(args.arhiva) as cititor:
+            ids = cititor.ids()[:args.n]
+            yield from cititor.itereaza(ids)
+    else:
+        for i in range(1, args.n + 1):
+            yield i, pagina_sintetica(i)
+
+
+def bench_fragment(args):
+    from date import parse_dosar
+    from fragment import extrage_fragment
+
+    pagini = list(_pagini(args))
+    t0 = time.perf_counter()
+    fragmente = [extrage_fragment(html) for _, html in pagini]
+    t_extragere = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    rows_full = [parse_dosar(html) for _, html in pagini]
+    t_full = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    rows_frag = [parse_dosar(fragment) for fragment in fragmente]
+    t_frag = time.perf_counter() - t0
+
+    diferite = [i for (i, _), a, b in zip(pagini, rows_full, rows_frag) if a != b]
+    marime_full = sum(len(html.encode("utf-8")) for _, html in pagini)
+    marime_frag = sum(len(f.encode("utf-8")) for f in fragmente)
+    print(f"{len(pagini)} pagini, extragere fragmente: {t_extragere:.2f}s")
+    print(f"Mărime: {marime_full / 2**20:.1f} MB -> {marime_frag / 2**20:.1f} MB ({marime_full / marime_frag:.1f}x)")
+    print(f"Parsare: {t_full:.2f}s -> {t_frag:.2f}s ({t_full / t_frag:.1f}x)")
+    print(f"Rânduri identice: {len(pagini) - len(diferite)}/{len(pagini)}"
+          + (f" — diferă: {diferite[:20]}" if diferite else ""))
+
+
+def bench_parse(args):
+    import date
+
+    tmp = None
+    if args.arhiva:
+        date.ARHIVA_FOLDER = args.arhiva
+    else:
+        tmp = tempfile.mkdtemp(prefix="bench_parse_")
+        date.ARHIVA_FOLDER = os.path.join(tmp, "arhiva")
+        from arhiva import ScriitorArhiva
+
+        with ScriitorArhiva(date.ARHIVA_FOLDER) as scriitor:
+            for i in range(1, args.n + 1):
+                scriitor.adauga(i, pagina_sintetica(i))
+    ids = date.ids_disponibile()[:args.n]
+    out_dir = tmp or tempfile.mkdtemp(prefix="bench_parse_")
+
+    referinta = None
+    print(f"{'workeri':>8}{'fișiere/s':>12}{'per worker':>12}{'accelerare':>12}")
+    baza = None
+    for workers in args.workers:
+        out = os.path.join(out_dir, f"dosare_{workers}.csv")
+        t0 = time.perf_counter()
+        fisiere, _ = date.scrie_csv(date.batch_uri(ids, workers=workers, chunk=args.chunk), out)
+        viteza = fisiere / (time.perf_counter() - t0)
+        baza = baza or viteza
+        print(f"{workers:>8}{viteza:>12.0f}{viteza / workers:>12.0f}{viteza / baza:>11.1f}x")
+
+        with open(out, "rb") as f:
+            continut = f.read()
+        if referinta is None:
+            referinta = continut
+        elif continut != referinta:
+            print(f"⚠️  ieșirea cu {workers} workeri diferă de cea serială")
+
+    shutil.rmtree(out_dir)
+
+
+def _latente(fn, documente):
+    latente = []
+    rezultate = []
+    for doc in documente:
+        t0 = time.perf_counter()
+        rezultate.append(fn(doc))
+        latente.append((time.perf_counter() - t0) * 1000)
+    return rezultate, latente
+
+
+def _rezumat(latente):
+    q = statistics.quantiles(latente, n=20)
+    return f"medie {statistics.mean(latente):6.2f} ms  p50 {q[9]:6.2f} ms  p95 {q[18]:6.2f} ms"
+
+
+def bench_parser(args):
+    """Latența per document: bs4 vs lxml (paritatea: tests/test_parser.py)."""
+    import date
+
+    pagini = list(_pagini(args))
+    ids = [i for i, _ in pagini]
+    rows_bs4, lat_bs4 = _latente(date.parse_dosar, [html for _, html in pagini])
+    rows_lxml, lat_lxml = _latente(date.parse_dosar_lxml, [html.encode("utf-8") for _, html in pagini])
+
+    print(f"{len(pagini)} documente, {sum(map(len, rows_bs4))} rânduri")
+    print(f"bs4   {_rezumat(lat_bs4)}")
+    print(f"lxml  {_rezumat(lat_lxml)}")
+    print(f"Accelerare: {sum(lat_bs4) / sum(lat_lxml):.1f}x")
+    diferite = [i for i, a, b in zip(ids, rows_bs4, rows_lxml) if a != b]
+    if diferite:
+        print(f"⚠️ {len(diferite)} documente cu rânduri diferite: {diferite[:20]}")
+
+
+def tabel_sintetic(n, seed=0):
+    """Un tabel cu coloanele lui dosare_pmb (text, coordonate, ani, categorii)."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    legi = ["92/1950", "223/1974", "111/1951", "224/1951", "4/1973", "58/1974", "112/1989"]
+    grupuri = ["Restituire", "Compensare/Despagubiri", "Respins/Negativ", "Revocare/Anulare",
+               "Declinare/Transfer", "NONE"]
+    dosare = rng.integers(1, 43287, n)
+    return pd.DataFrame({
+        "Dosar PMB": [f"{d} / 2001-0{d % 9 + 1}-1{d % 10}" for d in dosare],
+        "Solicitant": [f"{NUME[d % 8]} {PRENUME[d // 8 % 8]}" for d in dosare],
+        "Notificare PMB": [f"{d * 7 % 30000} / 2001-02-14" for d in dosare],
+        "Adresa contemporană": [f"{STRAZI[d % 10]} nr. {d % 200}, sector {d % 6 + 1}" for d in dosare],
+        "Adresa istorică": "NONE",
+        "Tip proprietate": rng.choice(TIPURI + ["NONE"], n),
+        "Soluție": [f"DPG: {d * 13 % 99999}, Dată: 2005-03-01, {SOLUTII[d % 7]}" for d in dosare],
+        "Istorie acte": "NONE",
+        "Mai multe adrese": rng.choice(["DA", "NU"], n),
+        "lat": np.round(44.43 + rng.normal(0, 0.04, n), 6),
+        "lon": np.round(26.10 + rng.normal(0, 0.05, n), 6),
+        "Solutie_string": rng.choice(SOLUTII, n),
+        "Solutie_grup": rng.choice(grupuri, n),
+        "An_solutie": rng.integers(2002, 2021, n),
+        "Lege": rng.choice(legi, n),
+        "Pdf_nume": [f"{d}_{d * 13 % 99999}_2005-03-01.pdf" for d in dosare],
+    })
+
+
+def bench_tabel(args):
+    import pandas as pd
+
+    import tabel
+
+    tmp = tempfile.mkdtemp(prefix="bench_tabel_")
+    df = tabel_sintetic(args.randuri)
+    path_csv = os.path.join(tmp, "dosare_pmb.csv")
+    path_parquet = os.path.join(tmp, "dosare_pmb.parquet")
+    df.to_csv(path_csv, index=False)
+    tabel.scrie(df.copy(), path_parquet)
+    coloane = ["lat", "lon", "An_solutie", "Solutie_grup"]
+
+    def vechi():
+        d = pd.read_csv(path_csv)
+        for col in ("lat", "lon", "An_solutie"):
+            d[col] = pd.to_numeric(d[col], errors="coerce")
+        return d
+
+    variante = [
+        ("CSV + to_numeric", vechi),
+        ("Parquet, tot", lambda: tabel.citeste(path_parquet)),
+        ("Parquet, 4 coloane", lambda: tabel.citeste(path_parquet, columns=coloane)),
+    ]
+    print(f"{args.randuri} rânduri; CSV {os.path.getsize(path_csv) / 2**20:.1f} MB, "
+          f"Parquet {os.path.getsize(path_parquet) / 2**20:.1f} MB")
+    print(f"{'':22}{'încărcare (s)':>15}{'memorie (MB)':>14}")
+    for nume, fn in variante:
+        timpi = []
+        for _ in range(args.repetari):
+            t0 = time.perf_counter()
+            d = fn()
+            timpi.append(time.perf_counter() - t0)
+        memorie = d.memory_usage(deep=True).sum() / 2**20
+        print(f"{nume:22}{min(timpi):>15.3f}{memorie:>14.1f}")
+    shutil.rmtree(tmp)
+
+
+def bench_solutii(args):
+    """Rânduri/s: extrage_solutie / classify_solution_regex prin apply vs clasificare_solutii.
+
+    Paritatea e în tests/test_clasificare_solutii.py.
+    """
+    from clasificare_solutii import (classify_solution_regex, clasifica, clasifica_solutii, extrage_solutie,
+                                     extrage_solutii)
+
+    for unice, n in ((False, args.randuri), (True, args.randuri // 10)):
+        solutie = solutii_sintetice(n, unice=unice)
+        print(f"{n:,} rânduri, {solutie.nunique():,} valori distincte în Soluție"
+              + (" (fiecare soluție distinctă)" if unice else ""))
+        rezultate = {}
+        etape = [
+            ("extrage: apply (original)", lambda: solutie.apply(extrage_solutie)),
+            ("extrage: extrage_solutii", lambda: extrage_solutii(solutie)),
+        ]
+        for nume, fn in etape:
+            t0 = time.perf_counter()
+            rezultate[nume] = fn()
+            print(f"  {nume:34} {n / (time.perf_counter() - t0):>14,.0f} rânduri/s")
+        text = rezultate["extrage: apply (original)"]
+        etape = [
+            ("clasifică: apply (original)", lambda: text.apply(classify_solution_regex)),
+            ("clasifică: apply, model compilat", lambda: text.apply(clasifica)),
+            ("clasifică: valori distincte", lambda: clasifica_solutii(text)),
+        ]
+        for nume, fn in etape:
+            t0 = time.perf_counter()
+            rezultate[nume] = fn()
+            print(f"  {nume:34} {n / (time.perf_counter() - t0):>14,.0f} rânduri/s")
+        referinta = rezultate["clasifică: apply (original)"]
+        print("  grupuri: " + ", ".join(f"{g or '(gol)'} {c}" for g, c in referinta.value_counts().head(6).items()))
+
+
+def bench_pdfuri(args):
+    """Potrivirea PDF -> rânduri: bucla originală vs hash-join, la N și la N x factor PDF-uri.
+
+    Paritatea e în tests/test_pdfuri.py.
+    """
+    from pdfuri import potriveste_pdfuri, potriveste_pdfuri_original
+
+    for n_acte in (args.pdfuri, args.pdfuri * args.factor):
+        df, intrari = dosare_cu_acte(args.randuri, n_acte)
+        print(f"{len(df):,} rânduri, {len(intrari):,} intrări în indexul de PDF-uri")
+        t0 = time.perf_counter()
+        nume, _ = potriveste_pdfuri(df, intrari)
+        durata = time.perf_counter() - t0
+        print(f"  hash-join {durata:8.2f} s ({sum(map(bool, nume)):,} rânduri cu PDF)")
+        if args.fara_original:
+            continue
+        t0 = time.perf_counter()
+        potriveste_pdfuri_original(df, intrari)
+        durata_ref = time.perf_counter() - t0
+        print(f"  original  {durata_ref:8.2f} s ({durata_ref / durata:.0f}x mai lent)")
+
+
+def bench_referinte(args):
+    """Tabelul actelor vs extract_all_dpgs + normalize_date: referințe/s (paritatea: tests/test_referinte_acte.py)."""
+    import referinte_acte as ra
+
+    df = texte_acte(args.dosare)
+    t0 = time.perf_counter()
+    acte = ra.referinte(df)
+    durata = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for solutie, istorie in df[list(ra.SURSE)].fillna("").drop_duplicates().itertuples(index=False):
+        ra.extract_all_dpgs(solutie), ra.extract_all_dpgs(istorie)
+    durata_ref = time.perf_counter() - t0
+
+    print(f"{len(df):,} rânduri, {len(acte):,} referințe ({acte['data'].notna().sum():,} cu dată)")
+    print(f"  tabel acte  {durata:6.2f} s ({len(acte) / durata:,.0f} referințe/s, "
+          f"{ra.data_iso.cache_info().currsize:,} date brute distincte)")
+    print(f"  original    {durata_ref:6.2f} s ({durata_ref / durata:.1f}x mai lent)")
+
+
+def pdf_sintetic(nr, marime=200_000):
+    """Un „PDF” determinist pentru actul `nr` (conținutul contează doar ca octeți)."""
+    rng = random.Random(nr)
+    corp = rng.randbytes(marime)
+    return b"%PDF-1.4\n" + str(nr).encode() + b"\n" + corp + b"\n%%EOF\n"
+
+
+def server_acte(latenta=0.0, marime_pdf=200_000):
+    """Înlocuitor local pentru acteinterne.pmb.ro/legis, pe un thread separat.
+
+    Imită fluxul real: formularul `cauta` (cu un câmp ascuns), lista de
+    rezultate cu linkuri DISPOZITIE/DL10 care se deschid în tab nou, pagina
+    actului cu PDF-ul într-un <embed> (sau, pentru DL10, în spatele unui
+    „Vezi documentul”) și PDF-ul propriu-zis. DPG-urile divizibile cu 7 nu
+    au rezultate. `latenta` (secunde) se adaugă fiecărui răspuns.
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlparse
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _raspunde(self, corp, tip="text/html; charset=utf-8"):
+            time.sleep(latenta)
+            if isinstance(corp, str):
+                corp = corp.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", tip)
+            self.send_header("Content-Length", str(len(corp)))
+            self.end_headers()
+            self.wfile.write(corp)
+
+        def _rezultate(self, campuri):
+            nr = int(campuri.get("nr", ["0"])[0])
+            an = campuri.get("data_aprob", [""])[0]
+            linkuri = "".join(f"<a href='/legis/pagina/{k}'>{k}</a>" for k in range(1, 4))
+            if nr % 7:
+                tip = "DL10" if nr % 5 == 0 else "DISPOZITIE"
+                linkuri += (f"<table><tr><td><a href='/legis/act?nr={nr}&an={an}' target='_blank'>"
+                            f"{tip} nr. {nr}/{an}</a></td></tr></table>")
+            return f"<html><body><h3>Rezultate</h3>{linkuri}</body></html>"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            q = parse_qs(url.query)
+            if url.path == "/legis":
+                self._raspunde(
+                    "<html><body><form name='cauta' method='post' action='/legis/cauta'>"
+                    "<input type='hidden' name='tok' value='abc'>"
+                    "<input name='nr'><input name='data_aprob'>"
+                    "<input type='submit' value='Caută'></form></body></html>"
+                )
+            elif url.path == "/legis/act":
+                nr = int(q["nr"][0])
+                if nr % 5 == 0:
+                    corp = f"<a href='/legis/vezi?nr={nr}'>Vezi documentul</a>"
+                else:
+                    corp = f"<embed type='application/pdf' src='/legis/doc/{nr}.pdf'>"
+                self._raspunde(f"<html><body>{corp}</body></html>")
+            elif url.path == "/legis/vezi":
+                self._raspunde(f"<html><body><iframe src='/legis/doc/{q['nr'][0]}.pdf'></iframe></body></html>")
+            elif url.path.startswith("/legis/doc/"):
+                nr = int(url.path.rsplit("/", 1)[1][:-4])
+                self._raspunde(pdf_sintetic(nr, marime_pdf), "application/pdf")
+            else:
+                self.send_error(404)
+
+        def do_POST(self):
+            lungime = int(self.headers.get("Content-Length", 0))
+            campuri = parse_qs(self.rfile.read(lungime).decode("utf-8"))
+            if urlparse(self.path).path == "/legis/cauta" and campuri.get("tok") == ["abc"]:
+                self._raspunde(self._rezultate(campuri))
+            else:
+                self.send_error(400)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/legis"
+
+
+def bench_acte(args):
+    """PDF-uri/min pe calea HTTP față de un înlocuitor local al serverului de acte,
+    cu verificarea conținutului fiecărui PDF; și prin Playwright, dacă e instalat."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from acte_http import ClientActe
+    from cache_acte import CacheActe
+    from depozit_pdf import DepozitPdf
+    from jurnal import JurnalEvenimente
+
+    server, url = server_acte(args.latenta / 1000, args.marime_pdf)
+    tmp = tempfile.mkdtemp(prefix="bench_acte_")
+    cache = CacheActe(os.path.join(tmp, "cache_acte.sqlite"), ttl=None)
+    joburi = [(nr, 2005) for nr in range(1000, 1000 + args.n)]
+    asteptate = sum(1 for nr, _ in joburi if nr % 7)
+
+    def job_http(job):
+        # aceeași ordine ca acte_interne.descarca_http: cache, apoi cererile HTTP
+        nr, an = job
+        rezultate = cache.cauta(nr, an)
+        if rezultate is None:
+            rezultate = client.cauta(nr, an) or []
+            cache.salveaza_cautare(nr, an, rezultate)
+        salvate = 0
+        for _, u in rezultate:
+            url_pdf = cache.pdf(u)
+            saved = client.descarca_pdf(url_pdf, depozit) if url_pdf else None
+            if saved is None:
+                saved = client.descarca_act(u, depozit)
+                if saved is not None:
+                    cache.salveaza_pdf(u, saved[2])
+            if saved is not None:
+                depozit.adauga_act(nr, f"{an}-01-01", saved[0], saved[1], saved[2])
+                hash_uri[nr] = saved[0]
+                salvate += 1
+        return salvate
+
+    print(f"{args.n} joburi, {asteptate} cu act, latență server {args.latenta:.0f} ms, {args.workers} workeri")
+    gresite = []
+    for trecere in ("HTTP", "HTTP+cache"):
+        # depozit gol la fiecare trecere: a doua măsoară doar efectul cache-ului de căutări
+        depozit = DepozitPdf(os.path.join(tmp, f"depozit_{trecere}"))
+        hash_uri = {}
+        client = ClientActe(url, conexiuni=args.workers)
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(args.workers) as ex:
+            salvate = sum(ex.map(job_http, joburi))
+        durata = time.perf_counter() - t0
+        client.close()
+        gresite += [nr for nr, _ in joburi if nr % 7 and (nr not in hash_uri or
+                    open(depozit.cale(hash_uri[nr]), "rb").read() != pdf_sintetic(nr, args.marime_pdf))]
+        depozit.close()
+        if trecere == "HTTP":
+            viteza_http = salvate / durata
+        print(f"{trecere:12}{salvate:>5} PDF-uri în {durata:6.2f} s  = {salvate / durata * 60:8.0f} PDF-uri/min")
+    print(cache.raport())
+    cache.close()
+
+    try:
+        import asyncio
+
+        import acte_interne
+    except ImportError:
+        print("(Playwright nu e instalat: comparația cu browserul se sare)")
+    else:
+        acte_interne.BASE_URL = url
+        depozit_pw = DepozitPdf(tempfile.mkdtemp(prefix="bench_acte_pw_"))
+        cache_pw = CacheActe(os.path.join(depozit_pw.folder, "cache_acte.sqlite"), ttl=None)
+        jurnal_pw = JurnalEvenimente(os.path.join(depozit_pw.folder, "evenimente.sqlite"))
+
+        async def browser():
+            limitator = acte_interne.LimitatorCereri(args.workers, 0)
+            coada = asyncio.Queue()
+            for nr, an in joburi:
+                coada.put_nowait((nr, f"{an}-01-01"))
+            rezultate = []
+
+            async def w(b):
+                context = await b.new_context()
+                page = await context.new_page()
+                while not coada.empty():
+                    nr, data = coada.get_nowait()
+                    rezultate.append(await acte_interne.search_and_download_for_dpg(
+                        page, context, nr, data, "0", limitator, depozit_pw, cache_pw, jurnal_pw))
+                await context.close()
+
+            async with acte_interne.async_playwright() as p:
+                b = await p.chromium.launch(headless=True)
+                await asyncio.gather(*(w(b) for _ in range(args.workers)))
+                await b.close()
+            return sum(r[2] for r in rezultate)
+
+        t0 = time.perf_counter()
+        salvate_pw = asyncio.run(browser())
+        durata_pw = time.perf_counter() - t0
+        print(f"Playwright  {salvate_pw:>5} PDF-uri în {durata_pw:6.2f} s  = {salvate_pw / durata_pw * 60:8.0f} PDF-uri/min")
+        print(f"Accelerare HTTP față de Playwright: {viteza_http * durata_pw / salvate_pw:.1f}x")
+        depozit_pw.close()
+        cache_pw.close()
+        jurnal_pw.close()
+        shutil.rmtree(depozit_pw.folder)
+
+    server.shutdown()
+    shutil.rmtree(tmp)
+    if salvate != asteptate or gresite:
+        print(f"❌ {asteptate - salvate} PDF-uri lipsă, {len(gresite)} cu conținut greșit: {gresite[:20]}")
+        sys.exit(1)
+    print("✅ Toate PDF-urile descărcate complet, octet cu octet")
+
+
+TIPURI_OSM = ["Strada", "Bulevardul", "Calea", "Șoseaua", "Aleea", "Intrarea", "Splaiul"]
+
+
+def osm_sintetic(path, n_strazi, seed=0):
+    """Un extras OSM cu `n_strazi` străzi (polilinii) și numere din 4 în 4 pe ambele părți.
+
+    Numărul k de pe stradă stă la fracția k/NR_MAX de-a lungul ei, pe partea
+    dată de paritate, deci poziția reală a oricărui număr e cunoscută.
+    Întoarce {(tip, nume): (polilinie, nr_max)}.
+    """
+    rng = random.Random(seed)
+    adevar = {}
+    nod = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<?xml version='1.0' encoding='UTF-8'?>\n<osm version='0.6'>\n")
+        ways = []
+        for k in range(n_strazi):
+            tip = TIPURI_OSM[k % len(TIPURI_OSM)]
+            nume = f"{PRENUME[k % 8].title()} {_cuvant(rng)} {_cuvant(rng)}"
+            lat, lon = 44.38 + rng.random() * 0.1, 26.03 + rng.random() * 0.15
+            unghi = rng.random() * math.pi
+            linie = []
+            for j in range(6):
+                lat += math.sin(unghi) * 0.0015 + rng.uniform(-2e-4, 2e-4)
+                lon += math.cos(unghi) * 0.002 + rng.uniform(-2e-4, 2e-4)
+                nod += 1
+                f.write(f"<node id='{nod}' lat='{lat:.7f}' lon='{lon:.7f}'/>\n")
+                linie.append((nod, lat, lon))
+            nr_max = rng.randint(40, 160)
+            adevar[(tip, nume)] = ([(la, lo) for _, la, lo in linie], nr_max)
+            for nr in range(1, nr_max + 1):
+                if nr % 4 not in (1, 2):
+                    continue
+                la, lo = _pe_strada(adevar[(tip, nume)], nr)
+                nod += 1
+                f.write(f"<node id='{nod}' lat='{la:.7f}' lon='{lo:.7f}'>"
+                        f"<tag k='addr:street' v='{tip} {nume}'/><tag k='addr:housenumber' v='{nr}'/></node>\n")
+            ways.append((linie, f"{tip} {nume}"))
+        for w, (linie, nume) in enumerate(ways, start=1):
+            nds = "".join(f"<nd ref='{n}'/>" for n, _, _ in linie)
+            f.write(f"<way id='{w}'>{nds}<tag k='highway' v='residential'/><tag k='name' v='{nume}'/></way>\n")
+        f.write("</osm>\n")
+    return adevar
+
+
+def _cuvant(rng):
+    return "".join(rng.choice(["ba", "co", "di", "ma", "ne", "ru", "se", "la", "vi", "to", "ș", "ț", "ă"])
+                   for _ in range(rng.randint(2, 4))).title()
+
+
+def _pe_strada(strada, nr):
+    """Poziția reală a numărului `nr`: fracția nr/nr_max din lungimea poliliniei."""
+    linie, nr_max = strada
+    segmente = [math.dist(a, b) for a, b in zip(linie, linie[1:])]
+    ramas = sum(segmente) * nr / (nr_max + 1)
+    for (a, b), lung in zip(zip(linie, linie[1:]), segmente):
+        if ramas <= lung:
+            u = ramas / lung
+            return a[0] + u * (b[0] - a[0]), a[1] + u * (b[1] - a[1])
+        ramas -= lung
+    return linie[-1]
+
+
+def _metri(a, b):
+    dy = (a[0] - b[0]) * 111_320
+    dx = (a[1] - b[1]) * 111_320 * math.cos(math.radians(a[0]))
+    return math.hypot(dx, dy)
+
+
+def bench_nomenclator(args):
+    """Construcție index + interogări/s + eroarea în metri față de poziția reală."""
+    from nomenclator import NomenclatorStradal, fara_diacritice
+
+    rng = random.Random(1)
+    tmp = tempfile.mkdtemp(prefix="bench_nomenclator_")
+    adevar = None
+    path = args.osm
+    if path is None:
+        path = os.path.join(tmp, "sintetic.osm")
+        adevar = osm_sintetic(path, args.strazi)
+
+    t0 = time.perf_counter()
+    nomenclator = NomenclatorStradal.din_osm(path)
+    print(f"Index: {len(nomenclator.strazi)} străzi în {time.perf_counter() - t0:.2f} s")
+
+    # interogări în forma lui normalize_address: tip, nume cu majuscule, număr, sector
+    abrevieri = {"Strada": "Strada", "Bulevardul": "Bulevardul", "Calea": "Calea", "Șoseaua": "Soseaua",
+                 "Aleea": "Aleea", "Intrarea": "Intrarea", "Splaiul": "Strada"}
+    if adevar:
+        chei = list(adevar)
+        interogari = []
+        for _ in range(args.interogari):
+            tip, nume = rng.choice(chei)
+            nr = rng.randint(1, adevar[(tip, nume)][1])
+            tokeni_nume = fara_diacritice(nume).upper().split()
+            if rng.random() < 0.2:
+                tokeni_nume = tokeni_nume[1:]  # prenume lipsă, ca la „G-RAL” eliminat
+            q = f"{abrevieri[tip]} {' '.join(tokeni_nume)} {nr} sector {rng.randint(1, 6)} bucuresti"
+            interogari.append((q, _pe_strada(adevar[(tip, nume)], nr)))
+    else:
+        interogari = [(f"Strada {s.nume.upper()} {rng.randint(1, 80)} bucuresti", None)
+                      for s in rng.choices(nomenclator.strazi, k=args.interogari)]
+
+    t0 = time.perf_counter()
+    rezultate = [nomenclator.cauta(q) for q, _ in interogari]
+    durata = time.perf_counter() - t0
+    print(f"{len(interogari)} interogări în {durata:.2f} s = {len(interogari) / durata:,.0f} interogări/s")
+
+    gasite = [r for r in rezultate if r is not None]
+    print(f"Găsite: {len(gasite)}/{len(interogari)}; metode: "
+          + ", ".join(f"{m} {sum(r.metoda == m for r in gasite)}" for m in ("exact", "interpolat", "vecin", "strada")))
+    if adevar:
+        for prag in (0.8, 0.6):
+            erori = sorted(_metri((r.latitude, r.longitude), real)
+                           for r, (_, real) in zip(rezultate, interogari) if r is not None and r.incredere >= prag)
+            if erori:
+                print(f"încredere ≥ {prag}: {len(erori)} rezultate, eroare mediană {erori[len(erori) // 2]:.1f} m, "
+                      f"p95 {erori[int(len(erori) * 0.95)]:.1f} m")
+    shutil.rmtree(tmp)
+
+
+ABREVIERI_OSM = {"Strada": ["Str.", "STR", "Strada", "S."], "Bulevardul": ["Bd.", "B-dul", "BLD", "Bulevardul"],
+                 "Calea": ["Calea", "Cal."], "Șoseaua": ["Sos.", "Șos.", "SOSEAUA"], "Aleea": ["Al.", "Aleea"],
+                 "Intrarea": ["Intr.", "Intrarea"], "Splaiul": ["Splaiul"]}
+
+
+def adresa_bruta(rng, tip, nume, nr):
+    """O adresă de pe strada (tip, nume) în forma din tabel: abrevieri, bloc / apartament, istoric, paranteze."""
+    if rng.random() < 0.5:
+        nume = fara_diacritice_simplu(nume)
+    adresa = f"{rng.choice(ABREVIERI_OSM[tip])} {nume.upper() if rng.random() < 0.4 else nume}"
+    adresa += rng.choice([f" nr. {nr}", f" nr.{nr}", f", nr {nr}", f" {nr}"])
+    if rng.random() < 0.3:
+        adresa += f", bl. {rng.choice('ABCM')}{rng.randint(1, 20)}, sc. {rng.randint(1, 4)}, ap. {rng.randint(1, 90)}"
+    adresa += f", sector {rng.randint(1, 6)}"
+    if rng.random() < 0.3:
+        adresa += f" (Istoric: {rng.choice(STRAZI)} nr {rng.randint(1, 90)})"
+    if rng.random() < 0.5:
+        adresa += f" ({rng.choice(TIPURI)})"
+    return adresa
+
+
+def fara_diacritice_simplu(text):
+    return text.translate(str.maketrans("ăâîșțşţĂÂÎȘȚŞŢ", "aaisttsAAISTST"))
+
+
+def bench_adrese(args):
+    """Rata de potrivire la prima trecere prin nomenclator: text normalizat vs adresă structurată."""
+    from nomenclator import NomenclatorStradal
+    from normalizare import normalize_address, parseaza_adresa
+
+    rng = random.Random(2)
+    tmp = tempfile.mkdtemp(prefix="bench_adrese_")
+    path = os.path.join(tmp, "sintetic.osm")
+    adevar = osm_sintetic(path, args.strazi)
+    nomenclator = NomenclatorStradal.din_osm(path)
+    chei = list(adevar)
+    corpus = []
+    for _ in range(args.n):
+        tip, nume = rng.choice(chei)
+        nr = rng.randint(1, adevar[(tip, nume)][1])
+        corpus.append((adresa_bruta(rng, tip, nume, nr), _pe_strada(adevar[(tip, nume)], nr)))
+
+    t0 = time.perf_counter()
+    structurate = [parseaza_adresa(a) for a, _ in corpus]
+    durata = time.perf_counter() - t0
+    cu_nume = sum(bool(s.nume) for s in structurate)
+    print(f"parseaza_adresa: {len(corpus) / durata:,.0f} adrese/s; {cu_nume}/{len(corpus)} cu nume de stradă, "
+          f"{sum(s.numar is not None for s in structurate)} cu număr, {sum(bool(s.sector) for s in structurate)} cu sector")
+
+    def prima_trecere(interogari):
+        for q in interogari:
+            r = nomenclator.cauta(q)
+            if r is not None and r.incredere >= args.prag:
+                return r
+        return None
+
+    variante = {
+        "text normalizat": lambda a, s: (normalize_address(a),),
+        "structurată, apoi text": lambda a, s: (s, normalize_address(a)) if s.nume else (normalize_address(a),),
+    }
+    for eticheta, interogari in variante.items():
+        t0 = time.perf_counter()
+        rezultate = [prima_trecere(interogari(a, s)) for (a, _), s in zip(corpus, structurate)]
+        durata = time.perf_counter() - t0
+        erori = sorted(_metri((r.latitude, r.longitude), real) for r, (_, real) in zip(rezultate, corpus) if r)
+        gasite = len(erori)
+        detaliu = f", eroare mediană {erori[gasite // 2]:.1f} m, p95 {erori[int(gasite * 0.95)]:.1f} m" if erori else ""
+        print(f"{eticheta:>24}: {gasite}/{len(corpus)} găsite ({gasite / len(corpus):.1%}) "
+              f"cu încredere ≥ {args.prag}{detaliu}; {len(corpus) / durata:,.0f} adrese/s")
+    shutil.rmtree(tmp)
+
+
+def varianta_adresa(rng, tip, nume, nr, sector):
+    """O variantă de scriere a aceleiași proprietăți: abreviere sau tip lipsă, greșeli de tipar, sector lipsă."""
+    cuvinte = fara_diacritice_simplu(nume).split() if rng.random() < 0.5 else nume.split()
+    if rng.random() < 0.15:
+        k = rng.randrange(len(cuvinte))
+        if len(cuvinte[k]) > 4:
+            p = rng.randrange(1, len(cuvinte[k]) - 1)
+            cuvinte[k] = cuvinte[k][:p] + cuvinte[k][p + 1:]  # o literă lipsă
+    nume = " ".join(cuvinte)
+    adresa = nume.upper() if rng.random() < 0.4 else nume
+    if rng.random() < 0.8:
+        adresa = f"{rng.choice(ABREVIERI_OSM[tip])} {adresa}"
+    adresa += rng.choice([f" nr. {nr}", f" nr.{nr}", f", nr {nr}", f" {nr}", f" nr.{nr} (bis)"])
+    if rng.random() < 0.6:
+        adresa += f", sector {sector}"
+    if rng.random() < 0.3:
+        adresa += f" ({rng.choice(TIPURI)})"
+    return adresa
+
+
+def _perechi(grupuri):
+    return sum(n * (n - 1) // 2 for n in grupuri.values())
+
+
+def bench_grupare(args):
+    """Grupare aproximativă a variantelor de adresă: timp, perechi comparate, precizie / recall pe perechi."""
+    from collections import Counter
+    from grupare_adrese import grupeaza
+    from normalizare import parseaza_adresa
+
+    rng = random.Random(3)
+    strazi = [(TIPURI_OSM[k % len(TIPURI_OSM)], f"{PRENUME[k % 8].title()} {_cuvant(rng)} {_cuvant(rng)}")
+              for k in range(args.strazi)]
+    randuri = []  # (adresa brută, proprietatea reală)
+    for p in range(args.proprietati):
+        tip, nume = rng.choice(strazi)
+        proprietate = (tip, nume, rng.randint(1, 150), rng.randint(1, 6))
+        for _ in range(rng.randint(1, args.variante)):
+            randuri.append((varianta_adresa(rng, *proprietate), p))
+
+    t0 = time.perf_counter()
+    chei = {a: parseaza_adresa(a) for a, _ in randuri}
+    ponderi = Counter(chei[a] for a, _ in randuri)
+    distincte = list(ponderi)
+    t1 = time.perf_counter()
+    statistici = {}
+    reprezentanti = grupeaza(distincte, [ponderi[c] for c in distincte], prag=args.prag, statistici=statistici)
+    t2 = time.perf_counter()
+    grup = {c: r for c, r in zip(distincte, reprezentanti)}
+
+    n = len(distincte)
+    print(f"{len(randuri)} rânduri, {args.proprietati} proprietăți reale, {n} adrese distincte după parsare")
+    print(f"parsare {t1 - t0:.2f} s, grupare {t2 - t1:.2f} s; {statistici['comparate']:,} perechi comparate "
+          f"în loc de {n * (n - 1) // 2:,} ({statistici['comparate'] / max(n * (n - 1) // 2, 1):.4%})")
+    grupuri = Counter(grup[chei[a]] for a, _ in randuri)
+    reale = Counter(p for _, p in randuri)
+    comune = Counter((grup[chei[a]], p) for a, p in randuri)
+    precizie = _perechi(comune) / max(_perechi(grupuri), 1)
+    recall = _perechi(comune) / max(_perechi(reale), 1)
+    print(f"cereri de geocodare: {n} (chei exacte) -> {len(set(reprezentanti))} (grupuri); "
+          f"minimul posibil {args.proprietati}")
+    print(f"perechi de rânduri: precizie {precizie:.3f}, recall {recall:.3f} (față de proprietățile reale)")
+
+
+def bench_normalizare(args):
+    """Adrese/s: original vs compilat vs lot; cu --golden, scrie corpusul de referință.
+
+    Paritatea (sintetic + corpusul de referință, dacă există) e în tests/test_normalizare.py.
+    """
+    import csv
+
+    from normalizare import normalize_address, normalize_address_original, normalizeaza_lot
+
+    if args.golden and os.path.exists(args.golden):
+        with open(args.golden, newline="", encoding="utf-8") as f:
+            referinta = [tuple(r) for r in csv.reader(f, delimiter="\t")]
+        print(f"Corpus de referință: {len(referinta)} adrese din {args.golden}")
+    else:
+        adrese = adrese_sintetice(args.n)
+        if args.tabel:
+            import tabel
+            reale = tabel.citeste(args.tabel, columns=["Adresa contemporană"], categorii=False)
+            adrese += [a.strip() for a in reale["Adresa contemporană"].dropna().astype(str) if a.strip()]
+        referinta = [(a, normalize_address_original(a)) for a in adrese]
+        if args.golden:
+            with open(args.golden, "w", newline="", encoding="utf-8") as f:
+                csv.writer(f, delimiter="\t").writerows(referinta)
+            print(f"Corpus de referință salvat: {len(referinta)} adrese în {args.golden}")
+    adrese = [a for a, _ in referinta]
+
+    # debitul pe adrese cu repetiții, ca într-o coloană reală (≈ 1 din 7 distinctă)
+    rng = random.Random(1)
+    coloana = [rng.choice(adrese[: max(1, len(adrese) // 7)]) for _ in range(len(adrese))]
+    variante = [
+        ("original", lambda: [normalize_address_original(a) for a in coloana]),
+        ("compilat", lambda: [normalize_address(a) for a in coloana]),
+        ("lot (distincte)", lambda: normalizeaza_lot(coloana)),
+    ]
+    if args.procese > 1:
+        import normalizare
+        normalizare.MIN_PENTRU_PROCESE = 0
+        variante.append((f"lot, {args.procese} procese", lambda: normalizeaza_lot(coloana, procese=args.procese)))
+    print(f"{'':18}{'secunde':>10}{'adrese/s':>14}")
+    for nume, fn in variante:
+        t0 = time.perf_counter()
+        fn()
+        durata = time.perf_counter() - t0
+        print(f"{nume:18}{durata:>10.2f}{len(coloana) / durata:>14,.0f}")
+
+
+def bench_coordonate(args):
+    """adaugare_coordonate.py: rescrierea tabelului la fiecare hit vs jurnal de corecții + o compactare."""
+    import pandas as pd
+
+    import tabel
+    from jurnal_coordonate import OK, JurnalCoordonate
+
+    tmp = tempfile.mkdtemp(prefix="bench_coordonate_")
+    df = tabel_sintetic(args.randuri)
+    df["latitude"] = float("nan")
+    df["longitude"] = float("nan")
+    rng = random.Random(0)
+    hituri = [(rng.randint(1, args.randuri), 44.4 + rng.random() / 10, 26.1 + rng.random() / 10)
+              for _ in range(args.hituri)]
+    path_vechi = os.path.join(tmp, "vechi.parquet")
+    path_nou = os.path.join(tmp, "nou.parquet")
+    tabel.scrie(df, path_vechi)
+    tabel.scrie(df, path_nou)
+
+    t0 = time.perf_counter()
+    d = tabel.citeste(path_vechi)
+    for rand, lat, lon in hituri:
+        d.at[rand - 1, "latitude"] = lat
+        d.at[rand - 1, "longitude"] = lon
+        tabel.scrie(d, path_vechi)
+    vechi = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    jurnal = JurnalCoordonate(os.path.join(tmp, "coordonate.sqlite"))
+    for rand, lat, lon in hituri:
+        jurnal.adauga(rand, OK, lat, lon)
+    adaugare = time.perf_counter() - t0
+    jurnal.compacteaza(path_nou)
+    nou = time.perf_counter() - t0
+    jurnal.close()
+
+    print(f"{args.randuri} rânduri, {args.hituri} hit-uri")
+    print(f"{'rescriere la fiecare hit':28}{vechi:>9.2f} s  ({vechi / args.hituri * 1000:.1f} ms/hit)")
+    print(f"{'jurnal + compactare':28}{nou:>9.2f} s  ({adaugare / args.hituri * 1000:.2f} ms/hit "
+          f"+ {nou - adaugare:.2f} s compactare)")
+    pd.testing.assert_frame_equal(tabel.citeste(path_vechi), tabel.citeste(path_nou))
+    print("✅ Tabele identice")
+    shutil.rmtree(tmp)
+
+
+def bench_geocodare(args):
+    """Adrese/s prin geocodeaza_lot cu providerul fals (fără rețea), pe cereri simultane."""
+    import asyncio
+
+    from cache_geocodare import CacheGeocodare
+    from geocodare import Geocoder, ProviderFals, geocodeaza_lot
+    from normalizare import normalize_address
+
+    rng = random.Random(0)
+    distincte = [_adresa(rng) for _ in range(args.n // 3 or 1)]
+    adrese = [rng.choice(distincte) for _ in range(args.n)]
+    print(f"{len(adrese)} adrese, {len(set(adrese))} distincte; latență {args.latenta:.0f} ms, "
+          f"erori trecătoare {args.erori:.0%}")
+    print(f"{'simultane':>10}{'cereri':>10}{'reîncercări':>13}{'secunde':>10}{'adrese/s':>12}")
+    referinta = None
+    for simultane in args.simultane:
+        tmp = tempfile.mkdtemp(prefix="bench_geocodare_")
+        cache = CacheGeocodare(os.path.join(tmp, "cache.sqlite"), provider="fals")
+        provider = ProviderFals(args.latenta / 1000, rata_erori=args.erori, rata_negasite=0.1)
+        geocoder = Geocoder(provider, simultane=simultane, backoff_baza=args.latenta / 1000)
+        t0 = time.perf_counter()
+        normalizate, rezultate = asyncio.run(geocodeaza_lot(adrese, geocoder, normalize_address, cache))
+        durata = time.perf_counter() - t0
+        print(f"{simultane:>10}{geocoder.contor['cereri']:>10}{geocoder.contor['reincercari']:>13}"
+              f"{durata:>10.2f}{len(adrese) / durata:>12,.0f}")
+        # același rezultat indiferent de concurență (providerul fals e determinist)
+        obtinut = {a: rezultate[normalizate[a]] for a in adrese}
+        if referinta is None:
+            referinta = obtinut
+        elif obtinut != referinta:
+            print("   ❌ rezultate diferite față de prima rulare")
+        cache.close()
+        shutil.rmtree(tmp)
+
+
+SCRIPT_ETAPA = """import time
+{importuri}
+time.sleep({secunde})
+intrare = "".join(open(p, encoding="utf-8").read() for p in {intrari!r})
+with open({iesire!r}, "w", encoding="utf-8") as f:
+    f.write(intrare + {text!r})
+"""
+
+
+def graf_sintetic(director, secunde):
+    """Un graf mic în `director`: a -> (b, c) -> d, cu b importând un modul local (comun.py)."""
+    from pipeline import Etapa
+
+    scripturi = {"a": ([], ""), "b": (["a.txt"], "import comun"), "c": (["a.txt"], ""), "d": (["b.txt", "c.txt"], "")}
+    with open(os.path.join(director, "comun.py"), "w", encoding="utf-8") as f:
+        f.write("VERSIUNE = 1\n")
+    etape = []
+    for nume, (intrari, importuri) in scripturi.items():
+        with open(os.path.join(director, f"{nume}.py"), "w", encoding="utf-8") as f:
+            f.write(SCRIPT_ETAPA.format(importuri=importuri, secunde=secunde, intrari=intrari,
+                                        iesire=f"{nume}.txt", text=nume))
+        etape.append(Etapa(nume, f"{nume}.py", intrari, [f"{nume}.txt"]))
+    return etape
+
+
+def bench_pipeline(args):
+    """Runner-ul de etape: paralelism, sărirea etapelor neschimbate, rerularea doar în aval."""
+    import pipeline
+
+    dep = pipeline.dependinte(pipeline.ETAPE)
+    aval, de_vazut = set(), [args.etapa]
+    while de_vazut:
+        n = de_vazut.pop()
+        for urmator, d in dep.items():
+            if n in d and urmator not in aval:
+                aval.add(urmator)
+                de_vazut.append(urmator)
+    print(f"graful real: {len(pipeline.ETAPE)} etape; o schimbare în {args.etapa} rerulează "
+          f"{args.etapa} + {', '.join(sorted(aval)) or 'nimic altceva'}")
+
+    tmp = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        etape = graf_sintetic(tmp, args.secunde)
+        with pipeline.StarePipeline(os.path.join(tmp, "stare.sqlite")) as stare:
+            momente = {}
+
+            def pas(titlu, asteptate):
+                t0 = time.perf_counter()
+                momente.clear()
+                rezultate = pipeline.ruleaza(etape, radacina=tmp, stare=stare, afiseaza=lambda *_: None,
+                                             momente=momente)
+                durata = time.perf_counter() - t0
+                rulate = sorted(n for n, (s, _) in rezultate.items() if s == pipeline.RULATA)
+                print(f"  {titlu:<34} {durata:5.2f} s, rulate: {', '.join(rulate) or '-'}")
+                if rulate != sorted(asteptate):
+                    print(f"❌ așteptat: {', '.join(sorted(asteptate)) or '-'}")
+                    sys.exit(1)
+                return durata
+
+            pas("prima rulare", "abcd")
+            # a, apoi b și c în paralel, apoi d: intervalele lui b și c se suprapun
+            (b0, b1), (c0, c1) = momente["b"], momente["c"]
+            if max(b0, c0) >= min(b1, c1):
+                print(f"❌ b și c nu au rulat în paralel (b {b0:.2f}-{b1:.2f} s, c {c0:.2f}-{c1:.2f} s)")
+                sys.exit(1)
+            print(f"  b și c suprapuse {min(b1, c1) - max(b0, c0):.2f} s")
+            pas("a doua rulare, nimic schimbat", "")
+            with open(os.path.join(tmp, "b.py"), "a", encoding="utf-8") as f:
+                f.write("# doar un comentariu\n")
+            pas("comentariu în b.py", "b")
+            with open(os.path.join(tmp, "b.py"), "a", encoding="utf-8") as f:
+                f.write("open('b.txt', 'a', encoding='utf-8').write('!')\n")
+            pas("b.py produce altă ieșire", "bd")
+            with open(os.path.join(tmp, "comun.py"), "w", encoding="utf-8") as f:
+                f.write("VERSIUNE = 2\n")
+            pas("modul importat de b schimbat", "b")
+            os.remove(os.path.join(tmp, "c.txt"))
+            pas("ieșirea lui c ștearsă", "c")
+        print("  ✅ doar etapele schimbate și cele din aval cu intrări noi s-au rerulat")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark-uri pentru pipeline-ul retrocedari")
+    sub = parser.add_subparsers(dest="comanda", required=True)
+
+    p = sub.add_parser("arhiva", help="scan rece și spațiu pe disc: fișiere separate vs arhivă")
+    p.add_argument("--n", type=int, default=5000, help="pagini sintetice, dacă nu se dă --loose")
+    p.add_argument("--loose", help="folder cu {id}.html (implicit: corpus sintetic)")
+    p.add_argument("--arhiva", help="folder arhivă (se creează din --loose dacă lipsește)")
+    p.add_argument("--pastreaza", action="store_true", help="nu șterge corpusul sintetic")
+    p.set_defaults(func=bench_arhiva)
+
+    p = sub.add_parser("fragment", help="mărime și timp de parsare: pagină completă vs fragment")
+    p.add_argument("--n", type=int, default=1000)
+    p.add_argument("--arhiva", help="arhivă cu pagini complete (implicit: corpus sintetic)")
+    p.set_defaults(func=bench_fragment)
+
+    p = sub.add_parser("parse", help="fișiere/s la parsarea corpusului, pe număr de workeri")
+    p.add_argument("--n", type=int, default=4000)
+    p.add_argument("--arhiva", help="arhivă reală (implicit: corpus sintetic)")
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    p.add_argument("--chunk", type=int, default=250)
+    p.set_defaults(func=bench_parse)
+
+    p = sub.add_parser("parser", help="latență: parse_dosar (bs4) vs lxml")
+    p.add_argument("--n", type=int, default=2000)
+    p.add_argument("--arhiva", help="arhivă reală (implicit: corpus sintetic)")
+    p.set_defaults(func=bench_parser)
+
+    p = sub.add_parser("tabel", help="încărcare și memorie: CSV vs Parquet cu schemă")
+    p.add_argument("--randuri", type=int, default=200000)
+    p.add_argument("--repetari", type=int, default=3)
+    p.set_defaults(func=bench_tabel)
+
+    p = sub.add_parser("solutii", help="rânduri/s: extragerea și clasificarea soluțiilor")
+    p.add_argument("--randuri", type=int, default=3_000_000)
+    p.set_defaults(func=bench_solutii)
+
+    p = sub.add_parser("pdfuri", help="potrivirea PDF -> dosare: bucla originală vs hash-join")
+    p.add_argument("--randuri", type=int, default=43000)
+    p.add_argument("--pdfuri", type=int, default=5000, help="acte cu PDF în index (apoi de --factor ori mai multe)")
+    p.add_argument("--factor", type=int, default=10)
+    p.add_argument("--fara-original", action="store_true", help="doar hash-join (bucla originală e lentă la 10x)")
+    p.set_defaults(func=bench_pdfuri)
+
+    p = sub.add_parser("referinte", help="tabelul actelor: referințe/s")
+    p.add_argument("--dosare", type=int, default=50_000)
+    p.set_defaults(func=bench_referinte)
+
+    p = sub.add_parser("acte", help="PDF-uri/min: calea HTTP (și Playwright) pe un server local de acte")
+    p.add_argument("--n", type=int, default=200, help="joburi (DPG, an)")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--latenta", type=float, default=50, help="ms adăugate fiecărui răspuns")
+    p.add_argument("--marime-pdf", type=int, default=200_000)
+    p.set_defaults(func=bench_acte)
+
+    p = sub.add_parser("nomenclator", help="geocoder offline: interogări/s și eroare în metri")
+    p.add_argument("--strazi", type=int, default=3000, help="străzi în extrasul OSM sintetic")
+    p.add_argument("--interogari", type=int, default=20000)
+    p.add_argument("--osm", help="extras OSM real (fără adevăr de referință: doar viteză)")
+    p.set_defaults(func=bench_nomenclator)
+
+    p = sub.add_parser("adrese", help="adrese structurate: rata de potrivire la prima trecere vs text normalizat")
+    p.add_argument("--strazi", type=int, default=3000, help="străzi în extrasul OSM sintetic")
+    p.add_argument("--n", type=int, default=20000, help="adrese brute generate pe străzile din extras")
+    p.add_argument("--prag", type=float, default=0.8, help="încrederea minimă (PRAG_INCREDERE din co.py)")
+    p.set_defaults(func=bench_adrese)
+
+    p = sub.add_parser("grupare", help="grupare aproximativă a adreselor: perechi comparate, precizie / recall")
+    p.add_argument("--strazi", type=int, default=3000)
+    p.add_argument("--proprietati", type=int, default=20000)
+    p.add_argument("--variante", type=int, default=6, help="variante de scriere per proprietate (maxim)")
+    p.add_argument("--prag", type=float, default=0.6, help="similaritatea Jaccard minimă (PRAG_SIMILARITATE)")
+    p.set_defaults(func=bench_grupare)
+
+    p = sub.add_parser("normalizare", help="adrese/s: normalize_address original vs compilat")
+    p.add_argument("--n", type=int, default=100000, help="adrese sintetice în corpus")
+    p.add_argument("--tabel", help="adaugă coloana 'Adresa contemporană' din acest tabel")
+    p.add_argument("--golden", help="corpus de referință (TSV); se creează cu implementarea originală dacă lipsește")
+    p.add_argument("--procese", type=int, default=os.cpu_count() or 1)
+    p.set_defaults(func=bench_normalizare)
+
+    p = sub.add_parser("coordonate", help="corecții de coordonate: rescriere per hit vs jurnal + compactare")
+    p.add_argument("--randuri", type=int, default=50000)
+    p.add_argument("--hituri", type=int, default=300)
+    p.set_defaults(func=bench_coordonate)
+
+    p = sub.add_parser("pipeline", help="runner-ul de etape: paralelism și etape sărite pe un graf sintetic")
+    p.add_argument("--secunde", type=float, default=0.5, help="durata fiecărei etape sintetice")
+    p.add_argument("--etapa", default="grupare_sol", help="etapa din graful real pentru care se arată avalul")
+    p.set_defaults(func=bench_pipeline)
+
+    p = sub.add_parser("geocodare", help="adrese/s prin geocoderul asincron cu providerul fals")
+    p.add_argument("--n", type=int, default=5000, help="adrese (aprox. o treime distincte)")
+    p.add_argument("--latenta", type=float, default=50, help="ms per cerere la providerul fals")
+    p.add_argument("--simultane", type=int, nargs="+", default=[1, 8, 32])
+    p.add_argument("--erori", type=float, default=0.05, help="rata erorilor trecătoare simulate")
+    p.set_defaults(func=bench_geocodare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+
+class CacheActe:
+    """Rezultatele căutărilor pe acteinterne.pmb.ro, persistate între rulări.
+
+    - cautari: (dpg, an) -> lista (text, url) a linkurilor DISPOZITIE/DL10
+      (o listă goală înseamnă „căutat, niciun act”);
+    - pdfuri: url-ul paginii actului -> url-ul PDF-ului rezolvat.
+
+    Intrările mai vechi de `ttl` secunde sunt tratate ca lipsă (expirate);
+    `invalideaza` le șterge manual.
+    """
+
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS cautari (
+                dpg TEXT NOT NULL,
+                an INTEGER NOT NULL,
+                rezultate TEXT NOT NULL,
+                salvat REAL NOT NULL,
+                PRIMARY KEY (dpg, an)
+            )"""
+        )
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS pdfuri (
+                url_act TEXT PRIMARY KEY,
+                url_pdf TEXT NOT NULL,
+                salvat REAL NOT NULL
+            )"""
+        )
+        self.conn.commit()
+        self.contor = {k: 0 for k in ("cautari_hit", "cautari_miss", "pdf_hit", "pdf_miss", "expirate")}
+
+    def _valid(self, salvat):
+        if self.ttl is None or time.time() - salvat <= self.ttl:
+            return True
+        self.contor["expirate"] += 1
+        return False
+
+    def cauta(self, dpg, an):
+        """Lista (text, url) din cache sau None (lipsă / expirată)."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT rezultate, salvat FROM cautari WHERE dpg = ? AND an = ?", (str(dpg), int(an))
+            ).fetchone()
+            if row is None or not self._valid(row[1]):
+                self.contor["cautari_miss"] += 1
+                return None
+            self.contor["cautari_hit"] += 1
+        return [tuple(r) for r in json.loads(row[0])]
+
+    def salveaza_cautare(self, dpg, an, rezultate):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO cautari (dpg, an, rezultate, salvat) VALUES (?, ?, ?, ?)",
+                (str(dpg), int(an), json.dumps(list(rezultate), ensure_ascii=False), time.time()),
+            )
+            self.conn.commit()
+
+    def pdf(self, url_act):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url_pdf, salvat FROM pdfuri WHERE url_act = ?", (url_act,)
+            ).fetchone()
+            if row is None or not self._valid(row[1]):
+                self.contor["pdf_miss"] += 1
+                return None
+            self.contor["pdf_hit"] += 1
+        return row[0]
+
+    def salveaza_pdf(self, url_act, url_pdf):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pdfuri (url_act, url_pdf, salvat) VALUES (?, ?, ?)",
+                (url_act, url_pdf, time.time()),
+            )
+            self.conn.commit()
+
+    def invalideaza(self, dpg=None, an=None, pdfuri=False):
+        """Șterge căutările pentru un DPG (și an), sau toate dacă `dpg` e None.
+
+        Cu `pdfuri=True` se golesc și URL-urile PDF rezolvate. Întoarce câte
+        intrări s-au șters.
+        """
+        conditii, parametri = [], []
+        if dpg is not None:
+            conditii.append("dpg = ?")
+            parametri.append(str(dpg))
+        if an is not None:
+            conditii.append("an = ?")
+            parametri.append(int(an))
+        unde = f" WHERE {' AND '.join(conditii)}" if conditii else ""
+        with self.lock:
+            n = self.conn.execute(f"DELETE FROM cautari{unde}", parametri).rowcount
+            if pdfuri:
+                n += self.conn.execute("DELETE FROM pdfuri").rowcount
+            self.conn.commit()
+        return n
+
+    def raport(self):
+        c = self.contor
+        cautari = c["cautari_hit"] + c["cautari_miss"]
+        pdfuri = c["pdf_hit"] + c["pdf_miss"]
+        rata_c = c["cautari_hit"] / cautari * 100 if cautari else 0.0
+        rata_p = c["pdf_hit"] / pdfuri * 100 if pdfuri else 0.0
+        return (f"cache acte: căutări {c['cautari_hit']}/{cautari} hit ({rata_c:.1f}%), "
+                f"PDF-uri {c['pdf_hit']}/{pdfuri} hit ({rata_p:.1f}%), {c['expirate']} expirate")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    # python cache_acte.py invalideaza [dpg [an]]   |   python cache_acte.py golire
+    path = "cache_acte.sqlite"
+    comanda = sys.argv[1] if len(sys.argv) > 1 else ""
+    cache = CacheActe(path, ttl=None)
+    if comanda == "invalideaza":
+        dpg = sys.argv[2] if len(sys.argv) > 2 else None
+        an = sys.argv[3] if len(sys.argv) > 3 else None
+        print(f"🗑️  {cache.invalideaza(dpg, an)} căutări șterse din {path}")
+    elif comanda == "golire":
+        print(f"🗑️  {cache.invalideaza(pdfuri=True)} intrări șterse din {path}")
+    else:
+        (cautari,) = cache.conn.execute("SELECT COUNT(*) FROM cautari").fetchone()
+        (pdfuri,) = cache.conn.execute("SELECT COUNT(*) FROM pdfuri").fetchone()
+        print(f"{path}: {cautari} căutări, {pdfuri} URL-uri PDF")
+    cache.close()
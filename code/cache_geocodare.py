@@ -0,0 +1,122 @@
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+
+# Cache persistent pentru geocodare, comun pentru co.py și adaugare_coordonate.py.
+# Cheia e (provider, interogarea normalizată, fără diferențe de majuscule /
+# spații), iar valoarea e rezultatul sau un rezultat negativ („negăsit”), cu
+# momentul salvării. Fiecare instanță citește doar rezultatele providerului
+# său, deci coordonatele inventate de „fals” sau cele ale unui Nominatim
+# local nu ajung la rularea cu alt provider. Erorile de rețea nu se salvează, deci
+# geocoderul trebuie să le arunce (RateLimiter cu swallow_exceptions=False):
+# altfel o eroare înghițită ar ajunge în cache ca „negăsit”.
+# La limita Nominatim de 1 cerere/s, fiecare hit e o secundă câștigată.
+
+CACHE_DB = "cache_geocodare.sqlite"
+
+# Același acces ca la un geopy.Location: .latitude, .longitude, .address
+Locatie = namedtuple("Locatie", "latitude longitude address")
+
+
+def cheie(interogare):
+    return " ".join(str(interogare).split()).casefold()
+
+
+class CacheGeocodare:
+    def __init__(self, path=CACHE_DB, provider="nominatim"):
+        self.provider = provider
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS geocodari (
+                provider TEXT NOT NULL,
+                interogare TEXT NOT NULL,
+                gasit INTEGER NOT NULL,
+                lat REAL,
+                lon REAL,
+                adresa TEXT,
+                salvat REAL NOT NULL,
+                PRIMARY KEY (provider, interogare)
+            )"""
+        )
+        # cache-urile vechi aveau cheia doar interogarea (tabelul `rezultate`)
+        if self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'rezultate'").fetchone():
+            self.conn.execute(
+                "INSERT OR IGNORE INTO geocodari "
+                "SELECT COALESCE(provider, 'nominatim'), interogare, gasit, lat, lon, adresa, salvat FROM rezultate"
+            )
+            self.conn.execute("DROP TABLE rezultate")
+        self.conn.commit()
+        self.hits = 0
+        self.hits_negative = 0
+        self.misses = 0
+
+    def cauta(self, interogare):
+        """(True, Locatie) / (True, None) pentru negăsit / (False, None) dacă nu e în cache."""
+        row = self.conn.execute(
+            "SELECT gasit, lat, lon, adresa FROM geocodari WHERE provider = ? AND interogare = ?",
+            (self.provider, cheie(interogare)),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        if not row[0]:
+            self.hits_negative += 1
+            return True, None
+        return True, Locatie(row[1], row[2], row[3])
+
+    def contine(self, interogare):
+        """Dacă interogarea e în cache (fără să conteze la statistici)."""
+        return self.conn.execute(
+            "SELECT 1 FROM geocodari WHERE provider = ? AND interogare = ?", (self.provider, cheie(interogare))
+        ).fetchone() is not None
+
+    def salveaza(self, interogare, location, provider=None):
+        """Salvează rezultatul (un obiect cu .latitude/.longitude) sau None pentru negăsit.
+
+        `provider` e cel care a răspuns; implicit providerul cache-ului.
+        """
+        if location is None:
+            valori = (0, None, None, None)
+        else:
+            valori = (1, location.latitude, location.longitude, getattr(location, "address", None))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO geocodari (provider, interogare, gasit, lat, lon, adresa, salvat) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (provider or self.provider, cheie(interogare), *valori, time.time()),
+        )
+        self.conn.commit()
+
+    def geocodeaza(self, interogare, geocode):
+        """Rezultatul din cache sau, la miss, `geocode(interogare)` salvat în cache.
+
+        Întoarce (location sau None, din_cache). Excepțiile lui `geocode` trec mai departe.
+        """
+        gasit, location = self.cauta(interogare)
+        if gasit:
+            return location, True
+        location = geocode(interogare)
+        self.salveaza(interogare, location, self.provider)
+        return location, False
+
+    def raport(self):
+        total = self.hits + self.misses
+        rata = self.hits / total * 100 if total else 0.0
+        return (f"cache geocodare: {self.hits}/{total} hit-uri ({rata:.1f}%, "
+                f"{self.hits_negative} negative) — {self.hits} apeluri de rețea evitate "
+                f"(~{self.hits / 60:.1f} min la 1 cerere/s)")
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    # python cache_geocodare.py   -> câte intrări are cache-ul, pe provideri
+    path = sys.argv[1] if len(sys.argv) > 1 else CACHE_DB
+    cache = CacheGeocodare(path)
+    for provider, gasite, total in cache.conn.execute(
+        "SELECT provider, SUM(gasit), COUNT(*) FROM geocodari GROUP BY provider"
+    ):
+        print(f"{provider}: {total} interogări, {gasite} găsite, {total - gasite} negative")
+    cache.close()
@@ -0,0 +1,70 @@
+import json
+import sqlite3
+
+
+class CacheParsare:
+    """Rândurile parsate pentru fiecare dosar, cheiate după hash-ul conținutului.
+
+    O intrare e validă doar dacă atât hash-ul HTML-ului, cât și versiunea
+    parserului coincid; altfel dosarul se parsează din nou și intrarea se
+    înlocuiește (invalidare).
+    """
+
+    def __init__(self, path, versiune):
+        self.versiune = versiune
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS intrari (
+                id INTEGER PRIMARY KEY,
+                hash TEXT NOT NULL,
+                versiune INTEGER NOT NULL,
+                rows TEXT NOT NULL
+            )"""
+        )
+        self.hits = 0
+        self.misses = 0
+        self.invalidari = 0
+        self._existente = {
+            i: (h, v) for i, h, v in self.conn.execute("SELECT id, hash, versiune FROM intrari")
+        }
+
+    def hash_uri_valide(self):
+        """id -> hash pentru intrările scrise cu versiunea curentă a parserului."""
+        return {i: h for i, (h, v) in self._existente.items() if v == self.versiune}
+
+    def randuri(self, ids):
+        """Rândurile din cache pentru `ids` (toate trebuie să fie hit-uri)."""
+        ids = list(ids)
+        self.hits += len(ids)
+        rezultat = {}
+        for k in range(0, len(ids), 500):
+            bucata = ids[k:k + 500]
+            marcaje = ",".join("?" * len(bucata))
+            for i, rows in self.conn.execute(
+                f"SELECT id, rows FROM intrari WHERE id IN ({marcaje})", bucata
+            ):
+                rezultat[i] = json.loads(rows)
+        return rezultat
+
+    def salveaza(self, intrari):
+        """`intrari`: (id, hash, rows) pentru dosarele tocmai parsate."""
+        for i, h, _ in intrari:
+            if i in self._existente:
+                self.invalidari += 1
+            else:
+                self.misses += 1
+            self._existente[i] = (h, self.versiune)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO intrari (id, hash, versiune, rows) VALUES (?, ?, ?, ?)",
+            ((i, h, self.versiune, json.dumps(rows, ensure_ascii=False)) for i, h, rows in intrari),
+        )
+        self.conn.commit()
+
+    def raport(self):
+        total = self.hits + self.misses + self.invalidari
+        rata = self.hits / total * 100 if total else 0.0
+        return (f"cache parsare: {self.hits} hit-uri, {self.misses} noi, "
+                f"{self.invalidari} invalidate ({rata:.1f}% din cache)")
+
+    def close(self):
+        self.conn.close()
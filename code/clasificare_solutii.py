@@ -0,0 +1,117 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Clasificarea soluțiilor pe coloane întregi, pentru solutie.py și
+# grupare_sol.py. Regulile (în ordinea de precedență) sunt compilate într-un
+# singur model: câte un lookahead ancorat la început (\A, deci un text fără
+# potrivire nu se reîncearcă din fiecare poziție) pentru fiecare grup, cu
+# un grup numit gol la capăt, deci ramura care se potrivește (m.lastgroup)
+# e primul grup din tabel ale cărui cuvinte apar oriunde în text, exact ca
+# șirul de `re.search` din classify_solution_regex. Solutie_string are puține
+# valori distincte: fiecare se clasifică o singură dată (pd.factorize), iar
+# rândurile se completează prin indexare. Metodele `.str` din pandas
+# (extract, rsplit, rpartition) au ieșit mai lente decât apply pe aceste
+# coloane, deci nu sunt folosite.
+#
+# classify_solution_regex și extrage_solutie rămân ca implementare de
+# referință pentru testul diferențial (tests/test_clasificare_solutii.py).
+
+# (grup, modele pe textul cu litere mici) în ordinea de precedență
+REGULI = [
+    ("Restituire", [r"restit"]),
+    ("Compensare/Despagubiri", [r"\bmre\b", r"\bmcp\b", r"masuri", r"compens"]),
+    ("Respins/Negativ", [r"resp", r"\brn\b"]),
+    ("Revocare/Anulare", [r"revoc", r"anul"]),
+    ("Declinare/Transfer", [r"declin", r"djcl", r"transmis"]),
+]
+FARA_SOLUTIE = "NONE"
+
+RE_SOLUTIE = re.compile(
+    r"\A(?:"
+    + "|".join(f"(?=.*?(?:{'|'.join(modele)}))(?P<g{k}>)" for k, (_, modele) in enumerate(REGULI))
+    + ")",
+    re.DOTALL,
+)
+GRUPURI = {f"g{k}": grup for k, (grup, _) in enumerate(REGULI)}
+
+
+def classify_solution_regex(sol):
+    """Implementarea originală, rând cu rând (referința pentru clasifica_solutii)."""
+    if pd.isna(sol):
+        return "NONE"
+    sol = sol.strip()
+
+    # Transformă tot în lowercase pentru comparații corecte
+    sol_lower = sol.lower()
+
+    # 🔹 1. Restituire (orice formă care conține "restit")
+    if re.search(r"restit", sol_lower):
+        return "Restituire"
+
+    # 🔹 2. Despăgubiri / compensații (MRE, MCP, masuri reparatorii, compensare)
+    if re.search(r"\bmre\b", sol_lower) or \
+       re.search(r"\bmcp\b", sol_lower) or \
+       re.search(r"masuri", sol_lower) or \
+       re.search(r"compens", sol_lower):
+        return "Compensare/Despagubiri"
+
+    # 🔹 3. Respins / negative (respins, resp., se respinge, RN)
+    if re.search(r"resp", sol_lower) or re.search(r"\brn\b", sol_lower):
+        return "Respins/Negativ"
+
+    # 🔹 4. Revocare / anulare
+    if re.search(r"revoc", sol_lower) or re.search(r"anul", sol_lower):
+        return "Revocare/Anulare"
+
+    # 🔹 5. Declinare / transfer (declinare competență, DJCL, transmis ANRP/AVAS)
+    if re.search(r"declin", sol_lower) or \
+       re.search(r"djcl", sol_lower) or \
+       re.search(r"transmis", sol_lower):
+        return "Declinare/Transfer"
+
+    # 🔹 dacă nu se potrivește în niciun grup – rămâne cum e
+    return sol
+
+
+def extrage_solutie(text):
+    """Implementarea originală din solutie.py: partea de după ultima virgulă."""
+    try:
+        # Ia tot ce vine după ultima virgulă și scoate spațiile
+        return text.split(',')[-1].strip()
+    except:
+        return None
+
+
+def clasifica(sol):
+    """classify_solution_regex pe un singur șir, cu modelul compilat."""
+    if pd.isna(sol):
+        return FARA_SOLUTIE
+    sol = sol.strip()
+    m = RE_SOLUTIE.match(sol.lower())
+    return GRUPURI[m.lastgroup] if m else sol
+
+
+def clasifica_solutii(serie):
+    """Coloana Solutie_grup din Solutie_string; identic cu `serie.apply(classify_solution_regex)`.
+
+    Fiecare valoare distinctă se clasifică o singură dată; lipsurile (cod -1
+    la factorize) cad pe ultimul element, FARA_SOLUTIE.
+    """
+    serie = pd.Series(serie)
+    coduri, unice = pd.factorize(serie)
+    grupuri = np.array([clasifica(sol) for sol in unice] + [FARA_SOLUTIE], dtype=object)
+    return pd.Series(grupuri[coduri], index=serie.index, dtype=object)
+
+
+def extrage_solutii(serie):
+    """Coloana Solutie_string din Soluție; identic cu `serie.apply(extrage_solutie)`.
+
+    Soluție are aproape câte o valoare distinctă pe rând (DPG și dată), deci
+    aici nu se deduplică: o trecere cu str.rpartition, fără apelul de funcție
+    și try/except per rând.
+    """
+    serie = pd.Series(serie)
+    return pd.Series([t.rpartition(",")[2].strip() if isinstance(t, str) else None for t in serie],
+                     index=serie.index, dtype=object)
@@ -1,135 +1,243 @@
+import asyncio
 import csv
-import time
-import requests
-import re
-
-# Funcția ta de normalizare
-def normalize_address(address):
-    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])G-RAL(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
-    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])BIS(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
-    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])SNIC(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
-
-    replacements = {
-        r'(?i)\bS(TRA?D?A?)?\.?\b': 'Strada',
-        r'(?i)\bIN(TR(ARE|\.?)?)?\b|\bIN\b': 'Intrarea',
-        r'(?i)\bFUND(ATURA?|AT|A|\.?)\b|\bFUNDA\.?\b': 'Fundatura',
-        r'(?i)\bB([- ]?DUL|D|UL|UL\.?|ULUI|DULUI|ULEVARD|ULEVARDUL)?\.?\b': 'Bulevardul',
-        r'(?i)\bCAL(EA)?\.?\b|\bCALE\.?\b': 'Calea',
-        r'(?i)\bS(OS(EAUA?)?|OSEA)?\.?\b': 'Soseaua',
-        r'(?i)\bAL(EE?A?)?\.?\b': 'Aleea',
-        r'(?i)\bPREL(UNGIREA?)?\.?\b': 'Prelungirea',
-        r'(?i)\bCOM(UNA?|\.?)\b|\bCO\b': 'Comuna',
-        r'(?i)\bCART(IER(UL)?|\.?)\b|\bCAR\b': 'Cartierul',
-        r'(?i)\bSAT(UL)?\.?\b': 'Satul',
-        r'(?i)\bPIA(TA)?\.?\b': 'Piata',
-        r'(?i)\bDRUM(UL)?\.?\b|\bDR\b': 'Drumul',
-        r'(?i)\bZONA?\.?\b': 'Zona',
-        r'(?i)\bMOS(IA)?\.?\b': 'Mosia',
-        r'(?i)\bPARC(UL)?\.?\b': 'Parcul',
-        r'(?i)\bLOCALIT(ATEA)?\.?\b|\bLOC\b': 'Localitatea'
-    }
-
-    normalized = address.strip()
-    for pattern, replacement in replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
-
-    normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)\.', r'\1', normalized)
-    normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)([A-ZĂÂÎȘȚ])', r'\1 \2', normalized)
-    normalized = re.sub(r'\b([A-ZĂÂÎȘȚ])\.\s*', '', normalized)
-    normalized = re.sub(r'[,:.]', ' ', normalized)
-    normalized = re.sub(r'\s+', ' ', normalized)
-
-    fn_match = re.search(r'(?i)\bFN\s*\((\d+)\)', normalized)
-    if fn_match:
-        normalized = re.sub(r'(?i)\bFN\s*\(\d+\)', fn_match.group(1), normalized)
-    normalized = re.sub(r'\([^)]*\)', '', normalized)
-    normalized = re.sub(r'(?i)\bFN\b', 'FN', normalized)
-    normalized = re.sub(r'(?i)\b(nr|numar|nrul|numarul)\b', 'nr', normalized)
-
-    nr_fn = bool(re.search(r'(?i)\bnr\s*[:.]*\s*FN\b', normalized))
-    match_nr = re.search(r'(?i)\bnr\s*[:.]*\s*([\d]+)', normalized)
-    first_nr = match_nr.group(1) if match_nr else None
-
-    match_parcela = re.search(r'(?i)\bPARCELA\s*([A-Z0-9]+)\b', normalized)
-    if match_parcela:
-        parcela_raw = match_parcela.group(1)
-        parcela_num = re.match(r'\d+', parcela_raw)
-        parcela_num = parcela_num.group(0) if parcela_num else None
-    else:
-        parcela_num = None
-
-    normalized = re.sub(r'(?i)\bnr\s*[:.]*\s*[^,]*', '', normalized)
-    normalized = re.sub(r'(?i)\bPARC(ELA)?\s*[A-Z0-9]*', '', normalized)
-
-    if nr_fn and parcela_num:
-        add_number = parcela_num
-    elif first_nr:
-        add_number = first_nr
-    else:
-        add_number = None
-
-    if add_number:
-        normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)([^0-9]*)',
-                            r'\1\2 ' + add_number + ' ', normalized, 1)
-
-    sector_match = re.search(r'(?i)\bsector\s*:?\.?\s*(\d+)', address)
-    if sector_match:
-        sector = sector_match.group(1)
-        if sector != '0':
-            normalized += f" sector {sector}"
-
-    tokens = normalized.split()
-    if tokens:
-        prefix = tokens[0]
-        filtered_tokens = [prefix]
-        for t in tokens[1:]:
-            if re.fullmatch(r'\d+[A-Z]*', t) or t.isupper() or t.lower() == 'sector':
-                filtered_tokens.append(t)
-        normalized = ' '.join(filtered_tokens)
-
-    normalized = re.sub(r'\s+', ' ', normalized).strip()
-    normalized = re.sub(r',\s*$', '', normalized)
-
-    if not re.search(r'(?i)\bbucuresti\b$', normalized):
-        normalized += ' bucuresti'
-
-    return normalized
-
-import csv
-from geopy.geocoders import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-from geopy.exc import GeocoderUnavailable, GeocoderTimedOut
-import requests
 import os
-import time
+from collections import Counter, defaultdict
 
-geolocator = Nominatim(user_agent="geo_csv_script")
-geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
+import tabel
+import geocodare
+import grupare_adrese
+from normalizare import normalize_address, parseaza_adresa
+from cache_geocodare import CacheGeocodare
+from nomenclator import NomenclatorStradal
 
-input_file = 'dosare.csv'
+# Providerul de geocodare, din geocodare.PROVIDERI: "nominatim" (public,
+# 1 cerere/s), "local" (Nominatim propriu, fără limită de rată) sau "fals"
+# (coordonate inventate, pentru teste fără rețea)
+PROVIDER = "nominatim"
+geocoder = geocodare.Geocoder.din_config(PROVIDER)
+
+input_file = tabel.cale('dosare')
+# progresul se scrie rând cu rând în CSV (permite reluarea); la final,
+# tabelul complet se salvează și în formatul comun (Parquet)
 output_file = 'dosare_geocode.csv'
+output_tabel = tabel.cale('dosare_geocode')
 negasite_file = 'negasite.txt'
+# Mod pe loturi: adresele rămase se normalizează și se grupează după adresa
+# normalizată, fiecare adresă distinctă se geocodează o singură dată (cele
+# mai frecvente primele, cu cererile asincrone în limitele providerului), apoi
+# coordonatele se scriu pe toate rândurile grupului. Ieșirea
+# (dosare_geocode.csv, negasite.txt) e aceeași.
+MOD_LOT = True
+# Geocoder offline din extrasul OSM (construit cu `python nomenclator.py`);
+# rezultatele sub PRAG_INCREDERE merg la Nominatim dacă FALLBACK_NOMINATIM
+NOMENCLATOR = "nomenclator.pickle"
+PRAG_INCREDERE = 0.8
+FALLBACK_NOMINATIM = True
+# Fiecare adresă se caută întâi structurat (tip / nume / număr la
+# nomenclator, street / city la geocoder), apoi ca text normalizat;
+# componentele se salvează și ca coloane
+INTEROGARE_STRUCTURATA = True
+COLOANE_ADRESA = {
+    'Adresa_tip': 'tip', 'Adresa_strada': 'nume', 'Adresa_numar': 'numar',
+    'Adresa_parcela': 'parcela', 'Adresa_sector': 'sector', 'Adresa_localitate': 'localitate',
+}
+
+# Variantele aceleiași adrese ("STR. X nr 5", "Strada X 5 sector 2") se
+# grupează aproximativ (grupare_adrese.py) și se geocodează o singură dată,
+# prin reprezentantul grupului; id-ul grupului se salvează în COLOANA_GRUP,
+# ca cheie "aceeași proprietate" pentru hărți
+GRUPARE_ADRESE = True
+COLOANA_GRUP = 'Grup_adresa'
 
 # Determină de la ce linie să continuăm
 start_line = 1
+header_existent = None
 if os.path.exists(output_file):
     with open(output_file, newline='', encoding='utf-8') as f_out:
         reader_out = csv.reader(f_out)
         rows = list(reader_out)
         if len(rows) > 1:
             start_line = len(rows)
+            header_existent = rows[0]
+
+df_in = tabel.citeste(input_file).astype(object).fillna('')
+cache = CacheGeocodare(provider=geocoder.nume)
+nomenclator = NomenclatorStradal.incarca(NOMENCLATOR) if os.path.exists(NOMENCLATOR) else None
+contor_offline = 0
+
+
+def cheie_adresa(address):
+    """(adresa structurată, adresa normalizată): cheia după care se grupează rândurile."""
+    return parseaza_adresa(address), normalize_address(address)
+
+
+def interogari(cheie):
+    """Interogările de încercat pe rând pentru o adresă: structurată (dacă are nume), apoi text."""
+    structurata, normalized_address = cheie
+    if INTEROGARE_STRUCTURATA and structurata.nume:
+        return structurata, normalized_address
+    return (normalized_address,)
+
+
+def cauta_offline(interogare):
+    """Rezultatul din nomenclator dacă e destul de sigur, altfel None."""
+    if nomenclator is None:
+        return None
+    r = nomenclator.cauta(interogare)
+    return r if r is not None and r.incredere >= PRAG_INCREDERE else None
+
+
+def geocodeaza_adresa(cheie, eticheta):
+    """("ok", location) / ("negasit", None) / ("eroare", e) / ("retea", None) după reîncercările epuizate."""
+    global contor_offline
+    for interogare in interogari(cheie):
+        location = cauta_offline(interogare)
+        if location is not None:
+            contor_offline += 1
+            return "ok", location
+        if nomenclator is not None and not FALLBACK_NOMINATIM:
+            continue
+        try:
+            location, _ = cache.geocodeaza(interogare, geocoder.geocodeaza)
+            if location:
+                return "ok", location
+        except geocodare.EroareRetea as e:
+            print(f"{eticheta}: Eroare rețea, renunț -> {e}")
+            return "retea", None
+        except Exception as e:
+            return "eroare", e
+    return "negasit", None
+
+
+def cauta_local(interogare):
+    """cauta_offline pentru geocodeaza_lot, cu numărarea rezultatelor offline."""
+    global contor_offline
+    location = cauta_offline(interogare)
+    if location is not None:
+        contor_offline += 1
+    return location
 
-with open(input_file, newline='', encoding='utf-8') as csvfile_in, \
-     open(output_file, 'a', newline='', encoding='utf-8') as csvfile_out, \
+
+def progres_functie(randuri):
+    """Linia de progres a lotului; `randuri`: cheie -> câte rânduri acoperă."""
+    def progres(k, cheie, stare, rezultat):
+        detaliu = f"{rezultat.latitude}, {rezultat.longitude}" if stare == "ok" else stare.upper()
+        print(f"Adresa {k} ({randuri[cheie]} rânduri): {cheie[1]} -> {detaliu}")
+    return progres
+
+
+def completeaza_rand(i, row, cheie, stare, rezultat, f_neg):
+    """Scrie componentele adresei și coordonatele (sau golul + linia din negasite.txt) pe rândul `i`."""
+    structurata, normalized_address = cheie
+    for coloana, camp in COLOANE_ADRESA.items():
+        valoare = getattr(structurata, camp)
+        row[coloana] = '' if valoare is None else valoare
+    if stare == "ok":
+        row['latitude'] = rezultat.latitude
+        row['longitude'] = rezultat.longitude
+        print(f"Linia {i}: {normalized_address} -> {rezultat.latitude}, {rezultat.longitude}")
+    elif stare == "negasit":
+        row['latitude'] = ''
+        row['longitude'] = ''
+        f_neg.write(f"Linia {i}: {normalized_address}\n")
+        print(f"Linia {i}: {normalized_address} -> NEGASIT")
+    elif stare == "eroare":
+        row['latitude'] = ''
+        row['longitude'] = ''
+        f_neg.write(f"Linia {i}: {normalized_address} (eroare: {rezultat})\n")
+        print(f"Linia {i}: {normalized_address} -> EROARE: {rezultat}")
+
+
+def grupeaza_de_facut(randuri):
+    """Cheile adreselor din `randuri` și grupurile lor de variante.
+
+    `randuri` sunt toate rândurile cu adresă, nu doar cele rămase de la o
+    reluare: grupurile (și id-urile lor) trebuie să fie aceleași oricând
+    s-ar fi oprit rularea. Întoarce (adresa brută -> cheie, cheie -> cheia
+    reprezentantului grupului, cheie -> id-ul grupului).
+    """
+    frecvente = Counter(address for _, _, address in randuri)
+    chei = {address: cheie_adresa(address) for address in frecvente}
+    ponderi = Counter()
+    for address, n in frecvente.items():
+        ponderi[chei[address]] += n
+    distincte = list(ponderi)
+    statistici = {}
+    reprezentanti = grupare_adrese.grupeaza([c[0] for c in distincte], [ponderi[c] for c in distincte],
+                                            statistici=statistici)
+    canonic = {c: distincte[r] for c, r in zip(distincte, reprezentanti)}
+    membri = defaultdict(list)
+    for c, r in zip(distincte, reprezentanti):
+        membri[r].append(c[0])
+    id_pe_grup = {r: grupare_adrese.id_grup(m) for r, m in membri.items()}
+    iduri = {c: id_pe_grup[r] for c, r in zip(distincte, reprezentanti)}
+    print(f"🧩 {len(distincte)} adrese distincte -> {len(set(reprezentanti))} grupuri de variante "
+          f"({statistici['comparate']} perechi comparate)")
+    return chei, canonic, iduri
+
+
+def de_cerut(ordine):
+    """Câte chei din `ordine` merg la rețea: cele fără nicio interogare deja în cache."""
+    return sum(1 for c in ordine if not any(cache.contine(q) for q in interogari(c)))
+
+
+def geocodeaza_loturi(de_facut, chei=None, canonic=None):
+    """`de_facut`: (i, row, adresa brută). Geocodează fiecare adresă distinctă o dată.
+
+    Cu `chei` / `canonic` (din grupeaza_de_facut), doar reprezentanții
+    grupurilor; fără, cheile se calculează aici, înainte de lot. Întoarce
+    (i -> cheia adresei, cheia geocodată -> (stare, rezultat)).
+    """
+    if nomenclator is not None and not FALLBACK_NOMINATIM:
+        return {}, {}  # doar offline: rând cu rând, fără rețea
+    if chei is None:
+        chei = {address: cheie_adresa(address) for address in {address for _, _, address in de_facut}}
+    # cele mai frecvente primele: cele mai multe rânduri rezolvate cât mai devreme
+    randuri = Counter(canonic[chei[address]] if canonic else chei[address] for _, _, address in de_facut)
+    ordine = [c for c, _ in randuri.most_common()]
+    total = len(de_facut)
+    necunoscute = de_cerut(ordine)
+    print(f"📦 {total} rânduri cu adresă, {len(ordine)} {'grupuri' if canonic else 'adrese normalizate distincte'} "
+          f"(raport unic/total {len(ordine) / max(total, 1):.3f}), {necunoscute} nu sunt în cache; "
+          f"geocoder {geocoder.nume}, {geocoder.simultane} cereri simultane")
+    pe_secunda = geocoder.galeata.pe_secunda
+    if pe_secunda:
+        print(f"⏱️  Durată estimată: cel mult {necunoscute / pe_secunda / 3600:.1f} h "
+              f"(rând cu rând: {total / pe_secunda / 3600:.1f} h)")
+    _, rezultate = asyncio.run(geocodare.geocodeaza_lot(
+        ordine, geocoder, None, cache, cauta_local, progres_functie(randuri), variante=interogari))
+    return {i: chei[address] for i, _, address in de_facut}, rezultate
+
+
+with open(output_file, 'a', newline='', encoding='utf-8') as csvfile_out, \
      open(negasite_file, 'a', encoding='utf-8') as f_neg:
 
-    reader = csv.DictReader(csvfile_in)
-    fieldnames = reader.fieldnames + ['latitude', 'longitude']
-    writer = csv.DictWriter(csvfile_out, fieldnames=fieldnames)
+    reader = df_in.to_dict('records')
+    # la reluare se păstrează antetul existent (un fișier început fără
+    # coloanele Adresa_* le primește doar la o rulare de la zero)
+    fieldnames = header_existent or (list(df_in.columns) + ['latitude', 'longitude']
+                                     + list(COLOANE_ADRESA) + [COLOANA_GRUP])
+    writer = csv.DictWriter(csvfile_out, fieldnames=fieldnames, extrasaction='ignore')
 
     if start_line == 1:
         writer.writeheader()
 
+    rezultate = {}
+    normalizate = {}
+    cu_adresa = [
+        (i, row, row.get('Adresa contemporană', '').strip())
+        for i, row in enumerate(reader, start=1)
+        if row.get('Adresa contemporană', '').strip()
+    ]
+    de_facut = [r for r in cu_adresa if r[0] >= start_line]
+    chei, canonic, iduri = grupeaza_de_facut(cu_adresa) if GRUPARE_ADRESE else (None, None, None)
+    if MOD_LOT:
+        # progresul pe loturi stă în cache-ul de geocodare: o reluare după
+        # crash regăsește acolo toate adresele deja rezolvate
+        normalizate, rezultate = geocodeaza_loturi(de_facut, chei, canonic)
+    elif chei:
+        normalizate = {i: chei[address] for i, _, address in de_facut}
+
     for i, row in enumerate(reader, start=1):
         if i < start_line:
             continue
@@ -140,33 +248,29 @@ with open(input_file, newline='', encoding='utf-8') as csvfile_in, \
             f_neg.write("Linia {}: Adresă goală\n".format(i))
             row['latitude'] = ''
             row['longitude'] = ''
+            row.update(dict.fromkeys(COLOANE_ADRESA, ''))
+            row[COLOANA_GRUP] = ''
         else:
-            normalized_address = normalize_address(address)
-            retries = 5  # încercări multiple în caz de cădere rețea
-            while retries > 0:
-                try:
-                    location = geocode(normalized_address)
-                    if location:
-                        row['latitude'] = location.latitude
-                        row['longitude'] = location.longitude
-                        print(f"Linia {i}: {normalized_address} -> {location.latitude}, {location.longitude}")
-                    else:
-                        row['latitude'] = ''
-                        row['longitude'] = ''
-                        f_neg.write(f"Linia {i}: {normalized_address}\n")
-                        print(f"Linia {i}: {normalized_address} -> NEGASIT")
-                    break  # am terminat cu succes
-                except (GeocoderUnavailable, GeocoderTimedOut, requests.exceptions.ConnectionError) as e:
-                    retries -= 1
-                    print(f"Linia {i}: Eroare rețea, mai încerc {retries} -> {normalized_address}")
-                    time.sleep(5)
-                except Exception as e:
-                    row['latitude'] = ''
-                    row['longitude'] = ''
-                    f_neg.write(f"Linia {i}: {normalized_address} (eroare: {e})\n")
-                    print(f"Linia {i}: {normalized_address} -> EROARE: {e}")
-                    break
+            cheie = normalizate.get(i) or cheie_adresa(address)
+            # rândul își păstrează componentele proprii, dar coordonatele sunt ale grupului
+            reprezentant = canonic.get(cheie, cheie) if canonic else cheie
+            row[COLOANA_GRUP] = iduri[cheie] if iduri else grupare_adrese.id_grup([cheie[0]])
+            if reprezentant in rezultate:
+                stare, rezultat = rezultate[reprezentant]
+            else:
+                stare, rezultat = geocodeaza_adresa(reprezentant, f"Linia {i}")
+            completeaza_rand(i, row, cheie, stare, rezultat, f_neg)
 
         writer.writerow(row)  # salvăm imediat progresul
         csvfile_out.flush()
         f_neg.flush()
+
+if nomenclator is not None:
+    print(f"🗺️  {contor_offline} adrese rezolvate offline din nomenclator (încredere ≥ {PRAG_INCREDERE})")
+print(cache.raport())
+print(f"🌐 {geocoder.nume}: {geocoder.contor['cereri']} cereri, {geocoder.contor['reincercari']} reîncercări")
+cache.close()
+geocoder.close()
+
+if output_tabel != output_file:
+    tabel.scrie(tabel.citeste(output_file), output_tabel)
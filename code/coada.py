@@ -0,0 +1,181 @@
+import sqlite3
+import threading
+import time
+
+# Stările posibile ale unui element din coadă
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class _CoadaSQLite:
+    """Coadă persistentă (SQLite), partajată între thread-uri.
+
+    Fiecare element are o stare (pending / running / ok / cancelled / failed)
+    și, pentru eșecuri, motivul. Elementele rămase în `running` după un crash
+    sunt repuse în `pending` la deschidere, deci reluarea pornește exact de
+    unde s-a oprit. Subclasele definesc tabelul și coloanele cheii.
+    """
+
+    TABEL = None
+    CHEIE = ()
+    COLOANE_CHEIE = ""
+    COLOANE_EXTRA = ""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            f"""CREATE TABLE IF NOT EXISTS {self.TABEL} (
+                {self.COLOANE_CHEIE},
+                stare TEXT NOT NULL,
+                motiv TEXT,
+                incercari INTEGER NOT NULL DEFAULT 0,
+                actualizat REAL{self.COLOANE_EXTRA},
+                PRIMARY KEY ({", ".join(self.CHEIE)})
+            )"""
+        )
+        self.conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{self.TABEL}_stare ON {self.TABEL}(stare, {', '.join(self.CHEIE)})"
+        )
+        # ce a rămas "în lucru" la ultima rulare se reia
+        self.conn.execute(f"UPDATE {self.TABEL} SET stare = ? WHERE stare = ?", (PENDING, RUNNING))
+        self.conn.commit()
+
+    @property
+    def _unde_cheie(self):
+        return " AND ".join(f"{c} = ?" for c in self.CHEIE)
+
+    def _ia_urmatorul(self):
+        with self.lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(self.CHEIE)} FROM {self.TABEL} WHERE stare = ? "
+                f"ORDER BY {', '.join(self.CHEIE)} LIMIT 1",
+                (PENDING,),
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                f"UPDATE {self.TABEL} SET stare = ?, incercari = incercari + 1, actualizat = ? "
+                f"WHERE {self._unde_cheie}",
+                (RUNNING, time.time(), *row),
+            )
+            self.conn.commit()
+            return row
+
+    def _marcheaza(self, cheie, stare, motiv=None, **extra):
+        seturi = "".join(f", {col} = ?" for col in extra)
+        with self.lock:
+            self.conn.execute(
+                f"UPDATE {self.TABEL} SET stare = ?, motiv = ?, actualizat = ?{seturi} "
+                f"WHERE {self._unde_cheie}",
+                (stare, motiv, time.time(), *extra.values(), *cheie),
+            )
+            self.conn.commit()
+
+    def reia_esuate(self):
+        """Repune în `pending` toate elementele `failed`."""
+        with self.lock:
+            cur = self.conn.execute(
+                f"UPDATE {self.TABEL} SET stare = ? WHERE stare = ?", (PENDING, FAILED)
+            )
+            self.conn.commit()
+            return cur.rowcount
+
+    def statistici(self):
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT stare, COUNT(*) FROM {self.TABEL} GROUP BY stare"
+            ).fetchall()
+        return dict(rows)
+
+    def numar_pending(self):
+        return self.statistici().get(PENDING, 0)
+
+    def esuate(self):
+        """Lista (cheie..., motiv) pentru elementele eșuate."""
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT {', '.join(self.CHEIE)}, motiv FROM {self.TABEL} WHERE stare = ? "
+                f"ORDER BY {', '.join(self.CHEIE)}",
+                (FAILED,),
+            ).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class CoadaDosare(_CoadaSQLite):
+    """Id-urile de dosar de descărcat de pe www3.pmb.ro."""
+
+    TABEL = "dosare"
+    CHEIE = ("id",)
+    COLOANE_CHEIE = "id INTEGER NOT NULL"
+
+    def adauga(self, ids):
+        """Adaugă id-uri noi ca `pending`; cele deja cunoscute rămân neatinse."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dosare (id, stare) VALUES (?, ?)",
+                ((int(i), PENDING) for i in ids),
+            )
+            self.conn.commit()
+
+    def readauga(self, ids):
+        """Forțează re-descărcarea unor id-uri, indiferent de starea lor."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT INTO dosare (id, stare) VALUES (?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET stare = excluded.stare, motiv = NULL",
+                ((int(i), PENDING) for i in ids),
+            )
+            self.conn.commit()
+
+    def ia_urmatorul(self):
+        """Rezervă atomic cel mai mic id `pending`; întoarce None dacă nu mai sunt."""
+        row = self._ia_urmatorul()
+        return row[0] if row else None
+
+    def marcheaza(self, dosar_id, stare, motiv=None):
+        self._marcheaza((int(dosar_id),), stare, motiv)
+
+
+class CoadaJoburi(_CoadaSQLite):
+    """Registrul joburilor de descărcare a actelor: un job per (DPG, dată).
+
+    `dosar` e dosarul care a cerut primul actul (folosit în numele PDF-ului),
+    `pdfuri` câte PDF-uri s-au salvat pentru job.
+    """
+
+    TABEL = "joburi"
+    CHEIE = ("dpg", "data")
+    COLOANE_CHEIE = "dpg TEXT NOT NULL, data TEXT NOT NULL"
+    COLOANE_EXTRA = ",\n                dosar TEXT,\n                pdfuri INTEGER NOT NULL DEFAULT 0"
+
+    def adauga(self, joburi):
+        """`joburi`: (dpg, data_iso, dosar); cele deja cunoscute rămân neatinse."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO joburi (dpg, data, dosar, stare) VALUES (?, ?, ?, ?)",
+                ((dpg, data, dosar, PENDING) for dpg, data, dosar in joburi),
+            )
+            self.conn.commit()
+
+    def ia_urmatorul(self):
+        """Rezervă atomic un job `pending`: (dpg, data, dosar) sau None."""
+        row = self._ia_urmatorul()
+        if row is None:
+            return None
+        with self.lock:
+            (dosar,) = self.conn.execute(
+                "SELECT dosar FROM joburi WHERE dpg = ? AND data = ?", row
+            ).fetchone()
+        return row[0], row[1], dosar
+
+    def marcheaza(self, dpg, data, stare, motiv=None, pdfuri=0):
+        self._marcheaza((dpg, data), stare, motiv, pdfuri=pdfuri)
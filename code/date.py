@@ -1,18 +1,78 @@
+import csv
+import hashlib
 import os
 import re
-import pandas as pd
+import time
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
+from lxml import etree
+
+import tabel
+from arhiva import CititorArhiva
+from cache_parsare import CacheParsare
 
 # === CONFIG ===
 INPUT_FOLDER = "responses"   # folderul unde ai fișierele HTML
-OUTPUT_FILE = "dosare.csv"
+ARHIVA_FOLDER = "responses_arhiva"   # arhiva comprimată; pentru un id aflat și în INPUT_FOLDER, are prioritate
+OUTPUT_FILE = tabel.cale("dosare")   # dosare.parquet sau dosare.csv
 MAX_FILES = 43287
 PROGRESS_STEP = 2000
+WORKERS = os.cpu_count() or 1   # 1 = parsare serială, în procesul curent
+CHUNK = 250                     # id-uri per task trimis unui worker
+PARSER = "lxml"                 # "lxml" (rapid) sau "bs4" (parserul original)
+
+# Cache cu rândurile deja parsate, cheiat după hash-ul HTML-ului: la o
+# re-rulare se parsează doar dosarele noi sau re-descărcate (None = fără cache)
+CACHE_PARSARE = "cache_parsare.sqlite"
+# Crește la orice schimbare care modifică rândurile produse de parser,
+# ca să se invalideze tot cache-ul
+VERSIUNE_PARSER = 1
+
+COLOANE = [
+    "Dosar PMB", "Solicitant", "Notificare PMB", "Adresa contemporană", "Adresa istorică",
+    "Tip proprietate", "Soluție", "Istorie acte", "Mai multe adrese",
+]
 
 def clean_text(text):
     text = re.sub(r"\s+", " ", text).strip()
     return text if text else "NONE"
 
+def imparte_adresa(adresa_raw):
+    """Separă adresa contemporană, cea istorică și tipul proprietății."""
+    adresa_contemp, adresa_istoric, tip_proprietate = adresa_raw, "NONE", "NONE"
+
+    if "(Istoric:" in adresa_raw:
+        before, rest = adresa_raw.split("(Istoric:", 1)
+        if ")" in rest:
+            istorica, after = rest.split(")", 1)
+            adresa_contemp = clean_text(before + after)
+            adresa_istoric = clean_text(istorica)
+
+    tip_match = re.search(r"\(([^)]+)\)\s*$", adresa_contemp)
+    if tip_match:
+        tip_proprietate = tip_match.group(1)
+        adresa_contemp = re.sub(r"\(\s*" + re.escape(tip_proprietate) + r"\s*\)\s*$", "", adresa_contemp).strip()
+
+    return (adresa_contemp or "NONE", adresa_istoric, tip_proprietate)
+
+def randuri_dosar(dosar_id, solicitanti, notificare, adrese, solutie, istorie_acte):
+    return [
+        {
+            "Dosar PMB": dosar_id,
+            "Solicitant": "; ".join(solicitanti),
+            "Notificare PMB": notificare,
+            "Adresa contemporană": adresa_contemp,
+            "Adresa istorică": adresa_istoric,
+            "Tip proprietate": tip_proprietate,
+            "Soluție": solutie,
+            "Istorie acte": istorie_acte,
+            "Mai multe adrese": "DA" if len(adrese) > 1 else "NU"
+        }
+        for adresa_contemp, adresa_istoric, tip_proprietate in adrese
+    ]
+
 def parse_dosar(html_content):
     soup = BeautifulSoup(html_content, "html.parser")
 
@@ -81,23 +141,7 @@ def parse_dosar(html_content):
             ol = adr_block.find_next("ol")
             if ol:
                 for li in ol.find_all("li"):
-                    adresa_raw = clean_text(li.get_text())
-
-                    adresa_contemp, adresa_istoric, tip_proprietate = adresa_raw, "NONE", "NONE"
-
-                    if "(Istoric:" in adresa_raw:
-                        before, rest = adresa_raw.split("(Istoric:", 1)
-                        if ")" in rest:
-                            istorica, after = rest.split(")", 1)
-                            adresa_contemp = clean_text(before + after)
-                            adresa_istoric = clean_text(istorica)
-
-                    tip_match = re.search(r"\(([^)]+)\)\s*$", adresa_contemp)
-                    if tip_match:
-                        tip_proprietate = tip_match.group(1)
-                        adresa_contemp = re.sub(r"\(\s*" + re.escape(tip_proprietate) + r"\s*\)\s*$", "", adresa_contemp).strip()
-
-                    adrese.append((adresa_contemp or "NONE", adresa_istoric, tip_proprietate))
+                    adrese.append(imparte_adresa(clean_text(li.get_text())))
 
         if not adrese:
             adrese = [("NONE", "NONE", "NONE")]
@@ -119,40 +163,350 @@ def parse_dosar(html_content):
                     istorie_acte = "; ".join(acte)
 
         # === Compunem rânduri (una per adresă) ===
-        for adresa_contemp, adresa_istoric, tip_proprietate in adrese:
-            rows.append({
-                "Dosar PMB": dosar_id,
-                "Solicitant": "; ".join(solicitanti),
-                "Notificare PMB": notificare,
-                "Adresa contemporană": adresa_contemp,
-                "Adresa istorică": adresa_istoric,
-                "Tip proprietate": tip_proprietate,
-                "Soluție": solutie,
-                "Istorie acte": istorie_acte,
-                "Mai multe adrese": "DA" if len(adrese) > 1 else "NU"
-            })
+        rows.extend(randuri_dosar(dosar_id, solicitanti, notificare, adrese, solutie, istorie_acte))
+
+    return rows
+
+
+# === Parser rapid (lxml) ===
+# Aceleași câmpuri ca `parse_dosar`, dar cu selectori XPath compilați o singură
+# dată și fără parcurgerile find_next/find_parent ale BeautifulSoup. Semantica
+# bs4 e reprodusă explicit: get_text() ignoră <script>/<style>, iar
+# `find_next(..., string=...)` caută în ordinea documentului, începând cu
+# descendenții blocului, doar h5-uri cu un singur nod text.
+
+def _cu_clasa(tag, clasa):
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {clasa} ')]"
+
+X_TITLURI = etree.XPath("//" + _cu_clasa("h5", "card-title"))
+X_CARD_BODY = etree.XPath("ancestor::" + _cu_clasa("div", "card-body") + "[1]")
+X_COL = etree.XPath("ancestor::" + _cu_clasa("div", "col-sm-6") + "[1]")
+X_ROW = etree.XPath("ancestor::" + _cu_clasa("div", "row") + "[1]")
+X_COLOANE = etree.XPath(".//" + _cu_clasa("div", "col-sm-6"))
+X_BUTOANE = etree.XPath(".//" + _cu_clasa("span", "btn"))
+X_ISTORIE = etree.XPath("(.//ul[@role='list'])[1]")
+X_LI = etree.XPath(".//li")
+X_TEXT = etree.XPath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+_PARSER_BYTES = etree.HTMLParser(encoding="utf-8")
+_PARSER_STR = etree.HTMLParser()
+
+
+def _text(el):
+    return "".join(X_TEXT(el))
+
+def _text_strip(el):
+    return "".join(t.strip() for t in X_TEXT(el) if t.strip())
+
+def _string_bs4(el):
+    """Echivalentul `tag.string`: textul, doar dacă elementul are un singur copil."""
+    copii = (1 if el.text else 0) + sum(1 + (1 if c.tail else 0) for c in el)
+    if copii != 1:
+        return None
+    if el.text:
+        return el.text
+    copil = el[0]
+    if not isinstance(copil.tag, str):
+        return copil.text  # comentariu
+    return _string_bs4(copil)
+
+def _numar_data(el):
+    nr, data = "NONE", "NONE"
+    for span in X_BUTOANE(el):
+        txt = _text_strip(span)
+        if txt.startswith("Număr:"):
+            nr = txt.replace("Număr:", "").strip() or "NONE"
+        elif txt.startswith("Data:"):
+            data = txt.replace("Data:", "").strip() or "NONE"
+    return f"{nr} / {data}".strip(" /") or "NONE"
+
+
+class _Document:
+    """Arborele lxml plus pozițiile elementelor în ordinea documentului."""
+
+    def __init__(self, root):
+        self.pozitie = {}
+        self.h5 = []   # (poziție, element, string)
+        self.ol = []   # (poziție, element)
+        for k, el in enumerate(root.iter()):
+            self.pozitie[el] = k
+            if el.tag == "h5":
+                self.h5.append((k, el, _string_bs4(el)))
+            elif el.tag == "ol":
+                self.ol.append((k, el))
+        self.poz_h5 = [k for k, _, _ in self.h5]
+        self.poz_ol = [k for k, _ in self.ol]
+
+    def h5_urmator(self, el, continut):
+        for _, h5, string in self.h5[bisect_right(self.poz_h5, self.pozitie[el]):]:
+            if string and continut in string:
+                return h5
+        return None
+
+    def ol_urmator(self, el):
+        k = bisect_right(self.poz_ol, self.pozitie[el])
+        return self.ol[k][1] if k < len(self.ol) else None
+
+
+def parse_dosar_lxml(html_content):
+    """Ca `parse_dosar`; acceptă și bytes UTF-8, verificați fără decodare."""
+    if isinstance(html_content, bytes):
+        if b"Dosar anulat" in html_content:
+            return []
+        parser = _PARSER_BYTES
+    else:
+        if "Dosar anulat" in html_content:
+            return []
+        parser = _PARSER_STR
+    if not html_content.strip():
+        return []
+
+    root = etree.fromstring(html_content, parser)
+    if root is None:
+        return []
+    doc = _Document(root)
+    rows = []
+
+    for dosar_card in X_TITLURI(root):
+        if "Dosar PMB" not in _text(dosar_card):
+            continue
+
+        dosar_block = X_CARD_BODY(dosar_card)[0]
+
+        solicitanti, notificare, adrese, solutie, istorie_acte = [], "NONE", [], "NONE", "NONE"
+
+        # === Număr + Data dosar ===
+        dosar_id = _numar_data(dosar_block)
+
+        # === Notificare PMB ===
+        col = X_COL(dosar_block)
+        row = X_ROW(col[0]) if col else []
+        if row:
+            for sib in X_COLOANE(row[0]):
+                if sib is not col[0] and "Notificare" in _text(sib):
+                    notificare = _numar_data(sib)
+                    break
+
+        # === Solicitanti ===
+        h5 = doc.h5_urmator(dosar_block, "Solicitan")
+        ol = doc.ol_urmator(h5) if h5 is not None else None
+        if ol is not None:
+            solicitanti = [clean_text(_text(li)) for li in X_LI(ol)]
+        if not solicitanti:
+            solicitanti = ["NONE"]
+
+        # === Adrese ===
+        h5 = doc.h5_urmator(dosar_block, "Adrese")
+        ol = doc.ol_urmator(h5) if h5 is not None else None
+        if ol is not None:
+            adrese = [imparte_adresa(clean_text(_text(li))) for li in X_LI(ol)]
+        if not adrese:
+            adrese = [("NONE", "NONE", "NONE")]
+
+        # === Soluția + Istorie acte ===
+        h5 = doc.h5_urmator(dosar_block, "Soluția la dosar")
+        if h5 is not None:
+            parent = X_CARD_BODY(h5)[0]
+            solutie_parts = [clean_text(_text(sp)) for sp in X_BUTOANE(parent)]
+            if solutie_parts:
+                solutie = ", ".join(solutie_parts)
+            istorie_ul = X_ISTORIE(parent)
+            if istorie_ul:
+                acte = [clean_text(_text(li)) for li in X_LI(istorie_ul[0])]
+                if acte:
+                    istorie_acte = "; ".join(acte)
+
+        rows.extend(randuri_dosar(dosar_id, solicitanti, notificare, adrese, solutie, istorie_acte))
 
     return rows
 
 
-# === Procesare fișiere ===
-all_rows = []
-for i in range(1, MAX_FILES + 1):
-    file_path = os.path.join(INPUT_FOLDER, f"{i}.html")
-    if not os.path.exists(file_path):
-        continue
+def parseaza(html_content, parser=None, dosar=None, esecuri=None):
+    """Parsează cu PARSER; la orice eroare a parserului lxml revine la bs4.
+
+    Fiecare revenire se afișează cu id-ul `dosar` și, dacă e dată lista
+    `esecuri`, se adaugă în ea ca (dosar, eroare).
+    """
+    if (parser or PARSER) == "lxml":
+        try:
+            return parse_dosar_lxml(html_content)
+        except Exception as e:
+            eroare = f"{type(e).__name__}: {e}"
+            print(f"⚠️ Dosarul {dosar}: parserul lxml a eșuat ({eroare}), reiau cu bs4")
+            if esecuri is not None:
+                esecuri.append((dosar, eroare))
+    if isinstance(html_content, bytes):
+        html_content = html_content.decode("utf-8")
+    return parse_dosar(html_content)
+
+
+def ids_disponibile():
+    """Id-urile de parsat, crescător: arhiva ∪ fișierele `{id}.html` din folder.
+
+    Nu mai verifică existența fiecărui `{i}.html` până la MAX_FILES: arhiva
+    își știe id-urile din index, iar folderul e listat o singură dată. Un id
+    prezent în ambele se citește din arhivă (manual_captcha.py scrie acolo
+    re-descărcările).
+    """
+    global _arhiva
+    din_arhiva = set()
+    if os.path.isdir(ARHIVA_FOLDER):
+        # cititorul cu indexul proaspăt e folosit apoi de `citeste_html`
+        # (și moștenit de workerii creați prin fork)
+        _arhiva = CititorArhiva(ARHIVA_FOLDER)
+        din_arhiva = set(_arhiva.ids())
+    din_folder = set()
+    if os.path.isdir(INPUT_FOLDER):
+        din_folder = {
+            int(entry.name[:-5]) for entry in os.scandir(INPUT_FOLDER)
+            if entry.name.endswith(".html") and entry.name[:-5].isdigit()
+        }
+    if din_arhiva and din_folder:
+        print(f"⚠️ {len(din_folder - din_arhiva)} dosare doar în {INPUT_FOLDER}/ (citite de acolo), "
+              f"{len(din_folder & din_arhiva)} în ambele (citite din arhivă); "
+              f"`python arhiva.py {INPUT_FOLDER} {ARHIVA_FOLDER}` le mută în arhivă")
+    return sorted(i for i in din_arhiva | din_folder if i <= MAX_FILES)
+
+
+_arhiva = None
+
+def citeste_html(i):
+    """Conținutul brut (bytes): parserul lxml nu are nevoie de decodare."""
+    global _arhiva
+    if _arhiva is None and os.path.isdir(ARHIVA_FOLDER):
+        _arhiva = CititorArhiva(ARHIVA_FOLDER)  # unul per proces
+    if _arhiva is not None and i in _arhiva:
+        return _arhiva.citeste_bytes(i)
+    with open(os.path.join(INPUT_FOLDER, f"{i}.html"), "rb") as f:
+        return f.read()
+
+
+def parseaza_chunk(ids, cunoscute=None):
+    """Rulează în worker: întoarce (nr. fișiere, [(id, hash, rânduri)], [(id, eroare lxml)]).
+
+    `cunoscute` (id -> hash) sunt dosarele aflate deja în cache; dacă hash-ul
+    conținutului coincide, nu se mai parsează și rândurile vin ca None.
+    """
+    rezultate = []
+    esecuri = []
+    for i in ids:
+        raw = citeste_html(i)
+        if cunoscute is None:
+            rezultate.append((i, None, parseaza(raw, dosar=i, esecuri=esecuri)))
+            continue
+        h = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        if cunoscute.get(i) == h:
+            rezultate.append((i, h, None))
+        else:
+            rezultate.append((i, h, parseaza(raw, dosar=i, esecuri=esecuri)))
+    return len(ids), rezultate, esecuri
+
+
+def _combina_cu_cache(rezultat, cache, statistici=None):
+    n, rezultate, esecuri = rezultat
+    if statistici is not None:
+        statistici.setdefault("fallback_bs4", []).extend(esecuri)
+    if cache is None:
+        return n, [row for _, _, rows in rezultate for row in rows]
+
+    noi = [r for r in rezultate if r[2] is not None]
+    din_cache = cache.randuri(i for i, _, rows in rezultate if rows is None)
+    if noi:
+        cache.salveaza(noi)
+    rows = []
+    for i, _, parsate in rezultate:
+        rows.extend(din_cache[i] if parsate is None else parsate)
+    return n, rows
+
+
+def batch_uri(ids, workers=WORKERS, chunk=CHUNK, cache=None, statistici=None):
+    """Generează (nr. fișiere, rânduri) per chunk, în ordinea id-urilor.
+
+    Cu mai mulți workeri, cel mult 2 * workers chunk-uri sunt în lucru sau
+    așteaptă să fie scrise, deci memoria rămâne mărginită oricât de mare e
+    corpusul. Cu `cache`, dosarele nemodificate își iau rândurile din cache.
+    `statistici`, dacă e dat (dict), primește în "fallback_bs4" dosarele
+    (id, eroare) pe care lxml a eșuat și s-au parsat cu bs4.
+    """
+    valide = cache.hash_uri_valide() if cache is not None else None
+    chunks = [ids[k:k + chunk] for k in range(0, len(ids), chunk)]
+
+    def argumente(c):
+        if valide is None:
+            return (c,)
+        return (c, {i: valide[i] for i in c if i in valide})
+
+    if workers <= 1:
+        for c in chunks:
+            yield _combina_cu_cache(parseaza_chunk(*argumente(c)), cache, statistici)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_zbor = deque()
+        for c in chunks:
+            in_zbor.append(executor.submit(parseaza_chunk, *argumente(c)))
+            if len(in_zbor) >= 2 * workers:
+                yield _combina_cu_cache(in_zbor.popleft().result(), cache, statistici)
+        while in_zbor:
+            yield _combina_cu_cache(in_zbor.popleft().result(), cache, statistici)
+
+
+def scrie_csv(batches, output_file):
+    """Scrie rândurile pe măsură ce sosesc; întoarce (fișiere, rânduri)."""
+    fisiere, randuri = 0, 0
+    prag = PROGRESS_STEP
+    with open(output_file, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=COLOANE, lineterminator="\n")
+        writer.writeheader()
+        for n, rows in batches:
+            writer.writerows(rows)
+            fisiere += n
+            randuri += len(rows)
+            if fisiere >= prag:
+                print(f"✅ Procesate {fisiere} fișiere...")
+                prag += PROGRESS_STEP
+    return fisiere, randuri
+
+
+def scrie_parquet(batches, output_file):
+    """Ca `scrie_csv`, dar fiecare batch devine un row group Parquet."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(col, pa.string()) for col in COLOANE])
+    fisiere, randuri = 0, 0
+    prag = PROGRESS_STEP
+    with pq.ParquetWriter(output_file, schema) as writer:
+        for n, rows in batches:
+            if rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            fisiere += n
+            randuri += len(rows)
+            if fisiere >= prag:
+                print(f"✅ Procesate {fisiere} fișiere...")
+                prag += PROGRESS_STEP
+    return fisiere, randuri
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        html = f.read()
 
-    rows = parse_dosar(html)
-    all_rows.extend(rows)
+def main():
+    ids = ids_disponibile()
+    cache = CacheParsare(CACHE_PARSARE, VERSIUNE_PARSER) if CACHE_PARSARE else None
+    start = time.perf_counter()
+    scrie = scrie_parquet if OUTPUT_FILE.endswith(".parquet") else scrie_csv
+    statistici = {}
+    fisiere, randuri = scrie(batch_uri(ids, workers=WORKERS, cache=cache, statistici=statistici), OUTPUT_FILE)
+    durata = time.perf_counter() - start
 
-    if i % PROGRESS_STEP == 0:
-        print(f"✅ Procesate {i} fișiere...")
+    print(f"✅ Exportat {randuri} rânduri în {OUTPUT_FILE} "
+          f"({fisiere / durata:.0f} fișiere/s cu {WORKERS} workeri)")
+    esecuri = statistici.get("fallback_bs4", [])
+    if esecuri:
+        print(f"⚠️ {len(esecuri)} dosare parsate cu bs4 după eșecul lxml: "
+              f"{', '.join(str(i) for i, _ in esecuri[:20])}{' ...' if len(esecuri) > 20 else ''}")
+    if cache is not None:
+        print(f"📦 {cache.raport()}")
+        cache.close()
 
-# === Export CSV ===
-df = pd.DataFrame(all_rows)
-df.to_csv(OUTPUT_FILE, index=False, encoding="utf-8-sig")
 
-print(f"✅ Exportat {len(df)} rânduri în {OUTPUT_FILE}")
+if __name__ == "__main__":
+    main()
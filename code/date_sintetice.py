@@ -0,0 +1,221 @@
+import os
+import random
+
+# Date sintetice cu aceeași structură ca datele reale (paginile www3.pmb.ro,
+# coloanele tabelului, adresele), folosite de benchmark.py și de testele din tests/.
+
+NUME = ["POPESCU", "IONESCU", "GEORGESCU", "DUMITRESCU", "STAN", "MARIN", "CONSTANTIN", "RADU"]
+PRENUME = ["ION", "MARIA", "ELENA", "GHEORGHE", "VASILE", "ANA", "MIHAI", "IOANA"]
+STRAZI = ["Str. Mihai Eminescu", "Bd. Dacia", "Calea Victoriei", "Sos. Kiseleff", "Intr. Lupeni",
+          "Str. Popa Nan", "Al. Teiului", "Str. G-ral Berthelot", "B-dul Carol I", "Fund. Olari"]
+TIPURI = ["teren", "construcție", "teren și construcție", "apartament"]
+SOLUTII = ["Restituire în natură", "MRE", "Respins", "Revocare dispoziție", "Declinare competență DJCL",
+           "Propunere acordare MCP", "Compensare"]
+
+BOILERPLATE_HEAD = (
+    "<head><meta charset='utf-8'><title>Primăria Municipiului București - L10</title>"
+    + "".join(f"<link rel='stylesheet' href='/assets/css/style{k}.css'>" for k in range(6))
+    + "<style>" + "body{margin:0;padding:0}.card{border:1px solid #ddd}" * 40 + "</style>"
+    + "<script>" + "window.dataLayer=window.dataLayer||[];function gtag(){dataLayer.push(arguments)}" * 30
+    + "</script></head>"
+)
+BOILERPLATE_NAV = (
+    "<nav class='navbar navbar-expand-lg'><ul class='navbar-nav'>"
+    + "".join(f"<li class='nav-item'><a class='nav-link' href='/pagina/{k}'>Secțiunea {k}</a></li>" for k in range(60))
+    + "</ul></nav>"
+)
+BOILERPLATE_FOOTER = (
+    "<footer class='footer'>" + "<p>Primăria Municipiului București, Splaiul Independenței 291-293</p>" * 10
+    + "</footer><script src='/assets/js/jquery.min.js'></script><script>"
+    + "$(function(){$('[data-toggle=tooltip]').tooltip()});" * 50 + "</script>"
+)
+
+
+def _card(titlu, continut):
+    return (
+        "<div class='card mb-3'><div class='card-body'>"
+        f"<h5 class='card-title'>{titlu}</h5>{continut}</div></div>"
+    )
+
+
+def _adresa(rng):
+    adresa = f"{rng.choice(STRAZI)} nr. {rng.randint(1, 200)}, sector {rng.randint(1, 6)}"
+    if rng.random() < 0.3:
+        adresa += f" (Istoric: {rng.choice(STRAZI)} nr {rng.randint(1, 90)})"
+    if rng.random() < 0.8:
+        adresa += f" ({rng.choice(TIPURI)})"
+    return adresa
+
+
+def _act(rng):
+    an = rng.randint(2002, 2020)
+    return f"DPG: {rng.randint(100, 99999)}, Dată: {an}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def pagina_sintetica(i, seed=0):
+    """O pagină cu aceeași structură pe care o parcurge `parse_dosar`."""
+    rng = random.Random(seed * 1_000_003 + i)
+    if rng.random() < 0.03:
+        corp = "<div class='alert alert-warning'>Dosar anulat</div>"
+    else:
+        corp = ""
+        for _ in range(1 if rng.random() < 0.9 else 2):
+            dosar = (
+                "<div class='row'><div class='col-sm-6'>"
+                + _card("Dosar PMB",
+                        f"<span class='btn btn-light'>Număr: {i}</span>"
+                        f"<span class='btn btn-light'>Data: {rng.randint(2001, 2002)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}</span>")
+                + "</div><div class='col-sm-6'>"
+                + _card("Notificare PMB",
+                        f"<span class='btn btn-light'>Număr: {rng.randint(1, 30000)}</span>"
+                        f"<span class='btn btn-light'>Data: 2001-0{rng.randint(1, 9)}-2{rng.randint(0, 8)}</span>")
+                + "</div></div>"
+            )
+            solicitanti = "".join(
+                f"<li>{rng.choice(NUME)}   {rng.choice(PRENUME)}\n</li>" for _ in range(rng.randint(1, 4))
+            )
+            adrese = "".join(f"<li>{_adresa(rng)}</li>" for _ in range(rng.randint(1, 3)))
+            solutie = (
+                f"<span class='btn btn-info'>{_act(rng)}</span>"
+                f"<span class='btn btn-info'>{rng.choice(SOLUTII)}</span>"
+            )
+            if rng.random() < 0.7:
+                solutie += "<ul role='list'>" + "".join(
+                    f"<li>{_act(rng)}, {rng.choice(SOLUTII)}</li>" for _ in range(rng.randint(1, 4))
+                ) + "</ul>"
+            corp += (
+                dosar
+                + _card("Solicitanți", f"<ol>{solicitanti}</ol>")
+                + _card("Adrese", f"<ol>{adrese}</ol>")
+                + _card("Soluția la dosar", solutie)
+            )
+    return (
+        f"<!DOCTYPE html><html lang='ro'>{BOILERPLATE_HEAD}<body>{BOILERPLATE_NAV}"
+        f"<div class='container'><div class='content'>{corp}</div></div>{BOILERPLATE_FOOTER}</body></html>"
+    )
+
+
+def genereaza_corpus(folder, n, seed=0):
+    os.makedirs(folder, exist_ok=True)
+    for i in range(1, n + 1):
+        with open(os.path.join(folder, f"{i}.html"), "w", encoding="utf-8") as f:
+            f.write(pagina_sintetica(i, seed))
+
+
+# forme ale soluției din pagini, pe lângă SOLUTII: toate grupurile, precedența
+# ("Restituire ... respins"), cuvinte doar parțial potrivite ("mrex") și text liber
+FORME_SOLUTIE = SOLUTII + [
+    "restituire parțială", "MASURI REPARATORII", "se respinge", "RN", "resp.", "Anulare dispoziție",
+    "transmis ANRP", "Transmis AVAS", "declinat", "Restituire în natură, respins pentru rest", "mrex",
+    "Propunere MCP respinsă", "În analiză", "Dosar clasat", "  ", "",
+]
+
+
+def solutii_sintetice(n, seed=0, unice=False):
+    """Coloana "Soluție" (DPG, dată, soluție), cu ~2% lipsă; `unice` = fiecare soluție cu un sufix distinct."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    forme = np.array(FORME_SOLUTIE, dtype=object)[rng.integers(0, len(FORME_SOLUTIE), n)]
+    if unice:
+        forme = forme + np.char.mod(" %d", np.arange(n)).astype(object)
+    # prefixul "DPG: x, Dată: y" are puține valori distincte, ca la dispozițiile reale grupate pe ani
+    prefix = np.char.mod("DPG: %d, Dată: ", rng.integers(100, 2000, n)).astype(object)
+    ani = np.char.mod("%d-03-01", rng.integers(2002, 2021, n)).astype(object)
+    coloana = pd.Series(prefix + ani + ", " + forme, dtype=object)
+    coloana[rng.random(n) < 0.02] = None
+    return coloana
+
+
+def dosare_cu_acte(n_randuri, n_acte, seed=0):
+    """Tabel cu "Dosar PMB" / "Soluție" / "Istorie acte" + intrările indexului de PDF-uri care îl citează.
+
+    Ca în date.py, un dosar cu mai multe adrese are mai multe rânduri, cu
+    aceeași soluție și istorie. Unele acte sunt citate de mai multe dosare,
+    unele au două PDF-uri și unele intrări nu corespund niciunui rând.
+    Întoarce (df, intrari) cu intrari în forma DepozitPdf.intrari().
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    acte = [(str(rng.randint(100, 99999)), f"{rng.randint(2002, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            for _ in range(max(n_acte, 1))]
+    randuri, citate = [], []
+    dosar = 0
+    while len(randuri) < n_randuri:
+        dosar += 1
+        proprii = rng.sample(acte, rng.randint(1, 4))
+        citate.extend((str(dosar), dpg, data) for dpg, data in proprii)
+        solutie = f"DPG: {proprii[0][0]}, Dată: {proprii[0][1]}, {rng.choice(SOLUTII)}"
+        istorie = "; ".join(f"DPG {dpg}, Data: {data}" for dpg, data in proprii[1:] + proprii[:1])
+        for _ in range(min(rng.choice([1, 1, 1, 2, 3]), n_randuri - len(randuri))):
+            randuri.append({"Dosar PMB": f"{dosar} / 2001-02-14", "Soluție": solutie, "Istorie acte": istorie})
+    df = pd.DataFrame(randuri)
+    chei = sorted(set(rng.sample(citate, min(n_acte, len(citate)))))
+    intrari = []
+    for dosar, dpg, data in chei:
+        for h in range(2 if rng.random() < 0.05 else 1):
+            intrari.append((dosar, dpg, data, f"{rng.getrandbits(32):08x}", 1000, None))
+    # intrări fără rând în tabel (dosar necunoscut)
+    intrari += [(str(10**6 + k), dpg, data, f"{k:08x}", 1000, None) for k, (dpg, data) in enumerate(acte[:n_acte // 20])]
+    return df, intrari
+
+
+def _data_bruta(rng):
+    """O dată în una din cele patru forme citite de extractor; uneori imposibilă (30 februarie)."""
+    an, luna, zi = rng.randint(1995, 2020), rng.randint(1, 12), rng.randint(1, 28)
+    if rng.random() < 0.05:
+        luna, zi = 2, 30
+    return rng.choice([f"{an}-{luna:02d}-{zi:02d}", f"{zi:02d}/{luna:02d}/{an}",
+                       f"{an}/{luna:02d}/{zi:02d}", f"{zi:02d}-{luna:02d}-{an}"])
+
+
+def texte_acte(n_dosare, seed=0):
+    """Dosare cu Soluție / Istorie acte în formele întâlnite: date în patru forme, DPG fără dată, "NONE"."""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    randuri = []
+    for dosar in range(1, n_dosare + 1):
+        segmente = []
+        for _ in range(rng.randint(0, 5)):
+            dpg = rng.randint(100, 99999)
+            segmente.append(rng.choice([f"DPG {dpg}, Data: {_data_bruta(rng)}, {rng.choice(SOLUTII)}",
+                                        f"dpg:{dpg} din data {_data_bruta(rng)}",
+                                        f"DPG: {dpg}"]))
+        solutie = segmente[0] if segmente else rng.choice(["NONE", "", None])
+        istorie = "; ".join(segmente[1:]) or None
+        for _ in range(rng.choice([1, 1, 2])):
+            randuri.append({"Dosar PMB": f"{dosar} / 2001-02-14", "Soluție": solutie, "Istorie acte": istorie})
+    return pd.DataFrame(randuri)
+
+
+# Bucăți de adrese pentru testul diferențial al normalizării: abrevieri în
+# toate formele, lipite sau nu cu punctuație, plus cazurile speciale (FN,
+# parcelă, paranteze, sector, cuvinte eliminate)
+BUCATI_ADRESA = [
+    "S", "S.", "STR", "STR.", "STRADA", "Str.", "IN", "INTR", "INTR.", "INTRARE", "FUND", "FUNDATURA",
+    "FUNDA.", "B", "B-DUL", "B DUL", "BD", "BD.", "BUL", "BULEVARDUL", "CAL", "CAL.", "CALEA", "CALE",
+    "SOS", "SOS.", "SOSEAUA", "SOSEA", "AL", "AL.", "ALEEA", "ALE", "PREL", "PREL.", "PRELUNGIREA",
+    "COM", "COM.", "CO", "COMUNA", "CART", "CART.", "CARTIER", "CAR", "SAT", "SATUL", "PIA", "PIATA",
+    "DRUM", "DR", "DRUMUL", "ZONA", "ZON", "MOS", "MOSIA", "PARC", "PARCUL", "PARCELA", "PARCELA 12B",
+    "LOCALIT", "LOC", "G-RAL", "BIS", "SNIC", "NR", "nr.", "NUMARUL", "FN", "FN (7)", "(fost X)",
+    "sector", "SECTOR 3", "sector: 0", "BUCURESTI", "bucuresti", "ION", "MIHAI", "EMINESCU", "ȘTEFAN",
+    "Ă", "12", "7A", "3", "bl.", "A.", "M.", "Victoriei", "Popa", "NAN",
+]
+SEPARATORI = [" ", ".", ",", "-", "", ":", " ", " ", ", ", ". "]
+
+
+def adrese_sintetice(n, seed=0):
+    """Adrese ca în tabel (o parte) și combinații aleatoare de BUCATI_ADRESA (restul)."""
+    rng = random.Random(seed)
+    adrese = []
+    for _ in range(n):
+        if rng.random() < 0.3:
+            adresa = _adresa(rng)
+            adrese.append(adresa.upper() if rng.random() < 0.5 else adresa)
+        else:
+            adresa = "".join(rng.choice(BUCATI_ADRESA) + rng.choice(SEPARATORI) for _ in range(rng.randint(1, 8)))
+            adrese.append(adresa.lower() if rng.random() < 0.3 else adresa)
+    return adrese
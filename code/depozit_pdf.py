@@ -0,0 +1,181 @@
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+# Depozit de PDF-uri adresat după conținut: fiecare PDF e salvat o singură
+# dată, sub hash-ul lui (blobs/ab/abcdef….pdf), oricâte dosare l-ar cita.
+# Indexul (SQLite) leagă actele (DPG, dată) de blob-uri și dosarele de acte:
+#
+#   acte(dpg, data, hash, marime, url)   - un act poate avea mai multe PDF-uri
+#   dosare(dosar, dpg, data)             - many-to-many dosar <-> act
+#
+# `intrari()` întoarce join-ul (dosar, dpg, data, hash, marime, url).
+
+INDEX_FILE = "index.sqlite"
+MARIME_BUCATA = 64 * 1024
+
+
+class PdfIncomplet(IOError):
+    pass
+
+
+class DepozitPdf:
+    """Blob-uri + index; sigur de folosit din mai multe thread-uri."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(os.path.join(folder, "tmp"), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(folder, INDEX_FILE), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS acte (
+                dpg TEXT NOT NULL,
+                data TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                marime INTEGER NOT NULL,
+                url TEXT,
+                adaugat REAL,
+                PRIMARY KEY (dpg, data, hash)
+            )"""
+        )
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS dosare (
+                dosar TEXT NOT NULL,
+                dpg TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (dosar, dpg, data)
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_dosare_act ON dosare(dpg, data)")
+        self.conn.commit()
+
+    def cale(self, h):
+        return os.path.join(self.folder, "blobs", h[:2], f"{h}.pdf")
+
+    def scrie_flux(self, bucati, asteptat=None):
+        """Scrie un PDF din bucăți de octeți; întoarce (hash, mărime).
+
+        Conținutul merge într-un fișier temporar, hash-uit pe parcurs; dacă
+        `asteptat` (ex. Content-Length) nu coincide cu ce s-a primit, se
+        aruncă PdfIncomplet și nu rămâne nimic în depozit. Un blob deja
+        existent nu se rescrie.
+        """
+        sha = hashlib.sha256()
+        marime = 0
+        fd, tmp = tempfile.mkstemp(suffix=".part", dir=os.path.join(self.folder, "tmp"))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for bucata in bucati:
+                    f.write(bucata)
+                    sha.update(bucata)
+                    marime += len(bucata)
+            if asteptat is not None and int(asteptat) != marime:
+                raise PdfIncomplet(f"PDF incomplet: {marime} din {asteptat} octeți")
+            h = sha.hexdigest()
+            dest = self.cale(h)
+            if os.path.exists(dest):
+                os.remove(tmp)
+            else:
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                os.replace(tmp, dest)
+            return h, marime
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    def adauga_act(self, dpg, data, h, marime, url=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO acte (dpg, data, hash, marime, url, adaugat) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(dpg), data, h, marime, url, time.time()),
+            )
+            self.conn.commit()
+
+    def leaga(self, referinte):
+        """`referinte`: (dosar, dpg, data) – fiecare dosar care citează actul."""
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dosare (dosar, dpg, data) VALUES (?, ?, ?)",
+                ((str(dosar), str(dpg), data) for dosar, dpg, data in referinte),
+            )
+            self.conn.commit()
+
+    def are_act(self, dpg, data):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT 1 FROM acte WHERE dpg = ? AND data = ? LIMIT 1", (str(dpg), data)
+            ).fetchone() is not None
+
+    def intrari(self):
+        """(dosar, dpg, data, hash, marime, url) pentru fiecare dosar cu PDF-ul actului."""
+        with self.lock:
+            return self.conn.execute(
+                """SELECT d.dosar, d.dpg, d.data, a.hash, a.marime, a.url
+                   FROM dosare d JOIN acte a ON a.dpg = d.dpg AND a.data = d.data
+                   ORDER BY d.dosar, d.dpg, d.data, a.hash"""
+            ).fetchall()
+
+    def statistici(self):
+        with self.lock:
+            acte, blob_uri, octeti = self.conn.execute(
+                """SELECT COUNT(DISTINCT dpg || '/' || data), COUNT(DISTINCT hash),
+                          (SELECT SUM(marime) FROM (SELECT DISTINCT hash, marime FROM acte))
+                   FROM acte"""
+            ).fetchone()
+            (legaturi,) = self.conn.execute("SELECT COUNT(*) FROM dosare").fetchone()
+        return {"acte": acte, "blob_uri": blob_uri, "octeti": octeti or 0, "legaturi": legaturi}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def citeste_bucati(path, marime=MARIME_BUCATA):
+    with open(path, "rb") as f:
+        while True:
+            bucata = f.read(marime)
+            if not bucata:
+                break
+            yield bucata
+
+
+def importa_folder(folder_pdf, folder_depozit):
+    """Copiază în depozit PDF-urile vechi `{dosar}_{dpg}_{data}.pdf` din `folder_pdf`."""
+    nume_vechi = re.compile(r"^([^_]+)_(\d+)_(\d{4}-\d{2}-\d{2})\.pdf$")
+    n = 0
+    with DepozitPdf(folder_depozit) as depozit:
+        for fname in sorted(os.listdir(folder_pdf)):
+            m = nume_vechi.match(fname)
+            if not m:
+                continue
+            dosar, dpg, data = m.groups()
+            path = os.path.join(folder_pdf, fname)
+            h, marime = depozit.scrie_flux(citeste_bucati(path), os.path.getsize(path))
+            depozit.adauga_act(dpg, data, h, marime)
+            depozit.leaga([(dosar, dpg, data)])
+            n += 1
+    return n
+
+
+if __name__ == "__main__":
+    # python depozit_pdf.py pdfs pdfs_depozit
+    sursa = sys.argv[1] if len(sys.argv) > 1 else "pdfs"
+    destinatie = sys.argv[2] if len(sys.argv) > 2 else "pdfs_depozit"
+    n = importa_folder(sursa, destinatie)
+    with DepozitPdf(destinatie) as depozit:
+        s = depozit.statistici()
+    print(f"✅ Importate {n} PDF-uri din {sursa}: {s['blob_uri']} blob-uri unice, "
+          f"{s['octeti'] / 2**20:.1f} MB, {s['legaturi']} legături dosar-act")
@@ -0,0 +1,107 @@
+import sys
+
+from bs4 import BeautifulSoup
+
+from date import parse_dosar
+
+# Din pagina completă păstrăm doar subarborele care conține blocurile citite
+# de `parse_dosar`: cardurile "Dosar PMB" / "Notificare" (cu rândul lor),
+# "Solicitanți", "Adrese" cu listele lor și "Soluția la dosar". Navigația,
+# scripturile, stilurile și atributele irelevante dispar.
+
+TITLURI = ("Dosar PMB", "Notificare", "Solicitan", "Adrese", "Soluția la dosar")
+TAGURI_INUTILE = ["script", "style", "noscript", "svg", "img", "link", "meta", "iframe"]
+ATRIBUTE_PASTRATE = {"class", "role"}
+
+FRAGMENT_ANULAT = "<div>Dosar anulat</div>"
+
+
+def _stramosi(tag):
+    return [tag] + list(tag.parents)
+
+
+def _cel_mai_apropiat_stramos_comun(tags):
+    comun = None
+    for tag in tags:
+        lant = _stramosi(tag)
+        if comun is None:
+            comun = lant
+        else:
+            ids = {id(t) for t in lant}
+            comun = [t for t in comun if id(t) in ids]
+    return comun[0] if comun else None
+
+
+def _noduri_relevante(soup):
+    noduri = []
+    for h5 in soup.find_all("h5"):
+        text = h5.get_text()
+        if not any(t in text for t in TITLURI):
+            continue
+        noduri.append(h5)
+        if "Dosar PMB" in text:
+            # notificarea e căutată în rândul care conține coloana dosarului
+            col = h5.find_parent("div", class_="col-sm-6")
+            row = col.find_parent("div", class_="row") if col else None
+            if row:
+                noduri.append(row)
+        elif "Solicitan" in text or "Adrese" in text:
+            ol = h5.find_next("ol")
+            if ol:
+                noduri.append(ol)
+        elif "Soluția la dosar" in text:
+            card = h5.find_parent("div", class_="card-body")
+            if card:
+                noduri.append(card)
+    return noduri
+
+
+def extrage_fragment(html):
+    """HTML minimal din care `parse_dosar` obține aceleași rânduri."""
+    if "Dosar anulat" in html:
+        return FRAGMENT_ANULAT
+
+    soup = BeautifulSoup(html, "html.parser")
+    noduri = _noduri_relevante(soup)
+    if not noduri:
+        return ""
+    radacina = _cel_mai_apropiat_stramos_comun(noduri)
+
+    for tag in radacina.find_all(TAGURI_INUTILE):
+        tag.decompose()
+    for tag in [radacina] + radacina.find_all(True):
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k in ATRIBUTE_PASTRATE}
+    return str(radacina)
+
+
+def fragment_verificat(html):
+    """Întoarce (continut, e_fragment).
+
+    Dacă fragmentul nu reproduce exact rândurile paginii complete (structură
+    neprevăzută), se păstrează pagina completă.
+    """
+    fragment = extrage_fragment(html)
+    if parse_dosar(fragment) == parse_dosar(html):
+        return fragment, True
+    return html, False
+
+
+def converteste_arhiva(sursa, destinatie):
+    """Rescrie o arhivă de pagini complete ca arhivă de fragmente."""
+    from arhiva import CititorArhiva, ScriitorArhiva
+
+    complete = 0
+    with CititorArhiva(sursa) as cititor, ScriitorArhiva(destinatie) as scriitor:
+        for dosar_id, html in cititor.itereaza():
+            continut, ok = fragment_verificat(html)
+            if not ok:
+                complete += 1
+            scriitor.adauga(dosar_id, continut)
+    return len(cititor), complete
+
+
+if __name__ == "__main__":
+    # python fragment.py responses_arhiva responses_fragmente
+    sursa, destinatie = sys.argv[1], sys.argv[2]
+    total, complete = converteste_arhiva(sursa, destinatie)
+    print(f"✅ {total} pagini convertite ({complete} păstrate complete, fragmentul nu se potrivea)")
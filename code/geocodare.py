@@ -0,0 +1,320 @@
+import asyncio
+import hashlib
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache_geocodare import Locatie
+
+# Geocodare asincronă cu provideri interschimbabili. Fiecare provider are
+# limita lui: Nominatim public acceptă 1 cerere/s (o singură conexiune), o
+# instanță Nominatim proprie sau providerul fals (pentru teste offline de
+# debit) pot rula fără limită de rată, doar cu N cereri simultane.
+# Erorile trecătoare (rețea, timeout, 429, 5xx) se reîncearcă cu backoff
+# exponențial cu jitter, fără să blocheze celelalte cereri din lot.
+#
+#   geocoder = Geocoder.din_config("nominatim")
+#   loc = geocoder.geocodeaza("Strada Popa Nan 12 sector 2 bucuresti")
+#   normalizate, rezultate = asyncio.run(geocodeaza_lot(adrese, geocoder, normalize_address))
+#
+# O interogare e un text liber sau o adresă structurată (un obiect cu
+# .strada(), .sector și .localitate, ex. normalizare.AdresaStructurata),
+# trimisă ca street / city la Nominatim; cu sector cunoscut, ca text care
+# include sectorul (căutarea structurată nu are câmp pentru el).
+
+USER_AGENT = "geo_csv_script"
+TIMEOUT = 30
+REINCERCARI = 5
+BACKOFF_BAZA = 1.0  # secunde; a k-a reîncercare așteaptă aleator în [0, min(MAXIM, BAZA * 2^k)]
+BACKOFF_MAXIM = 60.0
+MARIME_COADA = 256  # adrese normalizate care așteaptă un worker
+TARA = "Romania"  # pentru interogările structurate
+PROVIDERI = {
+    "nominatim": dict(url="https://nominatim.openstreetmap.org", pe_secunda=1.0, simultane=1),
+    "local": dict(url="http://localhost:8080", pe_secunda=None, simultane=16),
+    "fals": dict(pe_secunda=None, simultane=64),
+}
+
+OK = "ok"
+NEGASIT = "negasit"
+EROARE = "eroare"
+RETEA = "retea"
+
+# Bucureștiul, pentru coordonatele providerului fals
+LAT_MIN, LAT_MAX = 44.34, 44.54
+LON_MIN, LON_MAX = 25.96, 26.23
+
+
+class EroareTrecatoare(Exception):
+    """Eșec care merită reîncercat; `asteapta` = Retry-After, dacă serverul l-a dat."""
+
+    def __init__(self, mesaj, asteapta=None):
+        super().__init__(mesaj)
+        self.asteapta = asteapta
+
+
+class EroareRetea(Exception):
+    """Reîncercările s-au epuizat pe erori trecătoare."""
+
+
+class GaleataJetoane:
+    """Token bucket: `pe_secunda` jetoane pe secundă, cel mult `capacitate` adunate.
+
+    Cererile își rezervă jetonul pe loc (soldul poate deveni negativ) și
+    așteaptă cât e nevoie, deci nu e nevoie de lock în asyncio și aceeași
+    găleată poate fi folosită din bucle de evenimente diferite.
+    `pe_secunda=None` înseamnă fără limită.
+    """
+
+    def __init__(self, pe_secunda=None, capacitate=1):
+        self.pe_secunda = pe_secunda
+        self.capacitate = capacitate
+        self.jetoane = capacitate
+        self.ultima = time.monotonic()
+
+    def rezerva(self):
+        """Ia un jeton și întoarce câte secunde trebuie așteptat până la el."""
+        if self.pe_secunda is None:
+            return 0.0
+        acum = time.monotonic()
+        self.jetoane = min(self.capacitate, self.jetoane + (acum - self.ultima) * self.pe_secunda)
+        self.ultima = acum
+        self.jetoane -= 1
+        return max(0.0, -self.jetoane / self.pe_secunda)
+
+    async def ia(self):
+        asteptare = self.rezerva()
+        if asteptare:
+            await asyncio.sleep(asteptare)
+
+
+def asteptare_backoff(incercare, baza=BACKOFF_BAZA, maxim=BACKOFF_MAXIM):
+    """Backoff exponențial cu jitter complet pentru a `incercare`-a reîncercare (de la 0)."""
+    return random.uniform(0, min(maxim, baza * 2 ** incercare))
+
+
+class ProviderNominatim:
+    """API-ul /search al Nominatim, public sau găzduit local (același protocol)."""
+
+    nume = "nominatim"
+
+    def __init__(self, url, user_agent=USER_AGENT, timeout=TIMEOUT, conexiuni=1):
+        self.url = url.rstrip("/") + "/search"
+        self.timeout = timeout
+        self.sesiune = requests.Session()
+        self.sesiune.headers["User-Agent"] = user_agent
+        adaptor = HTTPAdapter(pool_connections=conexiuni, pool_maxsize=conexiuni)
+        self.sesiune.mount("http://", adaptor)
+        self.sesiune.mount("https://", adaptor)
+
+    def _cere(self, interogare):
+        if isinstance(interogare, str):
+            parametri = {"q": interogare}
+        elif interogare.sector is not None:
+            # căutarea structurată nu are un câmp pentru sector: cu sector
+            # cunoscut, aceleași componente merg ca text, cu sectorul inclus
+            parametri = {"q": f"{interogare}, {TARA}"}
+        else:
+            parametri = {"street": interogare.strada(), "city": interogare.localitate, "country": TARA}
+        try:
+            resp = self.sesiune.get(
+                self.url, params={**parametri, "format": "jsonv2", "limit": 1}, timeout=self.timeout
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise EroareTrecatoare(f"{type(e).__name__}: {e}") from e
+        if resp.status_code == 429 or resp.status_code >= 500:
+            retry_after = resp.headers.get("Retry-After", "")
+            raise EroareTrecatoare(
+                f"HTTP {resp.status_code}", float(retry_after) if retry_after.isdigit() else None
+            )
+        resp.raise_for_status()
+        gasite = resp.json()
+        if not gasite:
+            return None
+        g = gasite[0]
+        return Locatie(float(g["lat"]), float(g["lon"]), g.get("display_name"))
+
+    async def interogheaza(self, interogare):
+        """Locatie sau None; aruncă EroareTrecatoare pentru ce merită reîncercat."""
+        return await asyncio.to_thread(self._cere, interogare)
+
+    def close(self):
+        self.sesiune.close()
+
+
+class ProviderFals:
+    """Provider local, fără rețea: coordonate deterministe din hash-ul interogării.
+
+    Simulează latența unui server (`latenta` secunde) și, opțional, erori
+    trecătoare și adrese negăsite, pentru teste de debit offline.
+    """
+
+    nume = "fals"
+
+    def __init__(self, latenta=0.05, rata_erori=0.0, rata_negasite=0.0, seed=0):
+        self.latenta = latenta
+        self.rata_erori = rata_erori
+        self.rata_negasite = rata_negasite
+        self.rng = random.Random(seed)
+        self.cereri = 0
+
+    async def interogheaza(self, interogare):
+        self.cereri += 1
+        await asyncio.sleep(self.latenta)
+        if self.rng.random() < self.rata_erori:
+            raise EroareTrecatoare("eroare simulată")
+        h = hashlib.sha256(str(interogare).encode("utf-8")).digest()
+        if h[0] / 256 < self.rata_negasite:
+            return None
+        lat = LAT_MIN + int.from_bytes(h[1:5], "big") / 2**32 * (LAT_MAX - LAT_MIN)
+        lon = LON_MIN + int.from_bytes(h[5:9], "big") / 2**32 * (LON_MAX - LON_MIN)
+        return Locatie(lat, lon, str(interogare))
+
+    def close(self):
+        pass
+
+
+class Geocoder:
+    """Un provider plus limitele lui: găleata de jetoane, cereri simultane, reîncercări."""
+
+    def __init__(self, provider, pe_secunda=None, simultane=1, reincercari=REINCERCARI,
+                 backoff_baza=BACKOFF_BAZA, backoff_maxim=BACKOFF_MAXIM):
+        self.provider = provider
+        self.nume = provider.nume
+        self.galeata = GaleataJetoane(pe_secunda)
+        self.simultane = simultane
+        self.reincercari = reincercari
+        self.backoff_baza = backoff_baza
+        self.backoff_maxim = backoff_maxim
+        self.contor = {"cereri": 0, "reincercari": 0}
+
+    @classmethod
+    def din_config(cls, nume, **suprascrieri):
+        """Geocoder pentru o intrare din PROVIDERI; `suprascrieri` schimbă url/limitele."""
+        config = {**PROVIDERI[nume], **suprascrieri}
+        pe_secunda = config.pop("pe_secunda")
+        simultane = config.pop("simultane")
+        reincercari = config.pop("reincercari", REINCERCARI)
+        if nume == "fals":
+            provider = ProviderFals(**config)
+        else:
+            provider = ProviderNominatim(config.pop("url"), conexiuni=simultane, **config)
+        return cls(provider, pe_secunda=pe_secunda, simultane=simultane, reincercari=reincercari)
+
+    async def cauta(self, interogare):
+        """Locatie sau None; după `reincercari` eșecuri trecătoare aruncă EroareRetea.
+
+        Alte excepții ale providerului trec mai departe.
+        """
+        for incercare in range(self.reincercari + 1):
+            await self.galeata.ia()
+            self.contor["cereri"] += 1
+            try:
+                return await self.provider.interogheaza(interogare)
+            except EroareTrecatoare as e:
+                if incercare == self.reincercari:
+                    raise EroareRetea(f"{interogare}: {e}") from e
+                asteptare = max(e.asteapta or 0.0,
+                                asteptare_backoff(incercare, self.backoff_baza, self.backoff_maxim))
+                self.contor["reincercari"] += 1
+                print(f"⚠️  {self.nume}: {e}, reîncerc în {asteptare:.1f}s "
+                      f"({incercare + 1}/{self.reincercari}) -> {interogare}")
+                await asyncio.sleep(asteptare)
+
+    def geocodeaza(self, interogare):
+        """Varianta sincronă a lui `cauta` (pentru modul rând cu rând)."""
+        return asyncio.run(self.cauta(interogare))
+
+    def close(self):
+        self.provider.close()
+
+
+def _fara_retea(interogari, local, cache):
+    """Primul rezultat obținut fără rețea, încercând interogările alternative în ordine.
+
+    Întoarce ((stare, rezultat), None) dacă s-a rezolvat din `local` / `cache`,
+    sau (None, k) dacă interogarea k trebuie cerută providerului.
+    """
+    for k, interogare in enumerate(interogari):
+        location = local(interogare) if local else None
+        if location is not None:
+            return (OK, location), None
+        gasit, location = cache.cauta(interogare) if cache else (False, None)
+        if not gasit:
+            return None, k
+        if location is not None:
+            return (OK, location), None
+    return (NEGASIT, None), None
+
+
+async def geocodeaza_lot(adrese, geocoder, normalizeaza=None, cache=None, local=None, progres=None,
+                         variante=None, marime_coada=MARIME_COADA):
+    """Geocodează o listă de adrese brute cu `geocoder.simultane` cereri în zbor.
+
+    Normalizarea adreselor următoare se face în timp ce cererile anterioare
+    așteaptă răspunsul: un producător normalizează și elimină duplicatele,
+    workerii consumă din coadă. Înainte de rețea se încearcă `local(adresa)`
+    (ex. nomenclatorul offline) și `cache` (CacheGeocodare), iar răspunsurile
+    providerului se salvează în cache.
+
+    `variante(normalizata)` dă interogările de încercat pe rând pentru o
+    adresă (ex. structurată, apoi text liber), până la prima găsită;
+    implicit doar adresa normalizată.
+
+    `progres(k, adresa, stare, rezultat)` e apelat după fiecare adresă cerută.
+    Întoarce (adresa brută -> normalizată, normalizată -> (stare, rezultat)),
+    cu stările din geocodeaza_adresa: ok / negasit / eroare / retea.
+    """
+    coada = asyncio.Queue(marime_coada)
+    normalizate = {}
+    rezultate = {}
+    cerute = [0]
+
+    async def producator():
+        vazute = set()
+        for k, adresa in enumerate(adrese):
+            n = normalizeaza(adresa) if normalizeaza else adresa
+            normalizate[adresa] = n
+            if n not in vazute:
+                vazute.add(n)
+                interogari = variante(n) if variante else (n,)
+                rezultat, j = _fara_retea(interogari, local, cache)
+                if rezultat is not None:
+                    rezultate[n] = rezultat
+                else:
+                    await coada.put((n, interogari, j))
+            if k % 64 == 63:
+                await asyncio.sleep(0)  # lasă workerii să preia răspunsurile sosite
+        for _ in range(geocoder.simultane):
+            await coada.put(None)
+
+    async def worker():
+        while (element := await coada.get()) is not None:
+            n, interogari, j = element
+            rezultat = None
+            while rezultat is None:
+                try:
+                    location = await geocoder.cauta(interogari[j])
+                except EroareRetea:
+                    rezultat = (RETEA, None)
+                    break
+                except Exception as e:
+                    rezultat = (EROARE, e)
+                    break
+                if cache:
+                    cache.salveaza(interogari[j], location, geocoder.nume)
+                if location:
+                    rezultat = (OK, location)
+                else:
+                    rezultat, urmatoarea = _fara_retea(interogari[j + 1:], local, cache)
+                    if rezultat is None:
+                        j += 1 + urmatoarea
+            rezultate[n] = rezultat
+            cerute[0] += 1
+            if progres:
+                progres(cerute[0], n, *rezultate[n])
+
+    await asyncio.gather(producator(), *(worker() for _ in range(geocoder.simultane)))
+    return normalizate, rezultate
@@ -0,0 +1,170 @@
+import hashlib
+import sys
+import unicodedata
+import zlib
+from collections import Counter, defaultdict
+
+import numpy as np
+
+# Grupare aproximativă a variantelor aceleiași adrese ("STR. X nr 5",
+# "Strada X 5 sector 2", "X nr.5 (bis)"), ca fiecare proprietate să fie
+# geocodată o singură dată și să aibă o cheie stabilă în hărți.
+#
+# Fără comparații O(n²): numele străzii devine o mulțime de trigrame de
+# caractere, rezumată prin MinHash; semnătura se taie în benzi (LSH), iar
+# doar adresele care au același număr și cad în aceeași găleată pe cel puțin
+# o bandă devin perechi candidate. O pereche se unește (union-find) doar
+# dacă trece verificarea exactă: același număr și localitate, similaritate
+# Jaccard a trigramelor >= PRAG_SIMILARITATE, iar tipul și sectorul sunt
+# compatibile cu ale întregului grup (o variantă fără sector nu poate lega
+# "X 5, sector 1" de "X 5, sector 3").
+# Reprezentantul unui grup e varianta cu cele mai multe rânduri.
+#
+#   python grupare_adrese.py [tabel]   -> statistici pe coloana 'Adresa contemporană'
+
+# ---------------- CONFIG ----------------
+PRAG_SIMILARITATE = 0.6
+PERMUTARI = 64
+BENZI = 16          # 16 benzi x 4 rânduri: perechile cu Jaccard ~0.5 ajung candidate cu prob. 0.5
+MARIME_GALEATA = 64  # peste atât, fiecare membru se compară doar cu primul (nu toți cu toți)
+MARIME_BLOC = 4_096  # adrese per bloc la calculul semnăturilor (limitează memoria)
+SEED = 20240601
+# ----------------------------------------
+
+_PRIM = (1 << 31) - 1
+
+
+def _pliaza(text):
+    text = unicodedata.normalize("NFKD", text.upper())
+    return " ".join("".join(c for c in text if not unicodedata.combining(c)).split())
+
+
+def trigrame(nume):
+    """Trigramele de caractere ale numelui pliat (majuscule, fără diacritice), cu margini."""
+    text = f" {_pliaza(nume)} "
+    return {text[k:k + 3] for k in range(len(text) - 2)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def semnaturi(multimi, permutari=PERMUTARI, seed=SEED):
+    """Matricea MinHash (len(multimi) x permutari) pentru mulțimi nevide de șiruri."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIM, size=(permutari, 1), dtype=np.int64)
+    b = rng.integers(0, _PRIM, size=(permutari, 1), dtype=np.int64)
+    rezultat = np.empty((len(multimi), permutari), dtype=np.int64)
+    for inceput in range(0, len(multimi), MARIME_BLOC):
+        bloc = multimi[inceput:inceput + MARIME_BLOC]
+        valori = np.fromiter((zlib.crc32(s.encode()) % _PRIM for m in bloc for s in m), dtype=np.int64)
+        pozitii = np.cumsum([0] + [len(m) for m in bloc[:-1]])
+        hashuri = (a * valori + b) % _PRIM  # permutari x total trigrame din bloc
+        rezultat[inceput:inceput + len(bloc)] = np.minimum.reduceat(hashuri, pozitii, axis=1).T
+    return rezultat
+
+
+class UniuneMultimi:
+    """Union-find; fiecare rădăcină ține și valorile cunoscute ale grupului (tip, sector)."""
+
+    def __init__(self, n, atribute):
+        self.parinte = list(range(n))
+        self.atribute = list(atribute)
+
+    def radacina(self, x):
+        while self.parinte[x] != x:
+            self.parinte[x] = self.parinte[self.parinte[x]]
+            x = self.parinte[x]
+        return x
+
+    def uneste(self, x, y):
+        """Unește grupurile dacă atributele lor nu se contrazic (None = necunoscut)."""
+        rx, ry = self.radacina(x), self.radacina(y)
+        if rx == ry:
+            return False
+        ax, ay = self.atribute[rx], self.atribute[ry]
+        if any(u is not None and v is not None and u != v for u, v in zip(ax, ay)):
+            return False
+        r = min(rx, ry)
+        self.parinte[max(rx, ry)] = r
+        self.atribute[r] = tuple(v if u is None else u for u, v in zip(ax, ay))
+        return True
+
+
+def grupeaza(adrese, ponderi=None, prag=PRAG_SIMILARITATE, benzi=BENZI, statistici=None):
+    """Pentru fiecare AdresaStructurata din `adrese` (distincte), indicele reprezentantului grupului.
+
+    `ponderi[k]` = câte rânduri are adresa k (reprezentantul e varianta cu
+    cele mai multe; la egalitate, prima). Adresele fără nume rămân singure.
+    `statistici`, dacă e dat (dict), primește numărul de perechi comparate.
+    """
+    n = len(adrese)
+    ponderi = ponderi if ponderi is not None else [1] * n
+    cu_nume = [k for k, a in enumerate(adrese) if a.nume]
+    multimi = [trigrame(adrese[k].nume) for k in cu_nume]
+    uniune = UniuneMultimi(n, ((a.tip, a.sector) for a in adrese))
+    comparate = set()
+    if cu_nume:
+        semn = semnaturi(multimi)
+        randuri = semn.shape[1] // benzi
+        for banda in range(benzi):
+            galeti = defaultdict(list)
+            felie = np.ascontiguousarray(semn[:, banda * randuri:(banda + 1) * randuri])
+            for j, k in enumerate(cu_nume):
+                # blocare pe număr + găleata LSH: "X 5" și "X 7" nu ajung niciodată candidate
+                galeti[(adrese[k].numar, adrese[k].parcela, felie[j].tobytes())].append(j)
+            for membri in galeti.values():
+                if len(membri) < 2:
+                    continue
+                perechi = ((membri[0], j) for j in membri[1:]) if len(membri) > MARIME_GALEATA else \
+                    ((membri[p], membri[q]) for p in range(len(membri)) for q in range(p + 1, len(membri)))
+                for p, q in perechi:
+                    x, y = cu_nume[p], cu_nume[q]
+                    if (x, y) in comparate or uniune.radacina(x) == uniune.radacina(y):
+                        continue
+                    comparate.add((x, y))
+                    if adrese[x].localitate == adrese[y].localitate and jaccard(multimi[p], multimi[q]) >= prag:
+                        uniune.uneste(x, y)
+    if statistici is not None:
+        statistici["comparate"] = len(comparate)
+
+    reprezentant = {}
+    for k in range(n):
+        r = uniune.radacina(k)
+        if r not in reprezentant or ponderi[k] > ponderi[reprezentant[r]]:
+            reprezentant[r] = k
+    return [reprezentant[uniune.radacina(k)] for k in range(n)]
+
+
+def _cheie_pliata(adresa):
+    return "|".join("" if v is None else _pliaza(str(v)) for v in adresa)
+
+
+def id_grup(membri):
+    """Cheie stabilă a grupului: hash scurt al celui mai mic membru (componente pliate).
+
+    Nu depinde de ordinea rândurilor și nici de câte rânduri are fiecare
+    variantă (spre deosebire de reprezentant); se schimbă doar dacă varianta
+    minimă intră sau iese din grup.
+    """
+    text = min(_cheie_pliata(a) for a in membri)
+    return hashlib.blake2b(text.encode(), digest_size=6).hexdigest()
+
+
+if __name__ == "__main__":
+    import tabel
+    from normalizare import parseaza_adresa
+
+    path = sys.argv[1] if len(sys.argv) > 1 else tabel.cale("dosare")
+    coloana = tabel.citeste(path, columns=["Adresa contemporană"])["Adresa contemporană"].dropna().str.strip()
+    ponderi = Counter(parseaza_adresa(a) for a in coloana if a)
+    distincte = list(ponderi)
+    statistici = {}
+    reprezentanti = grupeaza(distincte, [ponderi[a] for a in distincte], statistici=statistici)
+    grupuri = Counter(reprezentanti)
+    print(f"🧩 {sum(ponderi.values())} rânduri, {len(distincte)} adrese distincte -> {len(grupuri)} grupuri "
+          f"({statistici['comparate']} perechi comparate în loc de {len(distincte) * (len(distincte) - 1) // 2})")
+    for r, marime in grupuri.most_common(10):
+        if marime > 1:
+            variante = [str(distincte[k]) for k, x in enumerate(reprezentanti) if x == r][:4]
+            print(f"  {marime} variante -> {distincte[r]}: {variante}")
@@ -0,0 +1,148 @@
+import sqlite3
+import sys
+import threading
+import time
+
+# Jurnal structurat de evenimente pentru crawlere și descărcătoare, în locul
+# fișierelor text (erori.txt, procesate.txt, negasite2.txt) scrise și
+# deschise la fiecare eveniment. Evenimentele se țin în memorie și se scriu
+# în SQLite în loturi (la MARIME_LOT evenimente sau la INTERVAL_FLUSH
+# secunde), deci un eveniment nu mai costă un open/write/close.
+#
+# Câmpuri: ts, etapa, cheie (id-ul elementului în etapă), dosar, dpg,
+# rezultat, latenta (secunde), clasa_eroare, mesaj.
+
+JURNAL_DB = "evenimente.sqlite"
+MARIME_LOT = 200
+INTERVAL_FLUSH = 5.0
+
+OK = "ok"
+FAILED = "failed"
+COLOANE = ("ts", "etapa", "cheie", "dosar", "dpg", "rezultat", "latenta", "clasa_eroare", "mesaj")
+
+
+class JurnalEvenimente:
+    """Sink de evenimente bufferizat; sigur de folosit din mai multe thread-uri."""
+
+    def __init__(self, path=JURNAL_DB, marime_lot=MARIME_LOT, interval_flush=INTERVAL_FLUSH):
+        self.marime_lot = marime_lot
+        self.interval_flush = interval_flush
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.ultimul_flush = time.monotonic()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS evenimente (
+                ts REAL NOT NULL,
+                etapa TEXT NOT NULL,
+                cheie TEXT,
+                dosar TEXT,
+                dpg TEXT,
+                rezultat TEXT NOT NULL,
+                latenta REAL,
+                clasa_eroare TEXT,
+                mesaj TEXT
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_evenimente_etapa ON evenimente(etapa, cheie)")
+        self.conn.commit()
+
+    def scrie(self, etapa, rezultat, cheie=None, dosar=None, dpg=None, latenta=None, eroare=None, mesaj=None):
+        """Adaugă un eveniment; `eroare` poate fi o excepție (clasa ei devine clasa_eroare)."""
+        if isinstance(eroare, BaseException):
+            clasa = type(eroare).__name__
+            mesaj = mesaj or str(eroare)
+        else:
+            clasa = eroare
+        rand = (
+            time.time(), etapa,
+            None if cheie is None else str(cheie),
+            None if dosar is None else str(dosar),
+            None if dpg is None else str(dpg),
+            rezultat, latenta, clasa, mesaj,
+        )
+        with self.lock:
+            self.buffer.append(rand)
+            if (len(self.buffer) >= self.marime_lot
+                    or time.monotonic() - self.ultimul_flush >= self.interval_flush):
+                self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            self.conn.executemany(
+                f"INSERT INTO evenimente ({', '.join(COLOANE)}) VALUES ({', '.join('?' * len(COLOANE))})",
+                self.buffer,
+            )
+            self.conn.commit()
+            self.buffer = []
+        self.ultimul_flush = time.monotonic()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def esuate(self, etapa, rezultate=(FAILED,)):
+        """Elementele (cheie) al căror ultim eveniment din `etapa` e un eșec, pentru reluare.
+
+        Întoarce dicționare cu toate câmpurile ultimului eveniment.
+        """
+        self.flush()
+        marcaje = ", ".join("?" * len(rezultate))
+        with self.lock:
+            cur = self.conn.execute(
+                f"""SELECT {', '.join(COLOANE)} FROM evenimente e
+                    WHERE etapa = ? AND rowid = (
+                        SELECT MAX(rowid) FROM evenimente WHERE etapa = e.etapa AND cheie IS e.cheie
+                    ) AND rezultat IN ({marcaje})
+                    ORDER BY ts""",
+                (etapa, *rezultate),
+            )
+            return [dict(zip(COLOANE, r)) for r in cur]
+
+    def chei(self, etapa, rezultate=None):
+        """Cheile cu cel puțin un eveniment în `etapa` (opțional: doar cu aceste rezultate)."""
+        self.flush()
+        sql = "SELECT DISTINCT cheie FROM evenimente WHERE etapa = ? AND cheie IS NOT NULL"
+        parametri = [etapa]
+        if rezultate:
+            sql += f" AND rezultat IN ({', '.join('?' * len(rezultate))})"
+            parametri += list(rezultate)
+        with self.lock:
+            return {r[0] for r in self.conn.execute(sql, parametri)}
+
+    def statistici(self, etapa=None):
+        """rezultat -> număr de evenimente (pentru o etapă sau toate)."""
+        self.flush()
+        sql = "SELECT rezultat, COUNT(*) FROM evenimente"
+        parametri = ()
+        if etapa is not None:
+            sql += " WHERE etapa = ?"
+            parametri = (etapa,)
+        with self.lock:
+            return dict(self.conn.execute(sql + " GROUP BY rezultat", parametri).fetchall())
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    # python jurnal.py esuate acte   |   python jurnal.py statistici [etapa]
+    # etapele scrise de acte_interne.py: acte (jobul), acte.pdf, acte.cautare, acte.http
+    comanda = sys.argv[1] if len(sys.argv) > 1 else "statistici"
+    etapa = sys.argv[2] if len(sys.argv) > 2 else None
+    with JurnalEvenimente(JURNAL_DB) as jurnal:
+        if comanda == "esuate" and etapa:
+            for ev in jurnal.esuate(etapa):
+                print(f"{ev['cheie']}\tdosar={ev['dosar']}\tdpg={ev['dpg']}\t"
+                      f"{ev['clasa_eroare'] or ''}\t{ev['mesaj'] or ''}")
+        else:
+            print(jurnal.statistici(etapa))
@@ -0,0 +1,155 @@
+import sqlite3
+import sys
+import threading
+import time
+
+import tabel
+
+# Jurnal append-only de corecții de coordonate pentru adaugare_coordonate.py.
+# Fiecare adresă procesată adaugă un rând (rand, stare, lat, lon) cu commit
+# imediat, în loc să rescrie tot tabelul la fiecare coordonată găsită (O(N)
+# pe hit, O(N²) pe toată rularea). Corecțiile se aplică pe tabel într-un
+# singur pas de compactare: la finalul rulării sau la cerere
+# (`python jurnal_coordonate.py compacteaza`). Reluarea după crash citește
+# rândurile deja procesate direct din jurnal; o compactare întreruptă se
+# poate relua, fiindcă aplicarea corecțiilor e idempotentă.
+
+JURNAL_COORDONATE = "coordonate.sqlite"
+
+OK = "ok"
+NEGASIT = "negasit"
+FAILED = "failed"
+
+
+class JurnalCoordonate:
+    """Corecții (rând -> lat, lon) cu starea fiecărei geocodări; ultima intrare a unui rând câștigă."""
+
+    def __init__(self, path=JURNAL_COORDONATE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS corectii (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                rand INTEGER NOT NULL,
+                stare TEXT NOT NULL,
+                lat REAL,
+                lon REAL,
+                adresa TEXT,
+                eroare TEXT,
+                ts REAL NOT NULL,
+                aplicat INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_corectii_rand ON corectii(rand, id)")
+        self.conn.commit()
+
+    def adauga(self, rand, stare, lat=None, lon=None, adresa=None, eroare=None):
+        """Adaugă o intrare; e pe disc când metoda se întoarce."""
+        if isinstance(eroare, BaseException):
+            eroare = f"{type(eroare).__name__}: {eroare}"
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO corectii (rand, stare, lat, lon, adresa, eroare, ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (int(rand), stare, lat, lon, adresa, eroare, time.time()),
+            )
+            self.conn.commit()
+
+    def _ultimele(self, conditie="", parametri=()):
+        with self.lock:
+            return self.conn.execute(
+                f"""SELECT rand, stare, lat, lon, adresa, eroare FROM corectii
+                    WHERE id IN (SELECT MAX(id) FROM corectii GROUP BY rand) {conditie}
+                    ORDER BY rand""",
+                parametri,
+            ).fetchall()
+
+    def procesate(self, fara_stari=()):
+        """Rândurile cu cel puțin o intrare (opțional: fără cele a căror ultimă stare e în `fara_stari`)."""
+        return {r[0] for r in self._ultimele() if r[1] not in fara_stari}
+
+    def esuate(self):
+        """(rand, stare, adresa, eroare) pentru rândurile a căror ultimă stare nu e OK."""
+        return [(r[0], r[1], r[4], r[5]) for r in self._ultimele("AND stare != ?", (OK,))]
+
+    def neaplicate(self, pana_la=None):
+        """rand -> (lat, lon) pentru rândurile a căror ultimă intrare e OK și încă nescrisă în tabel.
+
+        Un rând a cărui ultimă intrare e negăsit / eroare se sare, chiar dacă
+        are o coordonată găsită mai veche. `pana_la` = doar intrările cu
+        id <= pana_la (cele văzute la începutul compactării).
+        """
+        with self.lock:
+            return {
+                rand: (lat, lon)
+                for rand, lat, lon in self.conn.execute(
+                    """SELECT rand, lat, lon FROM corectii
+                       WHERE id IN (SELECT MAX(id) FROM corectii WHERE id <= ? GROUP BY rand)
+                       AND stare = ? AND aplicat = 0""",
+                    (pana_la if pana_la is not None else sys.maxsize, OK),
+                )
+            }
+
+    def aplica(self, df, corectii):
+        """Scrie corecțiile pe `df` (index = rand - 1, ca liniile din negasite.txt). Întoarce câte au intrat."""
+        n = 0
+        for rand, (lat, lon) in corectii.items():
+            row_idx = rand - 1  # scădem 1 pentru a compensa headerul
+            if 0 <= row_idx < len(df):
+                df.at[row_idx, "latitude"] = lat
+                df.at[row_idx, "longitude"] = lon
+                n += 1
+        return n
+
+    def compacteaza(self, tabel_path, df=None):
+        """Aplică toate corecțiile neaplicate pe tabel, într-o singură scriere.
+
+        Intrările se marchează aplicate doar după ce tabelul e scris, iar
+        intrările înlocuite de una mai nouă pentru același rând se șterg.
+        Fără `df`, tabelul se recitește de pe disc (un `df` încărcat înaintea
+        unei compactări la cerere nu are corecțiile aplicate între timp).
+        Întoarce numărul de rânduri actualizate.
+        """
+        with self.lock:
+            (ultimul,) = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM corectii").fetchone()
+        corectii = self.neaplicate(ultimul)
+        if corectii:
+            if df is None:
+                df = tabel.citeste(tabel_path)
+            n = self.aplica(df, corectii)
+            tabel.scrie(df, tabel_path)
+        else:
+            n = 0
+        with self.lock:
+            self.conn.execute("UPDATE corectii SET aplicat = 1 WHERE stare = ? AND aplicat = 0 AND id <= ?",
+                              (OK, ultimul))
+            self.conn.execute(
+                "DELETE FROM corectii WHERE id <= ? AND id NOT IN (SELECT MAX(id) FROM corectii GROUP BY rand)",
+                (ultimul,),
+            )
+            self.conn.commit()
+        return n
+
+    def statistici(self):
+        """stare -> rânduri (după ultima intrare) și câte corecții așteaptă compactarea."""
+        stari = {}
+        for r in self._ultimele():
+            stari[r[1]] = stari.get(r[1], 0) + 1
+        stari["neaplicate"] = len(self.neaplicate())
+        return stari
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+if __name__ == "__main__":
+    # python jurnal_coordonate.py compacteaza [tabel]   |   python jurnal_coordonate.py statistici
+    comanda = sys.argv[1] if len(sys.argv) > 1 else "statistici"
+    jurnal = JurnalCoordonate(JURNAL_COORDONATE)
+    if comanda == "compacteaza":
+        path = sys.argv[2] if len(sys.argv) > 2 else tabel.cale("dosare_geocode_cu_pdfuri")
+        print(f"🗜️  {jurnal.compacteaza(path)} rânduri actualizate în {path}")
+    else:
+        print(jurnal.statistici())
+    jurnal.close()
@@ -4,18 +4,66 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import os, time
+from selenium.common.exceptions import TimeoutException
+import os, time, threading
 
-# Folder pentru salvare HTML
+from coada import CoadaDosare, OK, CANCELLED, FAILED
+from sesiune import SesiuneCaptcha
+from arhiva import ScriitorArhiva
+from fragment import fragment_verificat
+
+# Arhiva comprimată în care se adaugă paginile (citită de date.py)
+ARHIVA_DIR = 'responses_arhiva/'
+
+# Salvează doar fragmentul cu datele dosarului în loc de tot page_source;
+# dacă fragmentul nu dă exact aceleași rânduri, se salvează pagina completă
+SALVEAZA_FRAGMENT = True
+# Păstrează și pagina completă, separat, pentru depanare
+PASTREAZA_RAW = False
+ARHIVA_RAW_DIR = 'responses_raw_arhiva/'
+
+# Folder pentru salvare HTML ca fișiere separate (opțional, vechiul format)
+SALVEAZA_HTML_SEPARAT = False
 OUT_DIR = 'responses/'
-os.makedirs(OUT_DIR, exist_ok=True)
+if SALVEAZA_HTML_SEPARAT:
+    os.makedirs(OUT_DIR, exist_ok=True)
+
+# Coada persistentă cu starea fiecărui dosar (pending / ok / cancelled / failed)
+COADA_DB = "coada_dosare.sqlite"
 
-# Fișier pentru dosarele sărite
-SKIPPED_FILE = "skipped.txt"
+# Intervalul de id-uri pus în coadă (cele deja procesate nu se refac)
+ID_START = 1
+ID_STOP = 43287
 
+# Dosare de descărcat din nou, indiferent de starea din coadă
 TO_REDOWNLOAD = [
     234
 ]
+# Repune în coadă, la pornire, dosarele eșuate la rulările anterioare
+REIA_ESUATE = True
+
+# Număr de browsere care lucrează în paralel
+WORKERS = 3
+
+# Cât așteptăm rezolvarea CAPTCHA-ului, respectiv apariția rezultatului
+TIMEOUT_CAPTCHA = 200
+TIMEOUT_REZULTAT = 30
+
+# Un singur CAPTCHA rezolvat servește toate căutările, cât timp sesiunea
+# rămâne validă (False = CAPTCHA pentru fiecare dosar, ca înainte)
+REFOLOSESTE_SESIUNE = True
+# Cât așteptăm formularul înainte să considerăm sesiunea invalidată
+TIMEOUT_SESIUNE = 10
+
+# La câte secunde afișăm viteza (dosare/min)
+RAPORT_SECUNDE = 60
+
+URL = "https://www3.pmb.ro/l10"
+SUBMIT_XPATH = "/html/body/div[1]/div/div/div/div[2]/div[2]/div[2]/div/div/div[1]/div/div/div[1]/div[1]/form/div/button"
+
+# Rezultatul e gata când apare cardul "Dosar PMB" sau mesajul de dosar anulat
+REZULTAT_DOSAR = (By.XPATH, "//h5[contains(@class, 'card-title') and contains(., 'Dosar PMB')]")
+REZULTAT_ANULAT = (By.XPATH, "//*[contains(text(), 'Dosar anulat')]")
 
 # Setări Chrome
 chrome_options = Options()
@@ -24,45 +72,140 @@ chrome_options.add_argument("--disable-gpu")
 # Calea către ChromeDriver
 driver_path = "/usr/local/bin/chromedriver"
 
-driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
-driver.set_page_load_timeout(200)  # maxim 40 secunde pentru încărcarea paginii
 
-for i in TO_REDOWNLOAD:  # RANGE modificabil
-    try:
-        driver.get("https://www3.pmb.ro/l10")
+def porneste_driver():
+    driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    driver.set_page_load_timeout(200)
+    return driver
 
-        print(f"\n👉 Deschide CAPTCHA și rezolvă-l pentru dosarul {i}.")
 
-        # Așteaptă input-ul maxim 20 secunde
-        inp = WebDriverWait(driver, 200).until(
-            EC.visibility_of_element_located((By.ID, "numar_dosar"))
-        )
+def descarca_dosar(driver, i):
+    """Caută dosarul `i` în formularul deja afișat și întoarce (stare, html).
+
+    În loc de un `time.sleep` fix, așteaptă explicit ca pagina de rezultat să
+    conțină cardul dosarului sau mesajul "Dosar anulat". Dacă pe pagină e încă
+    rezultatul căutării anterioare, așteaptă întâi să fie înlocuit.
+    """
+    vechi = driver.find_elements(*REZULTAT_DOSAR) + driver.find_elements(*REZULTAT_ANULAT)
+
+    # Completează inputul
+    inp = driver.find_element(By.ID, "numar_dosar")
+    inp.clear()
+    inp.send_keys(str(i))
 
-        # Completează inputul
-        inp.clear()
-        inp.send_keys(str(i))
+    # Apasă butonul
+    driver.find_element(By.XPATH, SUBMIT_XPATH).click()
 
-        # Apasă butonul
-        submit = driver.find_element(
-            By.XPATH,
-            "/html/body/div[1]/div/div/div/div[2]/div[2]/div[2]/div/div/div[1]/div/div/div[1]/div[1]/form/div/button"
+    if vechi:
+        WebDriverWait(driver, TIMEOUT_REZULTAT).until(EC.staleness_of(vechi[0]))
+    WebDriverWait(driver, TIMEOUT_REZULTAT).until(
+        EC.any_of(
+            EC.presence_of_element_located(REZULTAT_DOSAR),
+            EC.presence_of_element_located(REZULTAT_ANULAT),
         )
-        submit.click()
-        time.sleep(2)
+    )
+
+    html = driver.page_source
+    stare = CANCELLED if "Dosar anulat" in html else OK
+    return stare, html
+
+
+def worker(nume, coada, sesiune, arhiva, arhiva_raw, contor):
+    driver = porneste_driver()
+    versiune = 0
+    try:
+        while True:
+            i = coada.ia_urmatorul()
+            if i is None:
+                break
+            try:
+                versiune = sesiune.asigura_formular(driver, versiune)
+                stare, html = descarca_dosar(driver, i)
+                sesiune.inregistreaza_cautare()
+
+                # Salvează HTML-ul
+                if arhiva_raw is not None:
+                    arhiva_raw.adauga(i, html)
+                if SALVEAZA_FRAGMENT:
+                    html, e_fragment = fragment_verificat(html)
+                    if not e_fragment:
+                        print(f"[{nume}] ⚠️  Dosar {i}: fragmentul diferă, salvez pagina completă.")
+                arhiva.adauga(i, html)
+                if SALVEAZA_HTML_SEPARAT:
+                    with open(os.path.join(OUT_DIR, f"{i}.html"), "w", encoding="utf-8") as f:
+                        f.write(html)
+
+                coada.marcheaza(i, stare)
+                print(f"[{nume}] HTML dosar {i} salvat ({stare}).")
+
+            except TimeoutException:
+                coada.marcheaza(i, FAILED, "timeout: captcha sau rezultat neapărut")
+                print(f"[{nume}] Dosar {i} sărit: timeout.")
+                # la următorul dosar verificăm din nou sesiunea de la zero
+                sesiune.invalideaza(versiune)
+                versiune = 0
+            except Exception as e:
+                coada.marcheaza(i, FAILED, f"{type(e).__name__}: {e}")
+                print(f"[{nume}] Dosar {i} sărit din cauza erorii: {e}")
+                sesiune.invalideaza(versiune)
+                versiune = 0
+
+            with contor["lock"]:
+                contor["procesate"] += 1
+    finally:
+        driver.quit()
+
+
+def raporteaza(coada, sesiune, contor, start, stop_event):
+    while not stop_event.wait(RAPORT_SECUNDE):
+        minute = (time.time() - start) / 60
+        with contor["lock"]:
+            procesate = contor["procesate"]
+        print(f"📈 {procesate / minute:.1f} dosare/min — "
+              f"{sesiune.cautari_per_captcha():.1f} căutări/CAPTCHA — stare coadă: {coada.statistici()}")
+
+
+def main():
+    coada = CoadaDosare(COADA_DB)
+    coada.adauga(range(ID_START, ID_STOP + 1))
+    if TO_REDOWNLOAD:
+        coada.readauga(TO_REDOWNLOAD)
+    if REIA_ESUATE:
+        print(f"🔁 {coada.reia_esuate()} dosare eșuate repuse în coadă")
+
+    print(f"Coadă: {coada.statistici()}")
+
+    sesiune = SesiuneCaptcha(URL, TIMEOUT_CAPTCHA, TIMEOUT_SESIUNE, reutilizare=REFOLOSESTE_SESIUNE)
+    arhiva = ScriitorArhiva(ARHIVA_DIR)
+    arhiva_raw = ScriitorArhiva(ARHIVA_RAW_DIR) if PASTREAZA_RAW else None
+    contor = {"procesate": 0, "lock": threading.Lock()}
+    start = time.time()
+    stop_event = threading.Event()
+    reporter = threading.Thread(target=raporteaza, args=(coada, sesiune, contor, start, stop_event), daemon=True)
+    reporter.start()
 
-        # Salvează HTML-ul
-        html = driver.page_source
-        with open(os.path.join(OUT_DIR, f"{i}.html"), "w", encoding="utf-8") as f:
-            f.write(html)
+    threads = [
+        threading.Thread(target=worker, args=(f"W{k}", coada, sesiune, arhiva, arhiva_raw, contor))
+        for k in range(WORKERS)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stop_event.set()
+    arhiva.close()
+    if arhiva_raw is not None:
+        arhiva_raw.close()
 
-        print(f"HTML dosar {i} salvat.")
+    minute = (time.time() - start) / 60
+    print(f"\nToate dosarele au fost procesate: {contor['procesate']} în {minute:.1f} min "
+          f"({contor['procesate'] / max(minute, 1e-9):.1f} dosare/min).")
+    print(f"CAPTCHA rezolvate: {len(sesiune.cautari)}, căutări per CAPTCHA: {sesiune.cautari_per_captcha():.1f}")
+    print(f"Stare finală: {coada.statistici()}")
+    for i, motiv in coada.esuate():
+        print(f"  eșuat {i}: {motiv}")
+    coada.close()
 
-    except Exception as e:
-        print(f"Dosar {i} sărit din cauza erorii: {e}")
-        with open(SKIPPED_FILE, "a") as f:
-            f.write(str(i) + "\n")
-        continue
 
-print("\nToate dosarele au fost procesate.")
-input("Apasă Enter ca să închizi Chrome...")
-driver.quit()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,461 @@
+import bz2
+import gzip
+import math
+import pickle
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict, namedtuple
+from functools import lru_cache
+
+import numpy as np
+from lxml import etree
+
+from normalizare import LUNI, RE_AN
+
+# Geocoder offline pentru București, construit dintr-un extras OSM local
+# (.osm / .osm.bz2 / .osm.gz, ex. de pe download.geofabrik.de sau un export
+# overpass pe bounding box-ul orașului):
+#   - străzile (way-uri cu `highway` și `name`) -> geometria segmentelor;
+#   - punctele cu număr (`addr:street` + `addr:housenumber`, noduri sau
+#     clădiri) -> numere cunoscute pe fiecare stradă.
+# Numele străzilor sunt indexate în memorie pe tokeni și trigrame, iar un
+# număr lipsă se interpolează de-a lungul segmentului de stradă între cele
+# mai apropiate numere cunoscute de aceeași paritate.
+#
+# Sectoarele vin din relațiile administrative "Sector N" din același extras:
+# fiecare porțiune de stradă și fiecare număr cunoscut primește sectorul în
+# care se află, iar o interogare cu sector caută doar în porțiunile din acel
+# sector (străzile cu același nume din sectoare diferite nu se mai amestecă).
+# Când mai multe străzi diferite se potrivesc la fel de bine ("Mihai" ->
+# Mihai Bravu / Mihai Eminescu), încrederea se împarte la numărul lor, ca
+# rezultatul să nu treacă drept sigur.
+#
+# Interogarea e ieșirea lui normalize_address (normalizare.py), ex.
+# "Strada MIHAI EMINESCU 12 sector 1 bucuresti", sau o adresă structurată
+# (normalizare.parseaza_adresa), cu tipul, numele și numărul deja separate.
+#
+#   python nomenclator.py bucuresti.osm.bz2 nomenclator.pickle
+
+# tip de arteră -> formă canonică (fără diacritice, litere mici)
+TIPURI = {
+    "strada": "strada", "str": "strada",
+    "bulevardul": "bulevardul", "bd": "bulevardul", "bdul": "bulevardul",
+    "calea": "calea", "soseaua": "soseaua", "sos": "soseaua",
+    "aleea": "aleea", "al": "aleea", "intrarea": "intrarea", "intr": "intrarea",
+    "fundatura": "fundatura", "fund": "fundatura", "piata": "piata", "drumul": "drumul",
+    "prelungirea": "prelungirea", "splaiul": "splaiul", "pasajul": "pasajul",
+    "parcul": "parcul", "zona": "zona", "cartierul": "cartierul", "comuna": "comuna",
+    "satul": "satul", "mosia": "mosia", "localitatea": "localitatea",
+}
+CUVINTE_IGNORATE = {"bucuresti", "romania", "sector", "municipiul"}
+
+# încrederea în funcție de cum s-a obținut punctul
+INCREDERE_METODA = {"exact": 1.0, "interpolat": 0.9, "vecin": 0.75, "strada": 0.6}
+PENALIZARE_TIP = 0.9      # tipul arterei din interogare diferă de cel din OSM
+SCOR_MINIM_NUME = 0.5     # sub acest scor de nume nu se întoarce nimic
+PENALIZARE_SECTOR = 0.5   # strada nu are nicio porțiune în sectorul din interogare
+TOLERANTA_EGALITATE = 0.02  # străzi cu scorul la atât de cel maxim = potriviri la egalitate
+CANDIDATI_TRIGRAME = 20
+
+Rezultat = namedtuple("Rezultat", "latitude longitude incredere strada numar metoda")
+
+RE_SECTOR = re.compile(r"^\s*sector(?:ul)?\s*(\d+)\s*$", re.IGNORECASE)
+
+
+def fara_diacritice(text):
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def tokeni(text):
+    return re.findall(r"[a-z0-9]+", fara_diacritice(text).casefold())
+
+
+@lru_cache(maxsize=None)
+def desparte_nume(nume):
+    """"Strada General Berthelot" -> ("strada", "general berthelot")."""
+    t = tokeni(nume)
+    if t and t[0] in TIPURI:
+        return TIPURI[t[0]], " ".join(t[1:])
+    return None, " ".join(t)
+
+
+def trigrame(nume):
+    s = f"  {nume} "
+    return {s[k:k + 3] for k in range(len(s) - 2)}
+
+
+def numar_intreg(text):
+    m = re.match(r"\s*(\d+)", str(text))
+    return int(m.group(1)) if m else None
+
+
+def parseaza_interogare(interogare):
+    """Ieșirea lui normalize_address -> (tip, nume, număr, sector).
+
+    Un număr care începe numele („Strada 11 Iunie 5”) sau anul de după o
+    lună („1 Decembrie 1918”) rămân în nume, ca în parseaza_adresa.
+    """
+    t = tokeni(interogare)
+    tip = None
+    if t and t[0] in TIPURI:
+        tip = TIPURI[t[0]]
+        t = t[1:]
+    nume, numar, sector = [], None, None
+    k = 0
+    while k < len(t):
+        tok = t[k]
+        if tok == "sector":
+            if k + 1 < len(t) and t[k + 1].isdigit():
+                sector = int(t[k + 1])
+            k += 2  # "sector N"
+            continue
+        if tok in CUVINTE_IGNORATE:
+            k += 1
+            continue
+        if tok[0].isdigit():
+            urmator = t[k + 1].upper() if k + 1 < len(t) else ""
+            if numar is None and (urmator in LUNI or (nume and nume[-1].upper() in LUNI and RE_AN.fullmatch(tok))):
+                nume.append(tok)  # ziua sau anul unei date din nume
+            elif numar is None and nume:
+                numar = numar_intreg(tok)
+        elif numar is None:
+            nume.append(tok)
+        k += 1
+    return tip, " ".join(nume), numar, sector
+
+
+def parti_interogare(interogare):
+    """(tip, nume, număr, sector) dintr-un text sau dintr-un obiect cu .tip / .nume / .numar / .sector."""
+    if isinstance(interogare, str):
+        return parseaza_interogare(interogare)
+    tip = tokeni(interogare.tip or "")
+    numar = numar_intreg(interogare.numar) if interogare.numar else None
+    return (TIPURI.get(tip[0]) if tip else None, " ".join(tokeni(interogare.nume or "")), numar,
+            getattr(interogare, "sector", None))
+
+
+# ---------- geometrie (proiecție locală echirectangulară, suficientă la scara unui oraș) ----------
+
+def _xy(lat, lon, cos0):
+    return lon * cos0, lat
+
+
+def _proiecteaza(punct, linie):
+    """(distanța de-a lungul liniei, distanța până la linie) pentru proiecția punctului."""
+    px, py = punct
+    cel_mai_bun = (0.0, math.inf)
+    parcurs = 0.0
+    for (ax, ay), (bx, by) in zip(linie, linie[1:]):
+        dx, dy = bx - ax, by - ay
+        lung = math.hypot(dx, dy)
+        if lung == 0:
+            continue
+        u = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (lung * lung)))
+        d = math.hypot(px - (ax + u * dx), py - (ay + u * dy))
+        if d < cel_mai_bun[1]:
+            cel_mai_bun = (parcurs + u * lung, d)
+        parcurs += lung
+    return cel_mai_bun
+
+
+def _centru(linii):
+    xs = [x for linie in linii for x, _ in linie]
+    ys = [y for linie in linii for _, y in linie]
+    return sum(xs) / len(xs), sum(ys) / len(ys)
+
+
+def _inele(segmente):
+    """Lipește căile unei relații (liste de puncte) în inele închise."""
+    ramase = [list(seg) for seg in segmente if len(seg) > 1]
+    inele = []
+    while ramase:
+        inel = ramase.pop()
+        while inel[0] != inel[-1]:
+            for k, seg in enumerate(ramase):
+                if seg[0] == inel[-1]:
+                    inel += seg[1:]
+                elif seg[-1] == inel[-1]:
+                    inel += seg[-2::-1]
+                else:
+                    continue
+                del ramase[k]
+                break
+            else:
+                break  # contur tăiat de marginea extrasului: se închide cu o latură dreaptă
+        inele.append(inel)
+    return inele
+
+
+def sectoare_puncte(puncte, contururi):
+    """Sectorul (sau None) fiecărui punct (x, y), după regula par-impar pe inelele fiecărui sector."""
+    rezultat = [None] * len(puncte)
+    if not puncte or not contururi:
+        return rezultat
+    px, py = np.array(puncte, dtype=float).T
+    for sector, inele in sorted(contururi.items()):
+        inauntru = np.zeros(len(puncte), dtype=bool)
+        for inel in inele:
+            a = np.array(inel, dtype=float)
+            b = np.roll(a, -1, axis=0)
+            for (x1, y1), (x2, y2) in zip(a, b):
+                if y1 == y2:
+                    continue
+                taie = ((y1 > py) != (y2 > py)) & (px < x1 + (py - y1) * (x2 - x1) / (y2 - y1))
+                inauntru ^= taie
+        for k in np.flatnonzero(inauntru):
+            if rezultat[k] is None:
+                rezultat[k] = sector
+    return rezultat
+
+
+def _punct_la(linie, distanta):
+    parcurs = 0.0
+    for (ax, ay), (bx, by) in zip(linie, linie[1:]):
+        lung = math.hypot(bx - ax, by - ay)
+        if parcurs + lung >= distanta and lung > 0:
+            u = (distanta - parcurs) / lung
+            return ax + u * (bx - ax), ay + u * (by - ay)
+        parcurs += lung
+    return linie[-1]
+
+
+class Strada:
+    __slots__ = ("tip", "nume", "nume_complet", "linii", "numere", "centru", "sectoare")
+
+    def __init__(self, tip, nume, nume_complet):
+        self.tip = tip
+        self.nume = nume
+        self.nume_complet = nume_complet
+        self.linii = []      # liste de (x, y)
+        self.numere = {}     # paritate -> listă sortată de (număr, x, y, sector)
+        self.centru = None
+        self.sectoare = []   # sectorul fiecărei linii (None = necunoscut / în afara sectoarelor)
+
+
+class NomenclatorStradal:
+    """Index în memorie: străzi + numere cunoscute; `cauta(interogare)` -> Rezultat sau None."""
+
+    def __init__(self):
+        self.strazi = []
+        self.cos0 = 1.0
+        self.dupa_nume = defaultdict(list)     # nume -> id-uri străzi
+        self.dupa_token = defaultdict(set)     # token -> id-uri
+        self.dupa_trigrama = defaultdict(set)  # trigramă -> id-uri
+
+    # ---------- construcție ----------
+
+    @classmethod
+    def din_osm(cls, path):
+        nod = {}
+        strazi = {}  # (tip, nume) -> Strada
+        puncte = []  # (nume stradă OSM, număr, lat, lon)
+        # relațiile vin după căi în fișier: o primă trecere află căile de contur ale sectoarelor
+        membri = _membri_sectoare(path)
+        contururi = defaultdict(list)  # sector -> căi (liste de (lat, lon))
+
+        with _deschide(path) as f:
+            for _, el in etree.iterparse(f, events=("end",), tag=("node", "way")):
+                taguri = {t.get("k"): t.get("v") for t in el.iterfind("tag")}
+                if el.tag == "node":
+                    lat, lon = float(el.get("lat")), float(el.get("lon"))
+                    nod[el.get("id")] = (lat, lon)
+                    if "addr:street" in taguri and "addr:housenumber" in taguri:
+                        puncte.append((taguri["addr:street"], taguri["addr:housenumber"], lat, lon))
+                else:
+                    coord = [nod[r.get("ref")] for r in el.iterfind("nd") if r.get("ref") in nod]
+                    for sector in membri.get(el.get("id"), ()):
+                        contururi[sector].append(coord)
+                    if coord and "highway" in taguri and "name" in taguri:
+                        tip, nume = desparte_nume(taguri["name"])
+                        s = strazi.get((tip, nume))
+                        if s is None:
+                            s = strazi[(tip, nume)] = Strada(tip, nume, taguri["name"])
+                        s.linii.append(coord)
+                    elif coord and "addr:street" in taguri and "addr:housenumber" in taguri:
+                        lat = sum(c[0] for c in coord) / len(coord)
+                        lon = sum(c[1] for c in coord) / len(coord)
+                        puncte.append((taguri["addr:street"], taguri["addr:housenumber"], lat, lon))
+                el.clear()
+                while el.getprevious() is not None:
+                    del el.getparent()[0]
+
+        nomenclator = cls()
+        nomenclator._construieste(list(strazi.values()), puncte, contururi)
+        return nomenclator
+
+    def _construieste(self, strazi, puncte, contururi=None):
+        toate = [c for s in strazi for linie in s.linii for c in linie]
+        lat0 = sum(c[0] for c in toate) / len(toate) if toate else 44.43
+        self.cos0 = math.cos(math.radians(lat0))
+        index = {}
+        inele = {sector: _inele([[_xy(lat, lon, self.cos0) for lat, lon in cale] for cale in cai])
+                 for sector, cai in (contururi or {}).items()}
+        mijloace = []
+        for sid, s in enumerate(strazi):
+            s.linii = [[_xy(lat, lon, self.cos0) for lat, lon in linie] for linie in s.linii]
+            s.centru = _centru(s.linii)
+            mijloace.extend(linie[len(linie) // 2] for linie in s.linii)
+            index[(s.tip, s.nume)] = sid
+            self.dupa_nume[s.nume].append(sid)
+            for tok in s.nume.split():
+                self.dupa_token[tok].add(sid)
+            for tri in trigrame(s.nume):
+                self.dupa_trigrama[tri].add(sid)
+        self.strazi = strazi
+        sectoare = iter(sectoare_puncte(mijloace, inele))
+        for s in strazi:
+            s.sectoare = [next(sectoare) for _ in s.linii]
+
+        cunoscute = []
+        for nume_strada, nr_text, lat, lon in puncte:
+            sid = index.get(desparte_nume(nume_strada))
+            nr = numar_intreg(nr_text)
+            if sid is not None and nr is not None:
+                cunoscute.append((sid, nr, *_xy(lat, lon, self.cos0)))
+        numere = defaultdict(lambda: defaultdict(list))
+        for (sid, nr, x, y), sector in zip(cunoscute, sectoare_puncte([c[2:] for c in cunoscute], inele)):
+            numere[sid][nr % 2].append((nr, x, y, sector))
+        for sid, pe_paritate in numere.items():
+            self.strazi[sid].numere = {p: sorted(v) for p, v in pe_paritate.items()}
+
+    def salveaza(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def incarca(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def __getstate__(self):
+        stare = self.__dict__.copy()
+        for k in ("dupa_nume", "dupa_token", "dupa_trigrama"):
+            stare[k] = dict(stare[k])
+        return stare
+
+    def __setstate__(self, stare):
+        self.__dict__.update(stare)
+        self.dupa_nume = defaultdict(list, self.dupa_nume)
+        self.dupa_token = defaultdict(set, self.dupa_token)
+        self.dupa_trigrama = defaultdict(set, self.dupa_trigrama)
+        for s in self.strazi:
+            if not hasattr(s, "sectoare"):  # index construit înainte de sectoare
+                s.sectoare = [None] * len(s.linii)
+                s.numere = {p: [(*n, None) for n in v] for p, v in s.numere.items()}
+
+    # ---------- căutare ----------
+
+    def _scor_nume(self, nume, strada):
+        if nume == strada.nume:
+            return 1.0
+        tq, ts = trigrame(nume), trigrame(strada.nume)
+        dice = 2 * len(tq & ts) / (len(tq) + len(ts))
+        # "BERTHELOT" în "general berthelot": toți tokenii interogării apar în nume
+        tokeni_q = nume.split()
+        continut = 0.95 if tokeni_q and set(tokeni_q) <= set(strada.nume.split()) else 0.0
+        return max(dice, continut)
+
+    def _candidati(self, nume):
+        exacte = self.dupa_nume.get(nume)
+        if exacte:
+            return exacte
+        tokeni_q = nume.split()
+        if tokeni_q:
+            comune = set.intersection(*(self.dupa_token.get(t, set()) for t in tokeni_q))
+            if comune:
+                return comune
+        numarare = Counter()
+        for tri in trigrame(nume):
+            numarare.update(self.dupa_trigrama.get(tri, ()))
+        return [sid for sid, _ in numarare.most_common(CANDIDATI_TRIGRAME)]
+
+    def _punct(self, strada, numar, sector=None):
+        """(x, y, metodă) pentru numărul dat pe stradă; cu `sector`, doar porțiunile din sector."""
+        linii, centru = strada.linii, strada.centru
+        lista = strada.numere.get(numar % 2, []) if numar is not None else []
+        if sector is not None and sector in strada.sectoare:
+            linii = [l for l, s in zip(strada.linii, strada.sectoare) if s == sector]
+            centru = _centru(linii)
+            lista = [n for n in lista if n[3] == sector]
+        if numar is None or not lista:
+            return centru[0], centru[1], "strada"
+        k = bisect_left(lista, (numar,))
+        if k < len(lista) and lista[k][0] == numar:
+            return lista[k][1], lista[k][2], "exact"
+        if 0 < k < len(lista):
+            (n1, x1, y1, _), (n2, x2, y2, _) = lista[k - 1], lista[k]
+            f = (numar - n1) / (n2 - n1)
+            # interpolare de-a lungul segmentului pe care se proiectează ambele numere
+            linie = min(linii, key=lambda l: _proiecteaza((x1, y1), l)[1] + _proiecteaza((x2, y2), l)[1])
+            d1, d2 = _proiecteaza((x1, y1), linie)[0], _proiecteaza((x2, y2), linie)[0]
+            if d1 != d2:
+                x, y = _punct_la(linie, d1 + f * (d2 - d1))
+            else:
+                x, y = x1 + f * (x2 - x1), y1 + f * (y2 - y1)
+            return x, y, "interpolat"
+        _, x, y, _ = lista[min(k, len(lista) - 1)]
+        return x, y, "vecin"
+
+    def cauta(self, interogare):
+        tip, nume, numar, sector = parti_interogare(interogare)
+        if not nume:
+            return None
+        scoruri = []
+        for sid in self._candidati(nume):
+            s = self.strazi[sid]
+            scor = self._scor_nume(nume, s)
+            if tip and s.tip and tip != s.tip:
+                scor *= PENALIZARE_TIP
+            if sector is not None and sector not in s.sectoare and any(x is not None for x in s.sectoare):
+                scor *= PENALIZARE_SECTOR
+            scoruri.append((scor, sid))
+        if not scoruri:
+            return None
+        scor_max, sid = max(scoruri, key=lambda p: (p[0], -p[1]))
+        if scor_max < SCOR_MINIM_NUME:
+            return None
+        # "Mihai" se potrivește la fel de bine cu Mihai Bravu și Mihai Eminescu: nu e o potrivire sigură
+        egale = sum(1 for scor, _ in scoruri if scor >= scor_max - TOLERANTA_EGALITATE)
+        cel_mai_bun = self.strazi[sid]
+        x, y, metoda = self._punct(cel_mai_bun, numar, sector)
+        return Rezultat(
+            latitude=y, longitude=x / self.cos0,
+            incredere=round(scor_max * INCREDERE_METODA[metoda] / egale, 3),
+            strada=cel_mai_bun.nume_complet, numar=numar, metoda=metoda,
+        )
+
+
+def _deschide(path):
+    return (bz2.open if path.endswith(".bz2") else gzip.open if path.endswith(".gz") else open)(path, "rb")
+
+
+def _membri_sectoare(path):
+    """id cale -> sectoarele ale căror contururi le formează (relații boundary=administrative "Sector N")."""
+    membri = defaultdict(list)
+    with _deschide(path) as f:
+        for _, el in etree.iterparse(f, events=("end",), tag=("node", "way", "relation")):
+            if el.tag == "relation":
+                taguri = {t.get("k"): t.get("v") for t in el.iterfind("tag")}
+                m = RE_SECTOR.match(taguri.get("name", ""))
+                if m and taguri.get("boundary") == "administrative":
+                    for membru in el.iterfind("member"):
+                        if membru.get("type") == "way":
+                            membri[membru.get("ref")].append(int(m.group(1)))
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+    return membri
+
+
+if __name__ == "__main__":
+    sursa = sys.argv[1] if len(sys.argv) > 1 else "bucuresti.osm.bz2"
+    destinatie = sys.argv[2] if len(sys.argv) > 2 else "nomenclator.pickle"
+    n = NomenclatorStradal.din_osm(sursa)
+    n.salveaza(destinatie)
+    cu_numere = sum(1 for s in n.strazi if s.numere)
+    print(f"✅ {len(n.strazi)} străzi ({cu_numere} cu numere cunoscute) din {sursa} -> {destinatie}")
@@ -0,0 +1,365 @@
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# Normalizarea adreselor pentru geocodare (mutată din co.py, care rulează la
+# import). `normalize_address_original` e implementarea inițială, păstrată ca
+# referință pentru testul diferențial (tests/test_normalizare.py);
+# `normalize_address` dă exact același rezultat, dar cu expresiile compilate
+# o singură dată și cu cele 17 abrevieri într-o singură trecere: o alternanță
+# ordonată plus un tabel de înlocuiri, în locul a 17 re.sub succesive.
+#
+# Pentru coloane întregi, `normalizeaza_lot` normalizează fiecare adresă
+# distinctă o singură dată, opțional pe mai multe procese.
+#
+# `parseaza_adresa` folosește aceiași pași, dar păstrează componentele
+# separat (tip, nume, număr, parcelă, sector, localitate), pentru coloane în
+# tabel și interogări structurate (stradă / oraș) la geocoder și nomenclator.
+
+PROCESE = None          # None = un singur proces; N = ProcessPoolExecutor cu N procese
+MIN_PENTRU_PROCESE = 20_000  # sub atâtea adrese distincte, pool-ul costă mai mult decât câștigă
+MARIME_BUCATA = 2_000
+LOCALITATE_IMPLICITA = "Bucuresti"
+TIPURI_LOCALITATE = {"Comuna", "Satul", "Localitatea"}  # numele e al localității, nu al unei străzi
+
+
+def normalize_address_original(address):
+    """Implementarea inițială din co.py, neschimbată (referința testului diferențial)."""
+    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])G-RAL(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
+    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])BIS(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
+    address = re.sub(r'(?i)(?<![A-ZĂÂÎȘȚa-zăâîșț])SNIC(?![A-ZĂÂÎȘȚa-zăâîșț])', '', address)
+
+    replacements = {
+        r'(?i)\bS(TRA?D?A?)?\.?\b': 'Strada',
+        r'(?i)\bIN(TR(ARE|\.?)?)?\b|\bIN\b': 'Intrarea',
+        r'(?i)\bFUND(ATURA?|AT|A|\.?)\b|\bFUNDA\.?\b': 'Fundatura',
+        r'(?i)\bB([- ]?DUL|D|UL|UL\.?|ULUI|DULUI|ULEVARD|ULEVARDUL)?\.?\b': 'Bulevardul',
+        r'(?i)\bCAL(EA)?\.?\b|\bCALE\.?\b': 'Calea',
+        r'(?i)\bS(OS(EAUA?)?|OSEA)?\.?\b': 'Soseaua',
+        r'(?i)\bAL(EE?A?)?\.?\b': 'Aleea',
+        r'(?i)\bPREL(UNGIREA?)?\.?\b': 'Prelungirea',
+        r'(?i)\bCOM(UNA?|\.?)\b|\bCO\b': 'Comuna',
+        r'(?i)\bCART(IER(UL)?|\.?)\b|\bCAR\b': 'Cartierul',
+        r'(?i)\bSAT(UL)?\.?\b': 'Satul',
+        r'(?i)\bPIA(TA)?\.?\b': 'Piata',
+        r'(?i)\bDRUM(UL)?\.?\b|\bDR\b': 'Drumul',
+        r'(?i)\bZONA?\.?\b': 'Zona',
+        r'(?i)\bMOS(IA)?\.?\b': 'Mosia',
+        r'(?i)\bPARC(UL)?\.?\b': 'Parcul',
+        r'(?i)\bLOCALIT(ATEA)?\.?\b|\bLOC\b': 'Localitatea'
+    }
+
+    normalized = address.strip()
+    for pattern, replacement in replacements.items():
+        normalized = re.sub(pattern, replacement, normalized)
+
+    normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)\.', r'\1', normalized)
+    normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)([A-ZĂÂÎȘȚ])', r'\1 \2', normalized)
+    normalized = re.sub(r'\b([A-ZĂÂÎȘȚ])\.\s*', '', normalized)
+    normalized = re.sub(r'[,:.]', ' ', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized)
+
+    fn_match = re.search(r'(?i)\bFN\s*\((\d+)\)', normalized)
+    if fn_match:
+        normalized = re.sub(r'(?i)\bFN\s*\(\d+\)', fn_match.group(1), normalized)
+    normalized = re.sub(r'\([^)]*\)', '', normalized)
+    normalized = re.sub(r'(?i)\bFN\b', 'FN', normalized)
+    normalized = re.sub(r'(?i)\b(nr|numar|nrul|numarul)\b', 'nr', normalized)
+
+    nr_fn = bool(re.search(r'(?i)\bnr\s*[:.]*\s*FN\b', normalized))
+    match_nr = re.search(r'(?i)\bnr\s*[:.]*\s*([\d]+)', normalized)
+    first_nr = match_nr.group(1) if match_nr else None
+
+    match_parcela = re.search(r'(?i)\bPARCELA\s*([A-Z0-9]+)\b', normalized)
+    if match_parcela:
+        parcela_raw = match_parcela.group(1)
+        parcela_num = re.match(r'\d+', parcela_raw)
+        parcela_num = parcela_num.group(0) if parcela_num else None
+    else:
+        parcela_num = None
+
+    normalized = re.sub(r'(?i)\bnr\s*[:.]*\s*[^,]*', '', normalized)
+    normalized = re.sub(r'(?i)\bPARC(ELA)?\s*[A-Z0-9]*', '', normalized)
+
+    if nr_fn and parcela_num:
+        add_number = parcela_num
+    elif first_nr:
+        add_number = first_nr
+    else:
+        add_number = None
+
+    if add_number:
+        normalized = re.sub(r'(?i)(Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea)([^0-9]*)',
+                            r'\1\2 ' + add_number + ' ', normalized, 1)
+
+    sector_match = re.search(r'(?i)\bsector\s*:?\.?\s*(\d+)', address)
+    if sector_match:
+        sector = sector_match.group(1)
+        if sector != '0':
+            normalized += f" sector {sector}"
+
+    tokens = normalized.split()
+    if tokens:
+        prefix = tokens[0]
+        filtered_tokens = [prefix]
+        for t in tokens[1:]:
+            if re.fullmatch(r'\d+[A-Z]*', t) or t.isupper() or t.lower() == 'sector':
+                filtered_tokens.append(t)
+        normalized = ' '.join(filtered_tokens)
+
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    normalized = re.sub(r',\s*$', '', normalized)
+
+    if not re.search(r'(?i)\bbucuresti\b$', normalized):
+        normalized += ' bucuresti'
+
+    return normalized
+
+
+# === Implementarea compilată ===
+
+_LITERE = "A-ZĂÂÎȘȚa-zăâîșț"
+# prima literă a fiecărui tip / abrevieri: un lookahead pe ea respinge repede
+# pozițiile unde alternanța (case-insensitive) nu are cum să potrivească
+INITIALE_TIPURI = "sbcaifpdzml"
+TIPURI = ("Strada|Bulevardul|Calea|Soseaua|Aleea|Intrarea|Fundatura|Comuna|Cartierul|Satul|Piata|"
+          "Drumul|Zona|Mosia|Parcul|Prelungirea|Localitatea")
+
+# (model, înlocuire) în ordinea aplicării din implementarea originală
+ABREVIERI = [
+    (r'\bS(TRA?D?A?)?\.?\b', 'Strada'),
+    (r'\bIN(TR(ARE|\.?)?)?\b|\bIN\b', 'Intrarea'),
+    (r'\bFUND(ATURA?|AT|A|\.?)\b|\bFUNDA\.?\b', 'Fundatura'),
+    (r'\bB([- ]?DUL|D|UL|UL\.?|ULUI|DULUI|ULEVARD|ULEVARDUL)?\.?\b', 'Bulevardul'),
+    (r'\bCAL(EA)?\.?\b|\bCALE\.?\b', 'Calea'),
+    (r'\bS(OS(EAUA?)?|OSEA)?\.?\b', 'Soseaua'),
+    (r'\bAL(EE?A?)?\.?\b', 'Aleea'),
+    (r'\bPREL(UNGIREA?)?\.?\b', 'Prelungirea'),
+    (r'\bCOM(UNA?|\.?)\b|\bCO\b', 'Comuna'),
+    (r'\bCART(IER(UL)?|\.?)\b|\bCAR\b', 'Cartierul'),
+    (r'\bSAT(UL)?\.?\b', 'Satul'),
+    (r'\bPIA(TA)?\.?\b', 'Piata'),
+    (r'\bDRUM(UL)?\.?\b|\bDR\b', 'Drumul'),
+    (r'\bZONA?\.?\b', 'Zona'),
+    (r'\bMOS(IA)?\.?\b', 'Mosia'),
+    (r'\bPARC(UL)?\.?\b', 'Parcul'),
+    (r'\bLOCALIT(ATEA)?\.?\b|\bLOC\b', 'Localitatea'),
+]
+
+RE_ELIMINATE = re.compile(rf'(?i)(?<![{_LITERE}])(?:G-RAL|BIS|SNIC)(?![{_LITERE}])')
+# fiecare model devine grupul a{k}; m.lastgroup dă modelul care a potrivit
+RE_ABREVIERI = re.compile(
+    rf"\b(?=[{INITIALE_TIPURI}])(?:"
+    + "|".join(f"(?P<a{k}>{model})" for k, (model, _) in enumerate(ABREVIERI)) + ")",
+    re.IGNORECASE,
+)
+INLOCUIRI = {f"a{k}": (k, inlocuire) for k, (_, inlocuire) in enumerate(ABREVIERI)}
+RE_TIP_PUNCT = re.compile(rf'(?i)(?=[{INITIALE_TIPURI}])({TIPURI})\.')
+RE_TIP_LIPIT = re.compile(rf'(?i)(?=[{INITIALE_TIPURI}])({TIPURI})([A-ZĂÂÎȘȚ])')
+RE_INITIALA = re.compile(r'\b([A-ZĂÂÎȘȚ])\.\s*')
+RE_PUNCTUATIE = re.compile(r'[,:.]')
+RE_SPATII = re.compile(r'\s+')
+RE_FN_PARANTEZA = re.compile(r'(?i)\bFN\s*\((\d+)\)')
+RE_PARANTEZE = re.compile(r'\([^)]*\)')
+RE_FN = re.compile(r'(?i)\bFN\b')
+RE_NR = re.compile(r'(?i)\b(nr|numar|nrul|numarul)\b')
+RE_NR_FN = re.compile(r'(?i)\bnr\s*[:.]*\s*FN\b')
+RE_NR_VALOARE = re.compile(r'(?i)\bnr\s*[:.]*\s*([\d]+)')
+RE_PARCELA = re.compile(r'(?i)\bPARCELA\s*([A-Z0-9]+)\b')
+RE_CIFRE = re.compile(r'\d+')
+RE_NR_REST = re.compile(r'(?i)\bnr\s*[:.]*\s*[^,]*')
+RE_PARCELA_REST = re.compile(r'(?i)\bPARC(ELA)?\s*[A-Z0-9]*')
+RE_DUPA_TIP = re.compile(rf'(?i)(?=[{INITIALE_TIPURI}])({TIPURI})([^0-9]*)')
+RE_SECTOR = re.compile(r'(?i)\bsector\s*:?\.?\s*(\d+)')
+RE_NUMAR_TOKEN = re.compile(r'\d+[A-Z]*')
+RE_VIRGULA_FINALA = re.compile(r',\s*$')
+RE_BUCURESTI_FINAL = re.compile(r'(?i)\bbucuresti\b$')
+
+
+def _abrevieri(text):
+    """Cele 17 înlocuiri de abrevieri într-o singură trecere, ca aplicate pe rând.
+
+    Ordinea alternanței decide, ca și ordinea aplicării, ce abreviere câștigă
+    pe aceeași poziție. Singura interacțiune dintre înlocuirile succesive: o
+    potrivire terminată în „.” și lipită de cuvântul următor („S.CALEA”)
+    devine „StradaCALEA”, fără graniță de cuvânt, deci modelele aplicate
+    după ea nu mai potrivesc acel cuvânt; cele aplicate înainte îl văzuseră
+    încă separat.
+    """
+    anterior = [-1, 0]  # (sfârșitul ultimei înlocuiri terminate în „.”, indicele modelului ei)
+
+    def inlocuieste(m):
+        k, inlocuire = INLOCUIRI[m.lastgroup]
+        if m.start() == anterior[0] and k > anterior[1]:
+            anterior[0] = -1
+            return m.group(0)
+        anterior[:] = (m.end(), k) if m.group(0).endswith(".") else (-1, 0)
+        return inlocuire
+
+    return RE_ABREVIERI.sub(inlocuieste, text)
+
+
+def normalize_address(address):
+    """Ca `normalize_address_original`, cu expresii precompilate și abrevierile într-o trecere."""
+    address = RE_ELIMINATE.sub('', address)
+
+    normalized = _abrevieri(address.strip())
+
+    normalized = RE_TIP_PUNCT.sub(r'\1', normalized)
+    normalized = RE_TIP_LIPIT.sub(r'\1 \2', normalized)
+    normalized = RE_INITIALA.sub('', normalized)
+    normalized = RE_PUNCTUATIE.sub(' ', normalized)
+    normalized = RE_SPATII.sub(' ', normalized)
+
+    fn_match = RE_FN_PARANTEZA.search(normalized)
+    if fn_match:
+        normalized = RE_FN_PARANTEZA.sub(fn_match.group(1), normalized)
+    normalized = RE_PARANTEZE.sub('', normalized)
+    normalized = RE_FN.sub('FN', normalized)
+    normalized = RE_NR.sub('nr', normalized)
+
+    nr_fn = RE_NR_FN.search(normalized) is not None
+    match_nr = RE_NR_VALOARE.search(normalized)
+    first_nr = match_nr.group(1) if match_nr else None
+
+    match_parcela = RE_PARCELA.search(normalized)
+    if match_parcela:
+        parcela_num = RE_CIFRE.match(match_parcela.group(1))
+        parcela_num = parcela_num.group(0) if parcela_num else None
+    else:
+        parcela_num = None
+
+    normalized = RE_NR_REST.sub('', normalized)
+    normalized = RE_PARCELA_REST.sub('', normalized)
+
+    if nr_fn and parcela_num:
+        add_number = parcela_num
+    else:
+        add_number = first_nr
+
+    if add_number:
+        normalized = RE_DUPA_TIP.sub(r'\1\2 ' + add_number + ' ', normalized, 1)
+
+    sector_match = RE_SECTOR.search(address)
+    if sector_match:
+        sector = sector_match.group(1)
+        if sector != '0':
+            normalized += f" sector {sector}"
+
+    tokens = normalized.split()
+    if tokens:
+        normalized = ' '.join([tokens[0]] + [
+            t for t in tokens[1:]
+            if RE_NUMAR_TOKEN.fullmatch(t) or t.isupper() or t.lower() == 'sector'
+        ])
+
+    normalized = RE_SPATII.sub(' ', normalized).strip()
+    normalized = RE_VIRGULA_FINALA.sub('', normalized)
+
+    if not RE_BUCURESTI_FINAL.search(normalized):
+        normalized += ' bucuresti'
+
+    return normalized
+
+
+# === Parsare structurată ===
+
+RE_NUMAR_STRADA = re.compile(r'(?i)\bnr\s*[:.]*\s*(\d+(?:[A-Z]\b)?)')
+RE_NUMAR_LIBER = re.compile(r'(?i)\d+(?:[A-Z]\b)?')
+RE_AN = re.compile(r'(1[89]|20)\d\d')
+# ce urmează după număr / parcelă / sector nu mai face parte din numele străzii
+RE_SFARSIT_NUME = re.compile(r'(?i)\bnr\b|\bPARCELA\b|\bsector\b')
+CUVINTE_IGNORATE = {"BUCURESTI", "MUNICIPIUL", "ROMANIA", "BL", "SC", "ET", "ETAJ", "ETJ", "AP"}
+TIPURI_CANONICE = {t.upper(): t for t in TIPURI.split("|")}
+# nume de străzi care încep cu o dată: „1 Decembrie 1918”, „13 Septembrie”
+LUNI = {"IANUARIE", "FEBRUARIE", "MARTIE", "APRILIE", "MAI", "IUNIE", "IULIE", "AUGUST",
+        "SEPTEMBRIE", "OCTOMBRIE", "NOIEMBRIE", "DECEMBRIE"}
+
+
+class AdresaStructurata(namedtuple("AdresaStructurata", "tip nume numar parcela sector localitate")):
+    """Componentele unei adrese; ce lipsește e None (sectorul e int)."""
+
+    __slots__ = ()
+
+    def strada(self):
+        """"12 Strada MIHAI EMINESCU": parametrul `street` al unei căutări structurate."""
+        return " ".join(p for p in (self.numar, self.tip, self.nume) if p)
+
+    def __str__(self):
+        # cheia în cache-ul de geocodare și textul din mesaje; sectorul face
+        # parte din cheie ("Popa Nan 17" din sectorul 5 nu e cea din sectorul 6)
+        if self.sector is not None:
+            return f"{self.strada()}, sector {self.sector}, {self.localitate}"
+        return f"{self.strada()}, {self.localitate}"
+
+
+def parseaza_adresa(address):
+    """Adresa brută -> AdresaStructurata, cu aceleași abrevieri și reguli ca `normalize_address`.
+
+    Spre deosebire de forma text, numele străzii își păstrează toate
+    cuvintele (nu doar pe cele cu majuscule), iar numărul poate avea literă.
+    """
+    text = _abrevieri(RE_ELIMINATE.sub('', address).strip())
+    text = RE_TIP_PUNCT.sub(r'\1', text)
+    text = RE_TIP_LIPIT.sub(r'\1 \2', text)
+    text = RE_INITIALA.sub('', text)
+    text = RE_PUNCTUATIE.sub(' ', text)
+
+    fn_match = RE_FN_PARANTEZA.search(text)
+    text = RE_PARANTEZE.sub('', RE_FN_PARANTEZA.sub('', text))
+    text = RE_NR.sub('nr', text)
+
+    match_nr = RE_NUMAR_STRADA.search(text)
+    numar = match_nr.group(1).upper() if match_nr and not RE_NR_FN.search(text) else None
+    match_parcela = RE_PARCELA.search(text)
+    parcela = match_parcela.group(1).upper() if match_parcela else (fn_match.group(1) if fn_match else None)
+
+    sfarsit = RE_SFARSIT_NUME.search(text)
+    tokens = [t for t in (text[:sfarsit.start()] if sfarsit else text).split()
+              if t.upper() not in CUVINTE_IGNORATE]
+    tip = TIPURI_CANONICE.get(tokens[0].upper()) if tokens else None
+    if tip:
+        tokens = tokens[1:]
+    nume = []
+    for k, t in enumerate(tokens):
+        if t[0].isdigit():
+            urmator = tokens[k + 1].upper() if k + 1 < len(tokens) else ""
+            if urmator in LUNI or (nume and nume[-1].upper() in LUNI and RE_AN.fullmatch(t)):
+                nume.append(t)  # parte din nume: ziua sau anul unei date
+                continue
+            if nume:  # „Strada X 12”, fără „nr” (din „4-6” rămâne 4)
+                numar = numar or RE_NUMAR_LIBER.match(t).group(0).upper()
+                break
+            continue
+        if nume and t.upper() in TIPURI_CANONICE:
+            break  # „Comuna Chiajna Satul Rosu”: alt tip, altă componentă
+        nume.append(t)
+    nume = " ".join(nume) or None
+
+    sector_match = RE_SECTOR.search(address)
+    sector = int(sector_match.group(1)) if sector_match and int(sector_match.group(1)) else None
+    localitate = nume if tip in TIPURI_LOCALITATE and nume else LOCALITATE_IMPLICITA
+    return AdresaStructurata(tip, nume, numar, parcela, sector, localitate)
+
+
+def _normalizeaza_bucata(adrese):
+    return [normalize_address(a) for a in adrese]
+
+
+def normalizeaza_lot(adrese, procese=PROCESE, marime_bucata=MARIME_BUCATA):
+    """Lista adreselor normalizate, în ordinea din `adrese` (listă, coloană pandas etc.).
+
+    Fiecare adresă distinctă se normalizează o singură dată; peste
+    MIN_PENTRU_PROCESE adrese distincte și cu `procese` > 1, pe un
+    ProcessPoolExecutor, în bucăți de `marime_bucata`.
+    """
+    adrese = list(adrese)
+    distincte = list(dict.fromkeys(adrese))
+    if procese and procese > 1 and len(distincte) >= MIN_PENTRU_PROCESE:
+        bucati = [distincte[k:k + marime_bucata] for k in range(0, len(distincte), marime_bucata)]
+        with ProcessPoolExecutor(procese) as pool:
+            normalizate = [n for bucata in pool.map(_normalizeaza_bucata, bucati) for n in bucata]
+    else:
+        normalizate = _normalizeaza_bucata(distincte)
+    rezultat = dict(zip(distincte, normalizate))
+    return [rezultat[a] for a in adrese]
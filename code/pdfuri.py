@@ -1,65 +1,147 @@
-import pandas as pd
 import os
 import re
+import sys
+
+import numpy as np
+import pandas as pd
 
-# 1. Citește CSV-ul
-df = pd.read_csv("dosare_geocode_grupate_regex.csv")
+import tabel
+import referinte_acte
+from depozit_pdf import INDEX_FILE, DepozitPdf, importa_folder
 
-# 2. Funcție pentru extragerea numărului de dosar din "Dosar PMB"
+TABEL_PATH = tabel.cale("dosare_geocode_grupate_regex")
+OUTPUT_PATH = tabel.cale("dosare_geocode_cu_pdfuri")
+DEPOZIT_DIR = "pdfs_depozit"
+PDF_DIR_VECHI = "pdfs"  # PDF-urile `{dosar}_{dpg}_{data}.pdf` de dinaintea depozitului
+CUTOFF_DOSAR = 17033
+
+# Potrivirea PDF -> rânduri e un hash-join, nu o buclă pe PDF-uri cu o
+# scanare a tabelului pentru fiecare: actele citate de fiecare rând (din
+# tabelul actelor, referinte_acte.py, extras o singură dată pentru tot
+# pipeline-ul) devin un tabel lung (rand, dosar, dpg, data), legăturile din
+# depozit un tabel (dosar, dpg, data, hash-uri), un singur merge le leagă,
+# iar listele cu ";" se construiesc printr-un singur groupby pe rând (o
+# sortare stabilă + tăierea în segmente; `groupby().agg(";".join)` din
+# pandas apelează join printr-un Series per grup și e de zeci de ori mai
+# lent). Bucla veche rămâne în potriveste_pdfuri_original, ca referință
+# pentru tests/test_pdfuri.py.
+
+
+def perechi_lungi(df, acte):
+    """Tabelul lung (rand, dosar, dpg, data): o linie pe act cu dată citat de dosarul fiecărui rând.
+
+    `rand` e poziția în `df`; `acte` e tabelul din referinte_acte (legat prin "Dosar PMB").
+    """
+    randuri = pd.DataFrame({"rand": range(len(df)), "Dosar PMB": df["Dosar PMB"].fillna("").to_numpy(dtype=object)})
+    cu_data = acte.loc[acte["data"].notna(), ["Dosar PMB", "dosar", "dpg", "data"]].astype(object)
+    lung = randuri.merge(cu_data, on="Dosar PMB")[["rand", "dosar", "dpg", "data"]]
+    return lung.drop_duplicates(ignore_index=True)
+
+
+def uneste_pe_grupuri(coduri, valori):
+    """(coduri distincte, ";".join al valorilor fiecăruia), păstrând ordinea valorilor din același grup."""
+    ordine = np.argsort(coduri, kind="stable")
+    coduri, valori = np.asarray(coduri)[ordine], np.asarray(valori, dtype=object)[ordine].tolist()
+    inceputuri = np.flatnonzero(np.r_[True, coduri[1:] != coduri[:-1]]) if len(coduri) else np.array([], int)
+    capete = np.r_[inceputuri[1:], len(coduri)]
+    return coduri[inceputuri], [";".join(valori[a:b]) for a, b in zip(inceputuri, capete)]
+
+
+def legaturi_pdf(intrari):
+    """Din DepozitPdf.intrari(): (dosar, dpg, data, ordine, Pdf_nume, Pdf_hash), o linie pe act.
+
+    `ordine` = ordinea primei apariții a actului în index; hash-urile unui
+    act (dacă sunt mai multe) sunt unite cu ";", tot în ordinea din index.
+    """
+    intrari = pd.DataFrame([r[:4] for r in intrari], columns=["dosar", "dpg", "data", "hash"])
+    chei = ["dosar", "dpg", "data"]
+    ordine = intrari.groupby(chei, sort=False).ngroup().to_numpy()
+    ordine_acte, hash_uri = uneste_pe_grupuri(ordine, intrari["hash"])
+    acte = intrari.drop_duplicates(chei)[chei].reset_index(drop=True)
+    acte["ordine"] = ordine_acte
+    acte["Pdf_hash"] = hash_uri
+    acte["Pdf_nume"] = acte["dosar"] + "_" + acte["dpg"] + "_" + acte["data"] + ".pdf"
+    return acte
+
+
+def potriveste_pdfuri(df, intrari, acte=None):
+    """(Pdf_nume, Pdf_hash) pentru fiecare rând din `df`, ca liste cu ";" ("" = niciun PDF).
+
+    Fără `acte`, tabelul actelor se extrage din `df`.
+    """
+    if acte is None:
+        acte = referinte_acte.referinte(df)
+    potrivite = perechi_lungi(df, acte).merge(legaturi_pdf(intrari), on=["dosar", "dpg", "data"])
+    potrivite = potrivite.sort_values(["rand", "ordine"], kind="stable")
+    coloane = []
+    for coloana in ("Pdf_nume", "Pdf_hash"):
+        randuri, liste = uneste_pe_grupuri(potrivite["rand"].to_numpy(), potrivite[coloana])
+        valori = np.full(len(df), "", dtype=object)
+        valori[randuri] = liste
+        coloane.append(valori)
+    return tuple(coloane)
+
+
+# ---------- implementarea anterioară, pentru testul diferențial (tests/test_pdfuri.py) ----------
+
+RE_DPG_DATA = re.compile(r"DPG[: ]+(\d+)[, ]+Dat[ăa][: ]+(\d{4}-\d{2}-\d{2})")
+
+
+# Numărul de dosar din "Dosar PMB"
 def extract_dosar_id(x):
     try:
         return str(x).split("/")[0].strip()
     except:
         return None
 
-# 3. Funcție pentru extragerea tuturor perechilor (DPG, Dată)
+# Toate perechile (DPG, Dată) dintr-un text
 def extract_dpg_date_pairs(text):
     if pd.isna(text):
         return []
-    pattern = r"DPG[: ]+(\d+)[, ]+Dat[ăa][: ]+(\d{4}-\d{2}-\d{2})"
-    return re.findall(pattern, text)
-
-# 4. Creăm temporar câmpurile necesare pentru potrivire
-df["_Dosar_ID"] = df["Dosar PMB"].apply(extract_dosar_id)
-df["_DPG_pairs"] = df.apply(
-    lambda row: extract_dpg_date_pairs(str(row["Soluție"])) +
-                extract_dpg_date_pairs(str(row["Istorie acte"])),
-    axis=1
-)
-
-# 5. Inițializăm coloana finală cu PDF-uri
-df["Pdf_nume"] = ""
-
-# 6. Parcurgem PDF-urile și facem potrivirea
-pdf_folder = "pdfs"
-
-for fname in os.listdir(pdf_folder):
-    if not fname.endswith(".pdf"):
-        continue
-
-    try:
-        dosar, dpg, data_ext = fname.split("_")
-        data_pdf = data_ext.replace(".pdf", "")
-    except:
-        continue
-
-    # Găsim liniile corespunzătoare aceluiași dosar
-    subset = df[df["_Dosar_ID"] == dosar]
-
-    for idx, row in subset.iterrows():
-        if (dpg, data_pdf) in row["_DPG_pairs"]:
-            if df.at[idx, "Pdf_nume"] == "":
-                df.at[idx, "Pdf_nume"] = fname
-            else:
-                df.at[idx, "Pdf_nume"] += ";" + fname
-
-# 🟢 7. Adăugăm coloana Pdf_valid după regula corectă:
+    return RE_DPG_DATA.findall(text)
+
+
+def potriveste_pdfuri_original(df, intrari):
+    """Bucla originală: pentru fiecare act, scanarea dosarului în tot tabelul + iterrows."""
+    df = df.reset_index(drop=True)
+    df["_Dosar_ID"] = df["Dosar PMB"].apply(extract_dosar_id)
+    df["_DPG_pairs"] = df.apply(
+        lambda row: extract_dpg_date_pairs(str(row["Soluție"])) +
+                    extract_dpg_date_pairs(str(row["Istorie acte"])),
+        axis=1
+    )
+    df["Pdf_nume"] = ""
+    df["Pdf_hash"] = ""
+
+    hash_uri = {}
+    for dosar, dpg, data_pdf, h, *_ in intrari:
+        hash_uri.setdefault((dosar, dpg, data_pdf), []).append(h)
+
+    for (dosar, dpg, data_pdf), hs in hash_uri.items():
+        fname = f"{dosar}_{dpg}_{data_pdf}.pdf"
+
+        # Găsim liniile corespunzătoare aceluiași dosar
+        subset = df[df["_Dosar_ID"] == dosar]
+
+        for idx, row in subset.iterrows():
+            if (dpg, data_pdf) in row["_DPG_pairs"]:
+                if df.at[idx, "Pdf_nume"] == "":
+                    df.at[idx, "Pdf_nume"] = fname
+                    df.at[idx, "Pdf_hash"] = ";".join(hs)
+                else:
+                    df.at[idx, "Pdf_nume"] += ";" + fname
+                    df.at[idx, "Pdf_hash"] += ";" + ";".join(hs)
+    return df["Pdf_nume"].to_numpy(), df["Pdf_hash"].to_numpy()
+
+
+# 🟢 Coloana Pdf_valid după regula corectă:
 #    - dacă Pdf_nume e gol → False
 #    - altfel, dacă există cel puțin un pdf al cărui număr de dosar (primul număr din numele fișierului) <= 17033 → True
 #    - altfel → False
-
-CUTOFF_DOSAR = 17033
-
+# Numele din Pdf_nume nu mai sunt fișiere de pe disc (PDF-urile stau în depozit
+# sub hash), ci nume construite `{dosar}_{dpg}_{data}.pdf` din legătura
+# dosar -> act, unul pentru fiecare dosar care citează actul; "dosarul" verificat
+# față de CUTOFF_DOSAR e deci dosarul legat în index, ca în numele fișierelor vechi.
 def check_valid(pdf_cell):
     if not isinstance(pdf_cell, str) or pdf_cell.strip() == "":
         return False
@@ -74,13 +156,34 @@ def check_valid(pdf_cell):
             return True
     return False
 
-df["Pdf_valid"] = df["Pdf_nume"].apply(check_valid)
-
-
-# 8. Ștergem coloanele temporare
-df = df.drop(columns=["_Dosar_ID", "_DPG_pairs"])
-
-# 9. Salvăm CSV-ul final
-df.to_csv("dosare_geocode_cu_pdfuri.csv", index=False)
 
-print("Gata!")
+if __name__ == "__main__":
+    # 1. Citește tabelul
+    df = tabel.citeste(TABEL_PATH)
+
+    # 2. Legăturile dosar -> act -> PDF din indexul depozitului. Fiecare dosar
+    #    care citează un act are propria intrare, chiar dacă PDF-ul e
+    #    descărcat o singură dată; Pdf_nume păstrează forma `{dosar}_{dpg}_{data}.pdf`.
+    #    Un depozit lipsă sau gol ar lăsa toate rândurile fără PDF fără nicio
+    #    eroare: se importă întâi PDF-urile vechi, dacă există, altfel ne oprim.
+    if not os.path.exists(os.path.join(DEPOZIT_DIR, INDEX_FILE)) and os.path.isdir(PDF_DIR_VECHI):
+        n = importa_folder(PDF_DIR_VECHI, DEPOZIT_DIR)
+        print(f"📥 Depozitul {DEPOZIT_DIR} lipsea: importate {n} PDF-uri din {PDF_DIR_VECHI}")
+    if not os.path.exists(os.path.join(DEPOZIT_DIR, INDEX_FILE)):
+        sys.exit(f"❌ Depozitul {DEPOZIT_DIR} nu există (nici {PDF_DIR_VECHI}/ de importat): "
+                 f"rulează întâi acte_interne.py sau depozit_pdf.py")
+    with DepozitPdf(DEPOZIT_DIR) as depozit:
+        intrari = depozit.intrari()
+    if not intrari:
+        sys.exit(f"❌ Depozitul {DEPOZIT_DIR} nu are nicio legătură dosar -> act: "
+                 f"rulează întâi acte_interne.py sau depozit_pdf.py {PDF_DIR_VECHI} {DEPOZIT_DIR}")
+    print(f"📄 {len(intrari)} legături dosar -> PDF din {DEPOZIT_DIR}")
+
+    # 3. Potrivirea cu rândurile tabelului (prin actele citate de fiecare dosar) și Pdf_valid
+    df["Pdf_nume"], df["Pdf_hash"] = potriveste_pdfuri(df, intrari, referinte_acte.incarca())
+    df["Pdf_valid"] = df["Pdf_nume"].apply(check_valid)
+
+    # 4. Salvăm tabelul final
+    tabel.scrie(df, OUTPUT_PATH)
+
+    print("Gata!")
@@ -0,0 +1,455 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import pathlib
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import tabel
+from jurnal import JurnalEvenimente, JURNAL_DB, OK, FAILED
+
+# Rularea etapelor pipeline-ului (date.py -> co.py -> solutie.py -> ...) ca
+# un graf de dependențe, în locul rulării de mână, în ordine fixă. Fiecare
+# etapă își declară intrările și ieșirile (fișiere sau directoare); o etapă
+# depinde de etapele care îi produc intrările.
+#
+# Amprenta unei etape = conținutul scriptului și al modulelor locale pe care
+# le importă (tabel.py, clasificare_solutii.py, ...) + amprentele intrărilor
+# + declarația etapei. O etapă cu aceeași amprentă ca la ultima rulare
+# reușită, și cu ieșirile la locul lor, se sare. Hash-urile fișierelor se țin
+# în pipeline.sqlite după (cale, mărime, mtime), deci un fișier neatins nu se
+# recitește; un director se amprentează după lista (cale, mărime, mtime).
+# Decizia se ia abia când etapele din amonte s-au terminat: dacă o etapă
+# rerulată produce exact aceeași ieșire, cele din aval se sar și ele.
+#
+# Etapele independente (ex. descărcarea PDF-urilor și geocodarea) rulează în
+# paralel, ca procese separate, cu ieșirea în pipeline_jurnale/<etapa>.log.
+# Duratele se afișează la final și se scriu în jurnalul de evenimente
+# (etapa "pipeline").
+#
+#   python pipeline.py                  -> tot graful
+#   python pipeline.py pdfuri           -> pdfuri + ce e în amonte de el
+#   python pipeline.py --plan           -> ce s-ar rula și de ce, fără a rula
+#   python pipeline.py --fara acte_interne --forteaza grupare_sol
+
+# ---------------- CONFIG ----------------
+STARE_DB = "pipeline.sqlite"
+JURNALE_DIR = "pipeline_jurnale"
+PARALELE = 4        # câte etape rulează simultan
+ETAPA_JURNAL = "pipeline"
+# ----------------------------------------
+
+AICI = os.path.dirname(os.path.abspath(__file__))
+RENDERE = os.path.join("..", "date_numerice", "code")
+HARTA = os.path.join(RENDERE, "RO-B-294fb6d7-20251108-en-gpkg", "data", "boundary-polygon.gpkg")
+
+# căi relative la directorul pipeline-ului (code/); `director` = directorul
+# de lucru al scriptului, pentru căile relative din el.
+# `resetare`: fișiere din care scriptul reia o rulare întreruptă; se șterg
+# când etapa se rerulează pentru că i s-au schimbat intrările sau codul.
+# `alternative`: intrări dintre care ajunge să existe una (ex. arhiva sau
+# directorul de răspunsuri); toate celelalte intrări sunt obligatorii
+Etapa = namedtuple("Etapa", "nume script intrari iesiri director resetare alternative", defaults=(".", (), ()))
+
+ETAPE = [
+    Etapa("date", "date.py", ["responses_arhiva", "responses"], [tabel.cale("dosare")],
+          alternative=("responses_arhiva", "responses")),
+    Etapa("referinte_acte", "referinte_acte.py", [tabel.cale("dosare")], [tabel.cale("acte")]),
+    Etapa("acte_interne", "acte_interne.py", [tabel.cale("dosare"), tabel.cale("acte")], ["pdfs_depozit"]),
+    Etapa("co", "co.py", [tabel.cale("dosare"), "nomenclator.pickle"],
+          ["dosare_geocode.csv", tabel.cale("dosare_geocode"), "negasite.txt"],
+          resetare=("dosare_geocode.csv", "negasite.txt")),
+    Etapa("co2", "co2.py", ["negasite.txt"], ["negasite_clean.txt"]),
+    Etapa("solutie", "solutie.py", [tabel.cale("dosare_geocode")], [tabel.cale("dosare_geocode_cu_solutie")]),
+    Etapa("grupare_sol", "grupare_sol.py", [tabel.cale("dosare_geocode_cu_solutie")],
+          [tabel.cale("dosare_geocode_grupate_regex")]),
+    Etapa("pdfuri", "pdfuri.py", [tabel.cale("dosare_geocode_grupate_regex"), tabel.cale("acte"), "pdfs_depozit"],
+          [tabel.cale("dosare_geocode_cu_pdfuri")]),
+    # corecțiile se scriu în tabelul primit (intrare și ieșire în același timp)
+    Etapa("adaugare_coordonate", "adaugare_coordonate.py",
+          [tabel.cale("dosare_geocode_cu_pdfuri"), "negasite_clean.txt"],
+          [tabel.cale("dosare_geocode_cu_pdfuri"), "negasite2.txt"]),
+    # rendererele citesc dosare_pmb / pdfuri_restituire_deposedare, pregătite în afara scripturilor de mai sus
+    Etapa("harta_ani", os.path.join(RENDERE, "distribution_year.py"),
+          [os.path.join(RENDERE, tabel.cale("dosare_pmb")), HARTA],
+          [os.path.join(RENDERE, "spatial_distribution_by_year.html")], RENDERE),
+    Etapa("harta_radiala", os.path.join(RENDERE, "radial_distribution.py"),
+          [os.path.join(RENDERE, tabel.cale("dosare_pmb")), HARTA],
+          [os.path.join(RENDERE, "radial_distribution.html")], RENDERE),
+    Etapa("evolutie_solutii", os.path.join(RENDERE, "temporal_evolution.py"),
+          [os.path.join(RENDERE, tabel.cale("dosare_pmb")), HARTA],
+          [os.path.join(RENDERE, "solutions_temporal_evolution.html")], RENDERE),
+    Etapa("harta_legi", os.path.join(RENDERE, "legi_distribution_year.py"),
+          [os.path.join("..", tabel.cale("pdfuri_restituire_deposedare")), HARTA],
+          [os.path.join("..", "docs", "spatial_distribution_legislation.html")], RENDERE),
+    Etapa("evolutie_legi", os.path.join(RENDERE, "legi_temporal_evolution.py"),
+          [os.path.join("..", tabel.cale("pdfuri_restituire_deposedare")), HARTA],
+          [os.path.join("..", "docs", "legislation_temporal_evolution.html")], RENDERE),
+]
+
+RULATA = "rulată"
+SARITA = "neschimbată"
+ESUATA = "eșuată"
+BLOCATA = "blocată"
+# rezultatul scris în jurnalul de evenimente pentru fiecare stare
+REZULTATE_JURNAL = {RULATA: OK, SARITA: "sarita", ESUATA: FAILED, BLOCATA: "blocata"}
+
+
+class StarePipeline:
+    """Amprentele ultimelor rulări reușite și hash-urile fișierelor, în SQLite.
+
+    Cu `doar_citire` (--plan), baza nu se creează și nu se scrie: o bază
+    lipsă înseamnă "nicio rulare", iar hash-urile noi rămân doar în memorie.
+    """
+
+    def __init__(self, path=STARE_DB, doar_citire=False):
+        self.lock = threading.Lock()
+        self.doar_citire = doar_citire
+        self.hash_uri = {}  # cale -> (marime, mtime_ns, hash), în modul doar_citire
+        if not doar_citire:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+        elif os.path.exists(path):
+            self.conn = sqlite3.connect(pathlib.Path(path).absolute().as_uri() + "?mode=ro", uri=True,
+                                        check_same_thread=False)
+            return
+        else:
+            self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS etape (
+                nume TEXT PRIMARY KEY,
+                amprenta TEXT NOT NULL,
+                componente TEXT NOT NULL,
+                durata REAL,
+                terminat REAL
+            )"""
+        )
+        self.conn.execute(
+            """CREATE TABLE IF NOT EXISTS fisiere (
+                cale TEXT PRIMARY KEY,
+                marime INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                hash TEXT NOT NULL
+            )"""
+        )
+        self.conn.commit()
+
+    def hash_fisier(self, cale):
+        """sha256 al conținutului; recalculat doar dacă mărimea sau mtime-ul s-au schimbat."""
+        st = os.stat(cale)
+        with self.lock:
+            rand = self.hash_uri.get(cale) or self.conn.execute(
+                "SELECT marime, mtime_ns, hash FROM fisiere WHERE cale = ?", (cale,)).fetchone()
+        if rand and tuple(rand[:2]) == (st.st_size, st.st_mtime_ns):
+            return rand[2]
+        h = hashlib.sha256()
+        with open(cale, "rb") as f:
+            for bucata in iter(lambda: f.read(1 << 20), b""):
+                h.update(bucata)
+        with self.lock:
+            if self.doar_citire:
+                self.hash_uri[cale] = (st.st_size, st.st_mtime_ns, h.hexdigest())
+                return h.hexdigest()
+            self.conn.execute("INSERT OR REPLACE INTO fisiere VALUES (?, ?, ?, ?)",
+                              (cale, st.st_size, st.st_mtime_ns, h.hexdigest()))
+            self.conn.commit()
+        return h.hexdigest()
+
+    def ultima(self, nume):
+        """(amprenta, componente, durata) a ultimei rulări reușite, sau None."""
+        with self.lock:
+            rand = self.conn.execute("SELECT amprenta, componente, durata FROM etape WHERE nume = ?",
+                                     (nume,)).fetchone()
+        return (rand[0], json.loads(rand[1]), rand[2]) if rand else None
+
+    def salveaza(self, nume, amprenta, componente, durata):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO etape VALUES (?, ?, ?, ?, ?)",
+                              (nume, amprenta, json.dumps(componente, sort_keys=True), durata, time.time()))
+            self.conn.commit()
+
+    def uita(self, nume):
+        """După un eșec: ieșirile pot fi parțiale, deci etapa nu mai are voie să fie sărită."""
+        with self.lock:
+            self.conn.execute("DELETE FROM etape WHERE nume = ?", (nume,))
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def module_locale(script, directoare):
+    """Scriptul + modulele importate de el (recursiv) care sunt fișiere .py din `directoare`."""
+    gasite, de_vazut = [], [script]
+    while de_vazut:
+        cale = de_vazut.pop()
+        if cale in gasite:
+            continue
+        gasite.append(cale)
+        with open(cale, encoding="utf-8") as f:
+            arbore = ast.parse(f.read(), cale)
+        nume = set()
+        for nod in ast.walk(arbore):
+            if isinstance(nod, ast.Import):
+                nume.update(a.name.split(".")[0] for a in nod.names)
+            elif isinstance(nod, ast.ImportFrom) and nod.module and not nod.level:
+                nume.add(nod.module.split(".")[0])
+        for n in nume:
+            for d in [os.path.dirname(cale), *directoare]:
+                candidat = os.path.normpath(os.path.join(d, n + ".py"))
+                if os.path.isfile(candidat):
+                    de_vazut.append(candidat)
+                    break
+    return sorted(gasite)
+
+
+def amprenta_cale(cale, stare):
+    """Hash-ul unui fișier, un rezumat al listei unui director, sau "lipsă"."""
+    if os.path.isfile(cale):
+        return stare.hash_fisier(cale)
+    if not os.path.isdir(cale):
+        return "lipsă"
+    h = hashlib.sha256()
+    for director, subdirectoare, fisiere in os.walk(cale):
+        subdirectoare.sort()
+        for nume in sorted(fisiere):
+            st = os.stat(os.path.join(director, nume))
+            h.update(f"{os.path.relpath(os.path.join(director, nume), cale)}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return "dir:" + h.hexdigest()
+
+
+def amprenta(etapa, radacina, stare):
+    """(amprenta, componente): componente = {"cod:<fișier>" / "in:<cale>" / "etapa": hash}."""
+    declaratie = etapa._replace(resetare=list(etapa.resetare), alternative=list(etapa.alternative))
+    if not etapa.alternative:
+        declaratie = declaratie[:-1]  # amprenta etapelor fără alternative rămâne cea de dinaintea câmpului
+    componente = {"etapa": json.dumps(declaratie, ensure_ascii=False)}
+    for cale in module_locale(os.path.normpath(os.path.join(radacina, etapa.script)), [radacina]):
+        componente["cod:" + os.path.relpath(cale, radacina)] = stare.hash_fisier(cale)
+    for intrare in etapa.intrari:
+        componente["in:" + intrare] = amprenta_cale(os.path.join(radacina, intrare), stare)
+    text = json.dumps(componente, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest(), componente
+
+
+def motiv(componente, anterioare):
+    """De ce s-a schimbat amprenta, pe scurt."""
+    if anterioare is None:
+        return "nicio rulare reușită înregistrată"
+    schimbate = sorted(k for k in componente.keys() | anterioare.keys()
+                       if componente.get(k) != anterioare.get(k))
+    cod = [k[4:] for k in schimbate if k.startswith("cod:")]
+    intrari = [k[3:] for k in schimbate if k.startswith("in:")]
+    parti = ([f"cod: {', '.join(cod)}"] if cod else []) + ([f"intrări: {', '.join(intrari)}"] if intrari else [])
+    return "; ".join(parti) or "declarația etapei"
+
+
+def dependinte(etape):
+    """nume -> mulțimea etapelor care îi produc intrările (fără ea însăși); ValueError la cicluri."""
+    producatori = {}
+    for e in etape:
+        for iesire in e.iesiri:
+            producatori.setdefault(os.path.normpath(iesire), set()).add(e.nume)
+    dep = {e.nume: set().union(*(producatori.get(os.path.normpath(i), set()) for i in e.intrari)) - {e.nume}
+           for e in etape}
+    ramase = {n: set(d) for n, d in dep.items()}
+    while ramase:
+        gata = [n for n, d in ramase.items() if not d]
+        if not gata:
+            raise ValueError(f"ciclu între etapele: {', '.join(sorted(ramase))}")
+        for n in gata:
+            del ramase[n]
+        for d in ramase.values():
+            d.difference_update(gata)
+    return dep
+
+
+def selecteaza(etape, tinte=None, fara=()):
+    """Etapele `tinte` și tot ce e în amonte de ele, fără cele din `fara` (ale căror ieșiri rămân ca atare)."""
+    etape = [e for e in etape if e.nume not in set(fara)]
+    if not tinte:
+        return etape
+    necunoscute = set(tinte) - {e.nume for e in etape}
+    if necunoscute:
+        raise ValueError(f"etape necunoscute sau excluse: {', '.join(sorted(necunoscute))}")
+    dep = dependinte(etape)
+    alese, de_vazut = set(), list(tinte)
+    while de_vazut:
+        n = de_vazut.pop()
+        if n not in alese:
+            alese.add(n)
+            de_vazut.extend(dep[n])
+    return [e for e in etape if e.nume in alese]
+
+
+def _ruleaza_script(etapa, radacina, jurnale):
+    """(cod de ieșire, început, sfârșit, log); momentele sunt time.perf_counter()."""
+    os.makedirs(jurnale, exist_ok=True)
+    log = os.path.join(jurnale, etapa.nume + ".log")
+    env = dict(os.environ, PYTHONUNBUFFERED="1")
+    t0 = time.perf_counter()
+    with open(log, "w", encoding="utf-8") as f:
+        cod = subprocess.run([sys.executable, os.path.abspath(os.path.join(radacina, etapa.script))],
+                             cwd=os.path.join(radacina, etapa.director), stdout=f, stderr=subprocess.STDOUT,
+                             env=env).returncode
+    return cod, t0, time.perf_counter(), log
+
+
+def ruleaza(etape, radacina=AICI, stare=None, forteaza=(), paralele=PARALELE, plan=False,
+            jurnal=None, jurnale=None, afiseaza=print, momente=None):
+    """Rulează graful; întoarce nume -> (stare, durată în secunde sau None).
+
+    `forteaza`: etape rulate oricum (True = toate). Cu `plan`, nu rulează
+    nimic: o etapă schimbată și tot ce e în aval apar ca "de rulat".
+    `momente`, dacă e dat (dict), primește nume -> (început, sfârșit) pentru
+    fiecare script pornit (time.perf_counter()).
+    """
+    dep = dependinte(etape)
+    dupa_nume = {e.nume: e for e in etape}
+    jurnale = jurnale or os.path.join(radacina, JURNALE_DIR)
+    produse = {os.path.normpath(i) for e in etape for i in e.iesiri}
+    rezultate = {}
+
+    def decide(etapa):
+        """(de rulat?, amprenta, componente, motiv, durata anterioară)."""
+        ampr, componente = amprenta(etapa, radacina, stare)
+        anterioara = stare.ultima(etapa.nume)
+        if forteaza is True or etapa.nume in forteaza:
+            return True, ampr, componente, "forțată", None
+        iesiri_lipsa = [i for i in etapa.iesiri if not os.path.exists(os.path.join(radacina, i))]
+        if anterioara and anterioara[0] == ampr and not iesiri_lipsa:
+            return False, ampr, componente, "", anterioara[2]
+        if anterioara and anterioara[0] == ampr:
+            return True, ampr, componente, f"lipsesc ieșirile: {', '.join(iesiri_lipsa)}", None
+        return True, ampr, componente, motiv(componente, anterioara and anterioara[1]), None
+
+    if plan:
+        de_rulat = set()
+        for nume in _ordine(etape, dep):
+            etapa = dupa_nume[nume]
+            amonte = sorted(dep[nume] & de_rulat)
+            ruleaza_etapa, _, _, cauza, durata = decide(etapa)
+            if ruleaza_etapa or amonte:
+                de_rulat.add(nume)
+                afiseaza(f"▶️  {nume}: de rulat ({cauza or 'după ' + ', '.join(amonte)})")
+            else:
+                afiseaza(f"⏭️  {nume}: {SARITA}" + (f" (ultima rulare {durata:.1f} s)" if durata else ""))
+        return {n: ("de rulat" if n in de_rulat else SARITA, None) for n in dupa_nume}
+
+    def executa(etapa):
+        lipsa = [i for i in etapa.intrari if os.path.normpath(i) not in produse
+                 and not os.path.exists(os.path.join(radacina, i))]
+        obligatorii = [i for i in lipsa if i not in etapa.alternative]
+        if etapa.alternative and all(i in lipsa for i in etapa.alternative):
+            obligatorii.append(" / ".join(etapa.alternative))
+        if obligatorii:
+            afiseaza(f"❌ {etapa.nume}: lipsesc intrările {', '.join(obligatorii)}")
+            return ESUATA, None
+        ruleaza_etapa, ampr, componente, cauza, durata = decide(etapa)
+        if not ruleaza_etapa:
+            afiseaza(f"⏭️  {etapa.nume}: {SARITA}")
+            return SARITA, durata
+        if stare.ultima(etapa.nume) is not None:
+            for fisier in etapa.resetare:
+                cale = os.path.join(radacina, fisier)
+                if os.path.exists(cale):
+                    os.remove(cale)
+        afiseaza(f"▶️  {etapa.nume}: {cauza}")
+        cod, inceput, sfarsit, log = _ruleaza_script(etapa, radacina, jurnale)
+        durata = sfarsit - inceput
+        if momente is not None:
+            momente[etapa.nume] = (inceput, sfarsit)
+        lipsa = [i for i in etapa.iesiri if not os.path.exists(os.path.join(radacina, i))]
+        if cod != 0 or lipsa:
+            stare.uita(etapa.nume)
+            cauza = f"cod {cod}" if cod != 0 else f"nu a produs {', '.join(lipsa)}"
+            afiseaza(f"❌ {etapa.nume}: {ESUATA} după {durata:.1f} s ({cauza}), vezi {log}")
+            return ESUATA, durata
+        # amprenta de după rulare: o etapă care își modifică propria intrare nu se rerulează data viitoare
+        ampr, componente = amprenta(etapa, radacina, stare)
+        stare.salveaza(etapa.nume, ampr, componente, durata)
+        afiseaza(f"✅ {etapa.nume}: {durata:.1f} s")
+        return RULATA, durata
+
+    in_curs = {}
+    with ThreadPoolExecutor(max_workers=max(1, paralele)) as executor:
+        while len(rezultate) < len(etape):
+            for nume in _ordine(etape, dep):
+                if nume in rezultate or nume in in_curs.values() or not dep[nume] <= rezultate.keys():
+                    continue
+                esuate = sorted(d for d in dep[nume] if rezultate[d][0] in (ESUATA, BLOCATA))
+                if esuate:
+                    afiseaza(f"⛔ {nume}: {BLOCATA} ({', '.join(esuate)} {ESUATA})")
+                    rezultate[nume] = (BLOCATA, None)
+                    continue
+                in_curs[executor.submit(executa, dupa_nume[nume])] = nume
+            if not in_curs:
+                continue
+            terminate, _ = wait(in_curs, return_when=FIRST_COMPLETED)
+            for viitor in terminate:
+                nume = in_curs.pop(viitor)
+                rezultate[nume] = viitor.result()
+                if jurnal is not None:
+                    stare_etapa, durata = rezultate[nume]
+                    jurnal.scrie(ETAPA_JURNAL, REZULTATE_JURNAL[stare_etapa], cheie=nume, latenta=durata)
+    return rezultate
+
+
+def _ordine(etape, dep):
+    """Numele etapelor în ordine topologică, stabilă față de ordinea declarării."""
+    ordine, ramase = [], [e.nume for e in etape]
+    while ramase:
+        gata = [n for n in ramase if dep[n] <= set(ordine)]
+        ordine.extend(gata)
+        ramase = [n for n in ramase if n not in gata]
+    return ordine
+
+
+def raport(rezultate, durata_totala, afiseaza=print):
+    """Tabelul duratelor pe etape."""
+    latime = max(len("etapa"), *map(len, rezultate))
+    afiseaza(f"\n⏱️  {'etapa':<{latime}}  {'stare':<12} {'durată':>9}")
+    for nume, (stare_etapa, durata) in rezultate.items():
+        text = "" if durata is None else f"{durata:8.1f}s"
+        if stare_etapa == SARITA and durata is not None:
+            text = f"({durata:.1f}s)"
+        afiseaza(f"   {nume:<{latime}}  {stare_etapa:<12} {text:>9}")
+    rulat = sum(d for s, d in rezultate.values() if s in (RULATA, ESUATA) and d)
+    afiseaza(f"   total {durata_totala:.1f} s ({rulat:.1f} s de rulare însumate)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rulează etapele pipeline-ului care s-au schimbat.")
+    parser.add_argument("tinte", nargs="*", help="etapele dorite (implicit: toate); se rulează și cele din amonte")
+    parser.add_argument("--fara", nargs="+", default=[], metavar="ETAPA",
+                        help="etape excluse; ieșirile lor existente se folosesc ca atare")
+    parser.add_argument("--forteaza", nargs="*", metavar="ETAPA",
+                        help="rulează etapele date chiar dacă nu s-au schimbat (fără nume: toate)")
+    parser.add_argument("--plan", action="store_true", help="arată ce s-ar rula, fără a rula")
+    parser.add_argument("--paralele", type=int, default=PARALELE)
+    args = parser.parse_args()
+
+    etape = selecteaza(ETAPE, args.tinte, args.fara)
+    forteaza = True if args.forteaza == [] else set(args.forteaza or ())
+    t0 = time.perf_counter()
+    with StarePipeline(os.path.join(AICI, STARE_DB), doar_citire=args.plan) as stare:
+        if args.plan:
+            rezultate = ruleaza(etape, stare=stare, forteaza=forteaza, plan=True)
+        else:
+            with JurnalEvenimente(os.path.join(AICI, JURNAL_DB)) as jurnal:
+                rezultate = ruleaza(etape, stare=stare, forteaza=forteaza, paralele=args.paralele, jurnal=jurnal)
+            raport(rezultate, time.perf_counter() - t0)
+    sys.exit(1 if any(s in (ESUATA, BLOCATA) for s, _ in rezultate.values()) else 0)
@@ -0,0 +1,212 @@
+import hashlib
+import os
+import re
+import sys
+from datetime import date, datetime
+from functools import lru_cache
+
+import pandas as pd
+
+import tabel
+
+# Referințele la acte (DPG, dată) din coloanele "Soluție" și "Istorie acte",
+# extrase o singură dată într-un tabel lung persistat (acte.parquet), citit
+# de acte_interne.py (joburile de descărcare), pdfuri.py (potrivirea PDF ->
+# rânduri) și rf.ipynb (DPG-ul soluției), în loc ca fiecare să-și ruleze
+# propriile expresii regulate. O linie pe act citat:
+#   Dosar PMB, dosar (numărul), sursa (coloana), pozitie (a câta referință
+#   din coloană, de la 0), dpg, tip (textul de după dată, ex. soluția),
+#   data_raw, data (ISO), an
+# Tabelul are o linie per dosar, nu per rând: rândurile aceluiași dosar (câte
+# unul pe adresă) au aceeași soluție și istorie. Se reconstruiește automat
+# (`incarca`) când tabelul sursă e mai nou sau când s-a schimbat extragerea:
+# lângă tabel stă amprenta lui (VERSIUNE, codul acestui modul, sursa), în
+# `{tabel}.amprenta`. O altă sursă decât TABEL_SURSA (ex. pmb_dosare2.csv
+# din rf.ipynb) are propriul tabel, `{sursa}_acte.parquet`, lângă ea. La cerere:
+#   python referinte_acte.py [tabel_sursa]
+
+TABEL_SURSA = tabel.cale("dosare")
+TABEL_ACTE = tabel.cale("acte")
+VERSIUNE = 1  # se crește la orice schimbare a coloanelor sau a semnificației lor
+SURSE = ("Soluție", "Istorie acte")
+
+# modelul din acte_interne.extract_all_dpgs, plus tipul actului: restul
+# segmentului după dată (până la ";" sau următorul DPG), într-un lookahead,
+# deci potrivirile rămân exact cele de până acum
+RE_ACT = re.compile(
+    r"DPG[:\s]*([0-9]+)(?:[^;\n\r]*?Dat[ăa][:]?\s*"
+    r"([0-9]{4}-[0-9]{2}-[0-9]{2}|[0-9]{2}/[0-9]{2}/[0-9]{4}|[0-9]{4}/[0-9]{2}/[0-9]{2}|[0-9]{2}-[0-9]{2}-[0-9]{4})"
+    r"(?=[\s,.:-]*((?:(?!DPG)[^;\n\r])*)))?",
+    flags=re.IGNORECASE,
+)
+COLOANE = ["Dosar PMB", "dosar", "sursa", "pozitie", "dpg", "tip", "data_raw", "data", "an"]
+
+
+def parse_year_from_iso(iso_date: str):
+    if not iso_date:
+        return None
+    try:
+        return datetime.fromisoformat(iso_date).year
+    except Exception:
+        return None
+
+
+def extract_dosar_number(dosar_text: str) -> str:
+    if not dosar_text:
+        return "DOSAR_UNKNOWN"
+    m = re.match(r"^\s*(\d+)", str(dosar_text))
+    if m:
+        return m.group(1)
+    cleaned = re.split(r"[\/\s]", str(dosar_text).strip())[0]
+    cleaned = re.sub(r"[^\w\-\.]", "_", cleaned)
+    return cleaned or "DOSAR_UNKNOWN"
+
+
+@lru_cache(maxsize=None)
+def data_iso(data_raw):
+    """(data ISO, an) pentru o dată prinsă de RE_ACT; memoizat pe șirul brut.
+
+    Aceleași rezultate ca normalize_date + parse_year_from_iso, fără cele
+    patru strptime cu excepții: forma e deja știută din model. O dată
+    imposibilă în forma ISO rămâne ca atare, fără an; în celelalte forme, None.
+    """
+    if data_raw[4] in "-/":
+        an, luna, zi = data_raw[:4], data_raw[5:7], data_raw[8:10]
+    else:
+        zi, luna, an = data_raw[:2], data_raw[3:5], data_raw[6:10]
+    try:
+        d = date(int(an), int(luna), int(zi))
+    except ValueError:
+        return (data_raw, None) if data_raw[4] == "-" else (None, None)
+    return d.isoformat(), d.year
+
+
+def referinte_text(text):
+    """(dpg, tip, data_raw, data, an) pentru fiecare referință din `text`, în ordine."""
+    if not text or str(text).strip().upper() == "NONE":
+        return []
+    rezultat = []
+    for m in RE_ACT.finditer(str(text)):
+        dpg, data_raw, tip = m.groups()
+        iso, an = data_iso(data_raw) if data_raw else (None, None)
+        tip = (tip.strip(" ,.") or None) if tip else None
+        rezultat.append((dpg, tip, data_raw, iso, an))
+    return rezultat
+
+
+def referinte(df):
+    """Tabelul lung al actelor citate în `df` (coloanele "Dosar PMB", "Soluție", "Istorie acte").
+
+    Ordinea liniilor: ordinea dosarelor în `df`, apoi SURSE, apoi poziția.
+    """
+    linii = []
+    unice = df[["Dosar PMB", *SURSE]].fillna("").drop_duplicates()
+    for dosar_pmb, *texte in unice.itertuples(index=False):
+        dosar = extract_dosar_number(dosar_pmb)
+        for sursa, text in zip(SURSE, texte):
+            for pozitie, (dpg, tip, data_raw, data, an) in enumerate(referinte_text(text)):
+                linii.append((dosar_pmb, dosar, sursa, pozitie, dpg, tip, data_raw, data, an))
+    acte = pd.DataFrame(linii, columns=COLOANE)
+    acte["an"] = acte["an"].astype("Int64")
+    return acte
+
+
+def cale_acte(sursa):
+    """Unde stă tabelul actelor extras din `sursa`."""
+    if sursa == TABEL_SURSA:
+        return TABEL_ACTE
+    return f"{os.path.splitext(sursa)[0]}_acte.{tabel.FORMAT}"
+
+
+def amprenta(sursa):
+    """VERSIUNE + hash-ul codului acestui modul + sursa: un tabel extras altfel nu se refolosește."""
+    h = hashlib.sha256(f"{VERSIUNE}|{os.path.abspath(sursa)}|".encode())
+    with open(__file__, "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _citeste_amprenta(destinatie):
+    try:
+        with open(destinatie + ".amprenta", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def construieste(sursa=TABEL_SURSA, destinatie=None):
+    """Extrage actele din tabelul `sursa` și le salvează în `destinatie` (implicit cale_acte(sursa))."""
+    destinatie = destinatie or cale_acte(sursa)
+    df = tabel.citeste(sursa, columns=["Dosar PMB", *SURSE], categorii=False)
+    acte = referinte(df)
+    tabel.scrie(acte, destinatie)
+    with open(destinatie + ".amprenta", "w", encoding="utf-8") as f:
+        f.write(amprenta(sursa) + "\n")
+    return acte
+
+
+def incarca(sursa=TABEL_SURSA, destinatie=None):
+    """Tabelul actelor, reconstruit dacă lipsește, e mai vechi decât `sursa` sau are altă amprentă."""
+    destinatie = destinatie or cale_acte(sursa)
+    if (os.path.exists(destinatie) and _citeste_amprenta(destinatie) == amprenta(sursa)
+            and (not os.path.exists(sursa) or os.path.getmtime(destinatie) >= os.path.getmtime(sursa))):
+        return tabel.citeste(destinatie, categorii=False)
+    return construieste(sursa, destinatie)
+
+
+# ---------- implementarea anterioară, pentru testul diferențial (tests/test_referinte_acte.py) ----------
+
+def normalize_date(date_str: str):
+    if not date_str:
+        return None
+    s = date_str.strip()
+    formats = ("%Y-%m-%d", "%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y")
+    for fmt in formats:
+        try:
+            return datetime.strptime(s, fmt).date().isoformat()
+        except Exception:
+            pass
+    m = re.search(r"(\d{4}-\d{2}-\d{2})", s)
+    if m:
+        return m.group(1)
+    m = re.search(r"(\d{2}/\d{2}/\d{4})", s)
+    if m:
+        try:
+            return datetime.strptime(m.group(1), "%d/%m/%Y").date().isoformat()
+        except Exception:
+            pass
+    m = re.search(r"(\d{2}-\d{2}-\d{4})", s)
+    if m:
+        try:
+            return datetime.strptime(m.group(1), "%d-%m-%Y").date().isoformat()
+        except Exception:
+            pass
+    return None
+
+
+def extract_all_dpgs(text: str):
+    if not text or str(text).strip().upper() == "NONE":
+        return []
+    text = str(text)
+    pattern = re.compile(
+        r"DPG[:\s]*([0-9]+)(?:[^;\n\r]*?Dat[ăa][:]?\s*"
+        r"([0-9]{4}-[0-9]{2}-[0-9]{2}|[0-9]{2}/[0-9]{2}/[0-9]{4}|[0-9]{4}/[0-9]{2}/[0-9]{2}|[0-9]{2}-[0-9]{2}-[0-9]{4}))?",
+        flags=re.IGNORECASE,
+    )
+    results = []
+    for m in pattern.finditer(text):
+        dpg = m.group(1)
+        date_raw = m.group(2) if m.group(2) else None
+        date_iso = normalize_date(date_raw) if date_raw else None
+        year = parse_year_from_iso(date_iso) if date_iso else None
+        results.append({"dpg": dpg, "date_raw": date_raw, "date_iso": date_iso, "year": year})
+    return results
+
+
+if __name__ == "__main__":
+    sursa = sys.argv[1] if len(sys.argv) > 1 else TABEL_SURSA
+    acte = construieste(sursa)
+    cu_data = acte["data"].notna().sum()
+    print(f"✅ {len(acte)} referințe la acte ({cu_data} cu dată, {acte['dpg'].nunique()} DPG-uri distincte) "
+          f"din {acte['Dosar PMB'].nunique()} dosare -> {cale_acte(sursa)}")
+    print(f"🗓️  {data_iso.cache_info().currsize} date brute distincte normalizate")
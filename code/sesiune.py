@@ -0,0 +1,121 @@
+import threading
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+INPUT_DOSAR = (By.ID, "numar_dosar")
+
+
+class SesiuneCaptcha:
+    """Sesiune www3.pmb.ro partajată de toate browserele din pool.
+
+    CAPTCHA-ul se rezolvă o singură dată; cookie-urile rezultate sunt copiate
+    în celelalte browsere, care trimit apoi formularul `numar_dosar` de câte
+    ori e nevoie. Omul e chemat din nou doar când formularul nu mai apare,
+    adică sesiunea a fost invalidată de server.
+    """
+
+    def __init__(self, url, timeout_captcha=200, timeout_sesiune=10, reutilizare=True):
+        self.url = url
+        self.timeout_captcha = timeout_captcha
+        self.timeout_sesiune = timeout_sesiune
+        self.reutilizare = reutilizare
+        # păzește cookies / versiune / cautari, citite și scrise din toate
+        # browserele; ținut doar cât se citesc sau se publică, niciodată în
+        # timpul așteptării omului
+        self.lock = threading.Lock()
+        # serializează rezolvările umane: un singur prompt CAPTCHA odată; cine
+        # îl așteaptă nu blochează căutările celorlalte browsere
+        self.lock_rezolvare = threading.Lock()
+        self.cookies = None
+        self.versiune = 0
+        # numărul de căutări făcute cu fiecare rezolvare de CAPTCHA
+        self.cautari = []
+
+    def _formular_vizibil(self, driver, timeout):
+        try:
+            WebDriverWait(driver, timeout).until(EC.visibility_of_element_located(INPUT_DOSAR))
+            return True
+        except TimeoutException:
+            return False
+
+    def _stare(self):
+        with self.lock:
+            return self.cookies, self.versiune
+
+    def _copiaza_cookies(self, driver, cookies):
+        if not driver.current_url.startswith(self.url):
+            driver.get(self.url)
+        driver.delete_all_cookies()
+        for cookie in cookies:
+            cookie = {k: v for k, v in cookie.items() if k != "sameSite"}
+            driver.add_cookie(cookie)
+        driver.get(self.url)
+
+    def asigura_formular(self, driver, versiune):
+        """Lasă `driver` cu formularul de căutare afișat; întoarce versiunea sesiunii.
+
+        `versiune` e versiunea cu care lucra browserul până acum (0 la început).
+        Dacă e tot cea curentă și formularul e încă pe pagină, nu se reîncarcă
+        nimic.
+        """
+        if not self.reutilizare:
+            driver.get(self.url)
+            with self.lock_rezolvare:
+                return self._rezolva_uman(driver, "dosarul următor")
+
+        # cookie-urile și versiunea se citesc împreună, sub lock: alt browser
+        # le poate înlocui sau invalida oricând
+        cookies, curenta = self._stare()
+        if versiune and versiune == curenta and driver.find_elements(*INPUT_DOSAR):
+            return versiune
+
+        if cookies is not None and versiune != curenta:
+            self._copiaza_cookies(driver, cookies)
+        else:
+            driver.get(self.url)
+        if self._formular_vizibil(driver, self.timeout_sesiune):
+            return curenta
+
+        with self.lock_rezolvare:
+            # poate alt browser a rezolvat deja CAPTCHA-ul cât am așteptat
+            cookies, noua = self._stare()
+            if cookies is not None and noua != curenta:
+                self._copiaza_cookies(driver, cookies)
+                if self._formular_vizibil(driver, self.timeout_sesiune):
+                    return noua
+            return self._rezolva_uman(driver, "sesiunea comună")
+
+    def _rezolva_uman(self, driver, pentru):
+        """Așteaptă rezolvarea CAPTCHA-ului în `driver`; apelantul ține `self.lock_rezolvare`."""
+        print(f"\n👉 Deschide CAPTCHA și rezolvă-l pentru {pentru}.")
+        WebDriverWait(driver, self.timeout_captcha).until(
+            EC.visibility_of_element_located(INPUT_DOSAR)
+        )
+        cookies = driver.get_cookies()
+        with self.lock:
+            if self.cautari:
+                print(f"🔑 Sesiunea anterioară a servit {self.cautari[-1]} căutări.")
+            self.cookies = cookies
+            self.versiune += 1
+            self.cautari.append(0)
+            return self.versiune
+
+    def invalideaza(self, versiune):
+        """Marchează sesiunea ca expirată dacă e tot cea cu care lucra apelantul."""
+        with self.lock:
+            if versiune == self.versiune:
+                self.cookies = None
+
+    def inregistreaza_cautare(self):
+        with self.lock:
+            if self.cautari:
+                self.cautari[-1] += 1
+
+    def cautari_per_captcha(self):
+        with self.lock:
+            if not self.cautari:
+                return 0.0
+            return sum(self.cautari) / len(self.cautari)
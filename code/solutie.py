@@ -1,21 +1,15 @@
-import pandas as pd
-import re
+import tabel
+from clasificare_solutii import extrage_solutii
 
-# 1. Încarcă CSV-ul
-df = pd.read_csv("dosare_geocode.csv")
+# 1. Încarcă tabelul
+df = tabel.citeste(tabel.cale("dosare_geocode"))
 
-# 2. Funcție care extrage partea de după ultima virgulă (Soluția)
-def extrage_solutie(text):
-    try:
-        # Ia tot ce vine după ultima virgulă și scoate spațiile
-        return text.split(',')[-1].strip()
-    except:
-        return None
+# 2. Partea de după ultima virgulă din "Soluție" (extrage_solutii, pe toată
+# coloana deodată; vechea funcție rând cu rând e extrage_solutie din
+# clasificare_solutii.py)
+df["Solutie_string"] = extrage_solutii(df["Soluție"])
 
-# 3. Aplicăm funcția pe coloana "Soluție"
-df["Solutie_string"] = df["Soluție"].apply(extrage_solutie)
-
-# 4. Salvăm înapoi CSV-ul (sau alt fișier ca să nu strici originalul)
-df.to_csv("dosare_geocode_cu_solutie.csv", index=False)
+# 3. Salvăm într-un fișier nou (ca să nu stricăm originalul)
+tabel.scrie(df, tabel.cale("dosare_geocode_cu_solutie"))
 
 print("✅ Gata! Am creat coloana 'Solutie_string'.")
@@ -0,0 +1,97 @@
+import os
+
+import pandas as pd
+
+# Format comun pentru tabelul dosarelor între etapele pipeline-ului.
+# Parquet păstrează tipurile coloanelor (nu mai e nevoie de pd.to_numeric după
+# fiecare citire) și permite citirea doar a coloanelor folosite.
+# "csv" păstrează vechiul comportament (fișiere UTF-8 intermediare).
+FORMAT = "parquet"
+
+# Tipurile declarate ale coloanelor; restul rămân text.
+SCHEMA = {
+    "latitude": "float64",
+    "longitude": "float64",
+    "lat": "float64",
+    "lon": "float64",
+    "An_solutie": "Int64",
+    "Solutie_grup": "category",
+    "Tip proprietate": "category",
+    "Lege": "category",
+    "LEGE": "category",
+    "Pdf_valid": "boolean",
+    "Adresa_tip": "category",
+    "Adresa_numar": "string",
+    "Adresa_parcela": "string",
+    "Adresa_sector": "Int64",
+    "an": "Int64",
+    "sursa": "category",
+}
+
+
+def cale(nume, format=None):
+    """`cale("dosare_geocode")` -> "dosare_geocode.parquet" (sau .csv)."""
+    return f"{nume}.{format or FORMAT}"
+
+
+def aplica_schema(df):
+    """Copie a lui `df` cu tipurile din SCHEMA (`df` nu se modifică).
+
+    Valorile care nu se pot converti în număr devin NA; câte sunt, pe coloană,
+    se raportează (un număr mare înseamnă de obicei o coloană stricată în amonte).
+    """
+    copiat = False
+    for col, tip in SCHEMA.items():
+        if col not in df.columns or df[col].dtype == tip:
+            continue
+        if not copiat:
+            df, copiat = df.copy(), True
+        if tip in ("float64", "Int64"):
+            valori = pd.to_numeric(df[col], errors="coerce")
+            pierdute = int((valori.isna() & df[col].notna() & (df[col].astype(str).str.strip() != "")).sum())
+            if pierdute:
+                print(f"⚠️ {col}: {pierdute} valori nenumerice înlocuite cu NA")
+            df[col] = valori.round().astype(tip) if tip == "Int64" else valori.astype(tip)
+        elif tip == "boolean":
+            df[col] = df[col].map({True: True, False: False, "True": True, "False": False}).astype(tip)
+        else:
+            df[col] = df[col].astype(tip)
+    return df
+
+
+def citeste(path, columns=None, categorii=True):
+    """Citește tabelul cu tipurile din SCHEMA; `columns` = doar coloanele cerute.
+
+    Dacă fișierul cerut nu există, dar există varianta în celălalt format
+    (ex. un .csv rămas de la o rulare veche), se citește aceea. Cu
+    `categorii=False`, coloanele categoriale vin ca text simplu (pentru cod
+    care se bazează pe groupby / value_counts fără categorii neobservate).
+    """
+    baza, ext = os.path.splitext(path)
+    if not os.path.exists(path):
+        for alt in (".parquet", ".csv"):
+            if alt != ext and os.path.exists(baza + alt):
+                path, ext = baza + alt, alt
+                break
+
+    if ext == ".parquet":
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_csv(path, usecols=columns, low_memory=False)
+    df = aplica_schema(df)
+    if not categorii:
+        for col in df.select_dtypes("category").columns:
+            df[col] = df[col].astype(object)
+    return df
+
+
+def scrie(df, path):
+    """Scrie tabelul atomic: într-un fișier temporar, apoi îl mută peste `path`,
+    deci un crash în timpul scrierii lasă versiunea veche întreagă."""
+    df = aplica_schema(df)
+    tmp = path + ".tmp"
+    if path.endswith(".parquet"):
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
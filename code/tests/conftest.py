@@ -0,0 +1,5 @@
+import os
+import sys
+
+# modulele pipeline-ului sunt scripturi plate în code/; testele le importă direct
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
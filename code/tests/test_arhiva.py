@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from arhiva import CititorArhiva, ScriitorArhiva
+
+
+@pytest.mark.parametrize("cu_pread", [True, False])
+def test_citire_cu_si_fara_pread(tmp_path, monkeypatch, cu_pread):
+    folder = str(tmp_path / "arhiva")
+    pagini = {i: f"<html>dosar {i} {'ă' * i}</html>" for i in range(1, 50)}
+    with ScriitorArhiva(folder) as scriitor:
+        for i, html in pagini.items():
+            scriitor.adauga(i, html)
+    if not cu_pread and hasattr(os, "pread"):
+        monkeypatch.delattr(os, "pread")
+    with CititorArhiva(folder) as cititor:
+        assert cititor.citeste(7) == pagini[7]
+        assert dict(cititor.itereaza()) == pagini
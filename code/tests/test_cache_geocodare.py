@@ -0,0 +1,45 @@
+import sqlite3
+
+from cache_geocodare import CacheGeocodare, Locatie
+
+
+def test_providerii_nu_isi_vad_rezultatele(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    fals = CacheGeocodare(path, provider="fals")
+    location, din_cache = fals.geocodeaza("Str. Popa Nan 5", lambda q: Locatie(44.0, 26.0, q))
+    assert (location.latitude, din_cache) == (44.0, False)
+    assert fals.contine("STR. POPA  NAN 5")
+
+    nominatim = CacheGeocodare(path)
+    assert not nominatim.contine("Str. Popa Nan 5")
+    location, din_cache = nominatim.geocodeaza("Str. Popa Nan 5", lambda q: None)
+    assert (location, din_cache) == (None, False)
+    assert nominatim.cauta("Str. Popa Nan 5") == (True, None)
+    assert fals.cauta("Str. Popa Nan 5") == (True, Locatie(44.0, 26.0, "Str. Popa Nan 5"))
+
+    # salvat explicit pentru alt provider: nu apare în cache-ul curent
+    nominatim.salveaza("Bd. Dacia 1", Locatie(1.0, 2.0, None), provider="local")
+    assert not nominatim.contine("Bd. Dacia 1")
+    assert CacheGeocodare(path, provider="local").contine("Bd. Dacia 1")
+    fals.close()
+    nominatim.close()
+
+
+def test_cache_vechi_migrat(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE rezultate (interogare TEXT PRIMARY KEY, gasit INTEGER NOT NULL, lat REAL, "
+                 "lon REAL, adresa TEXT, provider TEXT, salvat REAL NOT NULL)")
+    conn.executemany("INSERT INTO rezultate VALUES (?, ?, ?, ?, ?, ?, 0)",
+                     [("a", 1, 1.0, 2.0, "A", "nominatim"), ("b", 1, 3.0, 4.0, "B", "fals"),
+                      ("c", 0, None, None, None, None)])
+    conn.commit()
+    conn.close()
+
+    cache = CacheGeocodare(path)
+    assert cache.cauta("a") == (True, Locatie(1.0, 2.0, "A"))
+    assert cache.cauta("b") == (False, None)
+    assert cache.cauta("c") == (True, None)
+    assert CacheGeocodare(path, provider="fals").contine("b")
+    assert cache.conn.execute("SELECT name FROM sqlite_master WHERE name = 'rezultate'").fetchone() is None
+    cache.close()
@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from date_sintetice import solutii_sintetice
+from clasificare_solutii import classify_solution_regex, clasifica_solutii, extrage_solutie, extrage_solutii
+
+
+def _valori(serie):
+    return [None if pd.isna(v) else v for v in serie]
+
+
+@pytest.mark.parametrize("unice", [False, True])
+def test_identic_cu_apply_original(unice):
+    solutie = solutii_sintetice(20_000, unice=unice)
+    text = solutie.apply(extrage_solutie)
+    assert _valori(extrage_solutii(solutie)) == _valori(text)
+    assert _valori(clasifica_solutii(text)) == _valori(text.apply(classify_solution_regex))
+
+
+def test_precedenta_si_lipsuri():
+    text = pd.Series(["Restituire, compensare", "MRE respins", "revocare", None, "altceva", "  RN "])
+    assert list(clasifica_solutii(text)) == [
+        "Restituire", "Compensare/Despagubiri", "Revocare/Anulare", "NONE", "altceva", "Respins/Negativ",
+    ]
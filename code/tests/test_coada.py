@@ -0,0 +1,48 @@
+from coada import CANCELLED, FAILED, OK, PENDING, RUNNING, CoadaDosare
+
+
+def _stari(coada):
+    with coada.lock:
+        return dict(coada.conn.execute("SELECT id, stare FROM dosare").fetchall())
+
+
+def test_rezervare_ok_esuat(tmp_path):
+    coada = CoadaDosare(str(tmp_path / "coada.sqlite"))
+    coada.adauga([3, 1, 2])
+    coada.adauga([1])  # deja cunoscut: neatins
+    assert coada.ia_urmatorul() == 1
+    assert _stari(coada)[1] == RUNNING
+    assert coada.ia_urmatorul() == 2
+    coada.marcheaza(1, OK)
+    coada.marcheaza(2, FAILED, "timeout")
+    assert coada.ia_urmatorul() == 3
+    coada.marcheaza(3, CANCELLED)
+    assert coada.ia_urmatorul() is None
+    assert coada.statistici() == {OK: 1, FAILED: 1, CANCELLED: 1}
+    assert coada.esuate() == [(2, "timeout")]
+
+    assert coada.reia_esuate() == 1
+    assert coada.ia_urmatorul() == 2
+    coada.marcheaza(2, OK)
+    assert coada.esuate() == []
+    coada.readauga([1])
+    assert coada.ia_urmatorul() == 1
+    coada.close()
+
+
+def test_reluare_dupa_crash(tmp_path):
+    path = str(tmp_path / "coada.sqlite")
+    coada = CoadaDosare(path)
+    coada.adauga(range(1, 5))
+    assert coada.ia_urmatorul() == 1
+    coada.marcheaza(1, OK)
+    assert coada.ia_urmatorul() == 2  # rămâne "running": procesul moare aici
+    coada.close()
+
+    coada = CoadaDosare(path)
+    assert _stari(coada) == {1: OK, 2: PENDING, 3: PENDING, 4: PENDING}
+    assert coada.ia_urmatorul() == 2
+    with coada.lock:
+        (incercari,) = coada.conn.execute("SELECT incercari FROM dosare WHERE id = 2").fetchone()
+    assert incercari == 2
+    coada.close()
@@ -0,0 +1,36 @@
+import fragment
+from arhiva import CititorArhiva, ScriitorArhiva
+from date_sintetice import pagina_sintetica
+from date import parse_dosar
+
+
+def _arhiva_completa(folder, ids):
+    with ScriitorArhiva(folder) as scriitor:
+        for i in ids:
+            scriitor.adauga(i, pagina_sintetica(i))
+
+
+def test_fragmentele_salvate_dau_aceleasi_randuri(tmp_path):
+    ids = range(1, 61)
+    _arhiva_completa(str(tmp_path / "complete"), ids)
+    total, complete = fragment.converteste_arhiva(str(tmp_path / "complete"), str(tmp_path / "fragmente"))
+    assert (total, complete) == (len(ids), 0)
+    with CititorArhiva(str(tmp_path / "fragmente")) as fragmente:
+        for i in ids:
+            salvat = fragmente.citeste(i)
+            pagina = pagina_sintetica(i)
+            assert len(salvat) < len(pagina)
+            assert parse_dosar(salvat) == parse_dosar(pagina)
+
+
+def test_pagina_completa_cand_fragmentul_difera(tmp_path, monkeypatch):
+    # un fragment care pierde blocul "Adrese" nu mai dă aceleași rânduri
+    extrage = fragment.extrage_fragment
+    monkeypatch.setattr(fragment, "extrage_fragment", lambda html: extrage(html).replace("Adrese", "Alte"))
+    pagina = pagina_sintetica(3)
+    assert fragment.fragment_verificat(pagina) == (pagina, False)
+
+    _arhiva_completa(str(tmp_path / "complete"), [3])
+    assert fragment.converteste_arhiva(str(tmp_path / "complete"), str(tmp_path / "fragmente")) == (1, 1)
+    with CititorArhiva(str(tmp_path / "fragmente")) as fragmente:
+        assert fragmente.citeste(3) == pagina
@@ -0,0 +1,27 @@
+import random
+
+from grupare_adrese import grupeaza, id_grup
+from normalizare import parseaza_adresa
+
+ADRESE = ["Str. Mihai Eminescu nr. 5", "Strada MIHAI EMINESCU 5 sector 2", "Mihai Eminescu nr.5",
+          "Str. Mihai Eminescu 7", "Bd. Unirii 12", "Bulevardul UNIRII nr 12"]
+
+
+def _iduri(adrese, ponderi):
+    reprezentanti = grupeaza(adrese, ponderi)
+    membri = {}
+    for a, r in zip(adrese, reprezentanti):
+        membri.setdefault(r, []).append(a)
+    return {a: id_grup(membri[r]) for a, r in zip(adrese, reprezentanti)}
+
+
+def test_id_grup_nu_depinde_de_ordine_si_frecvente():
+    adrese = [parseaza_adresa(a) for a in ADRESE]
+    referinta = _iduri(adrese, [1] * len(adrese))
+    assert referinta[adrese[0]] == referinta[adrese[1]] == referinta[adrese[2]]
+    assert referinta[adrese[0]] != referinta[adrese[3]]
+    rng = random.Random(1)
+    for _ in range(10):
+        amestecate = adrese[:]
+        rng.shuffle(amestecate)
+        assert _iduri(amestecate, [rng.randint(1, 50) for _ in amestecate]) == referinta
@@ -0,0 +1,18 @@
+from jurnal_coordonate import FAILED, NEGASIT, OK, JurnalCoordonate
+
+
+def test_neaplicate_dupa_ultima_intrare(tmp_path):
+    jurnal = JurnalCoordonate(str(tmp_path / "coordonate.sqlite"))
+    jurnal.adauga(2, OK, 44.1, 26.1)
+    jurnal.adauga(2, FAILED, eroare="timeout")  # ultima intrare nu e OK: rândul se sare
+    jurnal.adauga(3, NEGASIT)
+    jurnal.adauga(3, OK, 44.3, 26.3)
+    jurnal.adauga(4, OK, 44.4, 26.4)
+    jurnal.adauga(4, OK, 44.5, 26.5)
+    assert jurnal.neaplicate() == {3: (44.3, 26.3), 4: (44.5, 26.5)}
+
+    (ultimul,) = jurnal.conn.execute("SELECT MAX(id) FROM corectii").fetchone()
+    jurnal.adauga(3, NEGASIT)  # după începutul compactării: nu contează pentru `pana_la`
+    assert jurnal.neaplicate(ultimul) == {3: (44.3, 26.3), 4: (44.5, 26.5)}
+    assert jurnal.neaplicate() == {4: (44.5, 26.5)}
+    jurnal.close()
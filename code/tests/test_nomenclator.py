@@ -0,0 +1,94 @@
+import pytest
+
+from nomenclator import NomenclatorStradal, parseaza_interogare
+
+# două sectoare pătrate alăturate; conturul sectorului 1 e împărțit în două căi,
+# ca în OSM, iar latura comună aparține ambelor relații
+OSM = """<?xml version="1.0" encoding="UTF-8"?>
+<osm version="0.6">
+  <node id="1" lat="44.40" lon="26.00"/>
+  <node id="2" lat="44.40" lon="26.10"/>
+  <node id="3" lat="44.50" lon="26.10"/>
+  <node id="4" lat="44.50" lon="26.00"/>
+  <node id="5" lat="44.40" lon="26.20"/>
+  <node id="6" lat="44.50" lon="26.20"/>
+  <node id="10" lat="44.45" lon="26.02"/>
+  <node id="11" lat="44.45" lon="26.08"/>
+  <node id="12" lat="44.45" lon="26.12"/>
+  <node id="13" lat="44.45" lon="26.18"/>
+  <node id="14" lat="44.42" lon="26.02"/>
+  <node id="15" lat="44.42" lon="26.08"/>
+  <node id="16" lat="44.48" lon="26.12"/>
+  <node id="17" lat="44.48" lon="26.18"/>
+  <node id="20" lat="44.4501" lon="26.03">
+    <tag k="addr:street" v="Strada Mihai Eminescu"/><tag k="addr:housenumber" v="10"/>
+  </node>
+  <node id="21" lat="44.4501" lon="26.15">
+    <tag k="addr:street" v="Strada Mihai Eminescu"/><tag k="addr:housenumber" v="10"/>
+  </node>
+  <way id="100"><nd ref="1"/><nd ref="2"/><nd ref="3"/></way>
+  <way id="101"><nd ref="3"/><nd ref="4"/><nd ref="1"/></way>
+  <way id="102"><nd ref="2"/><nd ref="5"/><nd ref="6"/><nd ref="3"/></way>
+  <way id="200"><nd ref="10"/><nd ref="11"/>
+    <tag k="highway" v="residential"/><tag k="name" v="Strada Mihai Eminescu"/></way>
+  <way id="201"><nd ref="12"/><nd ref="13"/>
+    <tag k="highway" v="residential"/><tag k="name" v="Strada Mihai Eminescu"/></way>
+  <way id="202"><nd ref="14"/><nd ref="15"/>
+    <tag k="highway" v="residential"/><tag k="name" v="Strada Mihai Bravu"/></way>
+  <way id="203"><nd ref="16"/><nd ref="17"/>
+    <tag k="highway" v="residential"/><tag k="name" v="Strada 11 Iunie"/></way>
+  <relation id="1000">
+    <member type="way" ref="100" role="outer"/><member type="way" ref="101" role="outer"/>
+    <tag k="boundary" v="administrative"/><tag k="name" v="Sector 1"/>
+  </relation>
+  <relation id="1001">
+    <member type="way" ref="102" role="outer"/><member type="way" ref="100" role="outer"/>
+    <tag k="boundary" v="administrative"/><tag k="name" v="Sectorul 2"/>
+  </relation>
+</osm>
+"""
+
+
+@pytest.fixture(scope="module")
+def nomenclator(tmp_path_factory):
+    cale = tmp_path_factory.mktemp("osm") / "mic.osm"
+    cale.write_text(OSM, encoding="utf-8")
+    return NomenclatorStradal.din_osm(str(cale))
+
+
+@pytest.mark.parametrize("interogare, asteptat", [
+    ("Strada 11 Iunie 5 sector 2 bucuresti", ("strada", "11 iunie", 5, 2)),
+    ("Strada 1 DECEMBRIE 1918 12 sector 3", ("strada", "1 decembrie 1918", 12, 3)),
+    ("Strada MIHAI EMINESCU 12 sector 1", ("strada", "mihai eminescu", 12, 1)),
+    ("Calea 13 SEPTEMBRIE 90", ("calea", "13 septembrie", 90, None)),
+])
+def test_numerele_din_nume_raman_in_nume(interogare, asteptat):
+    assert parseaza_interogare(interogare) == asteptat
+
+
+def test_sectoarele_strazilor(nomenclator):
+    sectoare = {s.nume_complet: sorted(s.sectoare) for s in nomenclator.strazi}
+    assert sectoare["Strada Mihai Eminescu"] == [1, 2]
+    assert sectoare["Strada Mihai Bravu"] == [1]
+    assert sectoare["Strada 11 Iunie"] == [2]
+
+
+def test_sectorul_alege_portiunea_strazii(nomenclator):
+    for sector, lon in [(1, 26.03), (2, 26.15)]:
+        r = nomenclator.cauta(f"Strada MIHAI EMINESCU 10 sector {sector} bucuresti")
+        assert r.metoda == "exact"
+        assert r.longitude == pytest.approx(lon, abs=1e-6)
+    r = nomenclator.cauta("Strada MIHAI EMINESCU sector 2 bucuresti")
+    assert 26.10 < r.longitude < 26.20
+
+
+def test_numele_din_alt_sector_e_penalizat(nomenclator):
+    assert nomenclator.cauta("Strada 11 IUNIE sector 2").incredere > nomenclator.cauta("Strada 11 IUNIE sector 1").incredere
+
+
+def test_egalitatea_scade_increderea(nomenclator):
+    sigur = nomenclator.cauta("Strada MIHAI BRAVU")
+    ambiguu = nomenclator.cauta("Strada MIHAI")
+    assert sigur.incredere >= 0.5
+    assert ambiguu.incredere < 0.8
+    assert ambiguu.incredere <= sigur.incredere / 2 + 1e-9
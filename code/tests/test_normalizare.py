@@ -0,0 +1,24 @@
+import csv
+import os
+
+import pytest
+
+from date_sintetice import adrese_sintetice
+from normalizare import normalize_address, normalize_address_original, normalizeaza_lot
+
+# corpus de referință opțional, scris cu `python benchmark.py normalizare --golden ... --tabel ...`
+GOLDEN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "normalizare_golden.tsv")
+
+
+def test_compilat_identic_cu_originalul():
+    adrese = adrese_sintetice(20_000)
+    asteptat = [normalize_address_original(a) for a in adrese]
+    assert [normalize_address(a) for a in adrese] == asteptat
+    assert normalizeaza_lot(adrese) == asteptat
+
+
+@pytest.mark.skipif(not os.path.exists(GOLDEN), reason="fără corpus de referință")
+def test_corpus_de_referinta():
+    with open(GOLDEN, newline="", encoding="utf-8") as f:
+        referinta = [tuple(r) for r in csv.reader(f, delimiter="\t")]
+    assert [(a, normalize_address(a)) for a, _ in referinta] == referinta
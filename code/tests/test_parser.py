@@ -0,0 +1,22 @@
+import pytest
+
+import date
+from date_sintetice import pagina_sintetica
+
+
+@pytest.mark.parametrize("i", range(1, 301))
+def test_lxml_identic_cu_bs4(i):
+    html = pagina_sintetica(i)
+    assert date.parse_dosar_lxml(html.encode("utf-8")) == date.parse_dosar(html)
+
+
+def test_revenirea_la_bs4_e_raportata(monkeypatch, capsys):
+    def esueaza(html_content):
+        raise ValueError("pagină stricată")
+
+    monkeypatch.setattr(date, "parse_dosar_lxml", esueaza)
+    html = pagina_sintetica(7)
+    esecuri = []
+    assert date.parseaza(html.encode("utf-8"), parser="lxml", dosar=7, esecuri=esecuri) == date.parse_dosar(html)
+    assert esecuri == [(7, "ValueError: pagină stricată")]
+    assert "Dosarul 7" in capsys.readouterr().out
@@ -0,0 +1,14 @@
+import pytest
+
+from date_sintetice import dosare_cu_acte
+from pdfuri import potriveste_pdfuri, potriveste_pdfuri_original
+
+
+@pytest.mark.parametrize("n_acte", [300, 3000])
+def test_hash_join_identic_cu_bucla_originala(n_acte):
+    df, intrari = dosare_cu_acte(3000, n_acte)
+    nume, hashuri = potriveste_pdfuri(df, intrari)
+    nume_ref, hashuri_ref = potriveste_pdfuri_original(df, intrari)
+    assert any(nume)
+    assert list(nume) == list(nume_ref)
+    assert list(hashuri) == list(hashuri_ref)
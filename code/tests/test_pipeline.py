@@ -0,0 +1,54 @@
+import os
+
+import pipeline
+
+
+def test_planul_nu_creeaza_si_nu_scrie_starea(tmp_path):
+    db = str(tmp_path / "pipeline.sqlite")
+    fisier = tmp_path / "intrare.txt"
+    fisier.write_text("a", encoding="utf-8")
+
+    with pipeline.StarePipeline(db, doar_citire=True) as stare:
+        h = stare.hash_fisier(str(fisier))
+        assert stare.ultima("x") is None
+    assert not os.path.exists(db)
+
+    with pipeline.StarePipeline(db) as stare:
+        stare.salveaza("x", "ampr", {}, 1.0)
+    continut = open(db, "rb").read()
+    fisier.write_text("ab", encoding="utf-8")
+    with pipeline.StarePipeline(db, doar_citire=True) as stare:
+        assert stare.ultima("x")[0] == "ampr"
+        assert stare.hash_fisier(str(fisier)) != h
+    assert open(db, "rb").read() == continut
+
+
+def test_intrari_obligatorii_si_alternative(tmp_path):
+    (tmp_path / "x.py").write_text("open('x.txt', 'w').write('x')\n", encoding="utf-8")
+    etapa = pipeline.Etapa("x", "x.py", ["arhiva", "raspunsuri", "nomenclator"], ["x.txt"],
+                           alternative=("arhiva", "raspunsuri"))
+    mesaje = []
+
+    def ruleaza():
+        mesaje.clear()
+        with pipeline.StarePipeline(str(tmp_path / "stare.sqlite")) as stare:
+            return pipeline.ruleaza([etapa], radacina=str(tmp_path), stare=stare, afiseaza=mesaje.append)["x"][0]
+
+    (tmp_path / "arhiva").mkdir()
+    assert ruleaza() == pipeline.ESUATA  # o alternativă nu ține locul unei intrări obligatorii
+    assert mesaje == ["❌ x: lipsesc intrările nomenclator"]
+    (tmp_path / "arhiva").rmdir()
+    (tmp_path / "nomenclator").write_text("n", encoding="utf-8")
+    assert ruleaza() == pipeline.ESUATA
+    assert mesaje == ["❌ x: lipsesc intrările arhiva / raspunsuri"]
+    (tmp_path / "raspunsuri").mkdir()
+    assert ruleaza() == pipeline.RULATA
+    assert (tmp_path / "x.txt").exists()
+
+
+def test_amprenta_fara_alternative_neschimbata(tmp_path):
+    etapa = pipeline.Etapa("x", "x.py", [], ["x.txt"], resetare=("x.csv",))
+    (tmp_path / "x.py").write_text("", encoding="utf-8")
+    with pipeline.StarePipeline(str(tmp_path / "stare.sqlite")) as stare:
+        _, componente = pipeline.amprenta(etapa, str(tmp_path), stare)
+    assert componente["etapa"] == '["x", "x.py", [], ["x.txt"], ".", ["x.csv"]]'
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+import referinte_acte as ra
+from date_sintetice import texte_acte
+
+
+def test_identic_cu_extract_all_dpgs():
+    df = texte_acte(5000)
+    acte = ra.referinte(df)
+    asteptat = []
+    for dosar_pmb, solutie, istorie in df[["Dosar PMB", *ra.SURSE]].fillna("").drop_duplicates().itertuples(index=False):
+        for text in (solutie, istorie):
+            asteptat.extend((ra.extract_dosar_number(dosar_pmb), e["dpg"], e["date_raw"], e["date_iso"], e["year"])
+                            for e in ra.extract_all_dpgs(text))
+    obtinut = [tuple(None if pd.isna(v) else v for v in r)
+               for r in acte[["dosar", "dpg", "data_raw", "data", "an"]].itertuples(index=False)]
+    assert obtinut == [tuple(None if v is None else v for v in r) for r in asteptat]
+
+
+@pytest.mark.parametrize("brut", ["2019-02-28", "28/02/2019", "2019/02/28", "28-02-2019",
+                                  "2019-02-30", "30/02/2019", "2019/02/30", "30-02-2019"])
+def test_data_iso_ca_normalize_date(brut):
+    iso = ra.normalize_date(brut)
+    assert ra.data_iso(brut) == (iso, ra.parse_year_from_iso(iso))
+
+
+def _randuri(df):
+    return [tuple(None if pd.isna(v) else v for v in r) for r in df.astype(object).itertuples(index=False)]
+
+
+def test_incarca_reconstruieste_la_alta_amprenta(tmp_path, monkeypatch):
+    sursa = str(tmp_path / "dosare.csv")
+    texte_acte(200).to_csv(sursa, index=False)
+    destinatie = ra.cale_acte(sursa)
+    assert destinatie == str(tmp_path / "dosare_acte.parquet")
+    acte = _randuri(ra.incarca(sursa))
+    assert _randuri(ra.incarca(sursa)) == acte
+
+    # același fișier, mai nou decât sursa, dar construit de altă versiune a extragerii
+    pd.DataFrame({"dpg": ["vechi"]}).to_parquet(destinatie)
+    assert len(ra.incarca(sursa)) == 1
+    monkeypatch.setattr(ra, "VERSIUNE", ra.VERSIUNE + 1)
+    assert _randuri(ra.incarca(sursa)) == acte
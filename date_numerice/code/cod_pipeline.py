@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Renderele folosesc modulele pipeline-ului (tabel.py) din code/ de la
+# rădăcina repo-ului; `import cod_pipeline` le face importabile, oricare ar
+# fi directorul curent.
+COD = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "code"))
+if COD not in sys.path:
+    sys.path.insert(0, COD)
@@ -3,6 +3,9 @@ import plotly.express as px
 import geopandas as gpd
 from shapely.geometry import Point
 
+import cod_pipeline  # noqa: F401  (code/ în sys.path, pentru tabel)
+import tabel
+
 # TOP 5 LEGI
 top_legi = ["92/1950", "223/1974", "111/1951", "224/1951", "4/1973"]
 
@@ -15,16 +18,17 @@ color_map = {
     "Altele": "#7f7f7f"
 }
 
-df = pd.read_csv("../../pdfuri_restituire_deposedare.csv")
+COLOANE = [
+    "lat", "lon", "An_solutie", "Solutie_grup", "Lege", "Dosar PMB", "Adresa contemporană", "Tip proprietate", "Pdf_nume",
+]
+
+df = tabel.citeste(tabel.cale("../../pdfuri_restituire_deposedare"), columns=COLOANE, categorii=False)
 df = df[df["Solutie_grup"] == "Restituire"].copy()
 
 # Curățare coordonate
-df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
-df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
 df = df.dropna(subset=["lat", "lon"])
 
 # Curățare an
-df["An_solutie"] = pd.to_numeric(df["An_solutie"], errors="coerce")
 df = df.dropna(subset=["An_solutie"])
 df["An_solutie"] = df["An_solutie"].astype(int)
 
@@ -3,6 +3,9 @@ import plotly.express as px
 import geopandas as gpd
 from shapely.geometry import Point
 
+import cod_pipeline  # noqa: F401  (code/ în sys.path, pentru tabel)
+import tabel
+
 # =========================
 # 1) CONFIG: TOP LEGI + CULORI
 # =========================
@@ -20,17 +23,18 @@ color_map = {
 # =========================
 # 2) LOAD PDF CSV
 # =========================
-df = pd.read_csv("../../pdfuri_restituire_deposedare.csv")
+COLOANE = [
+    "lat", "lon", "An_solutie", "Solutie_grup", "Lege", "Dosar PMB", "Adresa contemporană", "Tip proprietate", "Pdf_nume",
+]
+
+df = tabel.citeste(tabel.cale("../../pdfuri_restituire_deposedare"), columns=COLOANE, categorii=False)
 
 df = df[df["Solutie_grup"] == "Restituire"].copy()
 
 # coordonate
-df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
-df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
 df = df.dropna(subset=["lat", "lon"])
 
 # an
-df["An_solutie"] = pd.to_numeric(df["An_solutie"], errors="coerce")
 df = df.dropna(subset=["An_solutie"])
 df["An_solutie"] = df["An_solutie"].astype(int)
 
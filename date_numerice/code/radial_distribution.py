@@ -5,10 +5,15 @@ import geopandas as gpd
 from shapely.geometry import Point
 import numpy as np
 
-df = pd.read_csv("dosare_pmb.csv")
+import cod_pipeline  # noqa: F401  (code/ în sys.path, pentru tabel)
+import tabel
+
+COLOANE = [
+    "lat", "lon", "Solutie_grup",
+]
+
+df = tabel.citeste(tabel.cale("dosare_pmb"), columns=COLOANE, categorii=False)
 
-df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
-df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
 df = df.dropna(subset=["lat", "lon", "Solutie_grup"])
 
 df = df[df["Solutie_grup"] != "NONE"]
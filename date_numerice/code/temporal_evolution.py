@@ -3,14 +3,18 @@ import plotly.express as px
 import geopandas as gpd
 from shapely.geometry import Point
 
+import cod_pipeline  # noqa: F401  (code/ în sys.path, pentru tabel)
+import tabel
 
-df = pd.read_csv("dosare_pmb.csv")
 
-df["lat"] = pd.to_numeric(df["lat"], errors="coerce")
-df["lon"] = pd.to_numeric(df["lon"], errors="coerce")
+COLOANE = [
+    "lat", "lon", "An_solutie", "Solutie_grup", "Dosar PMB", "Adresa contemporană", "Adresa istorică", "Tip proprietate",
+]
+
+df = tabel.citeste(tabel.cale("dosare_pmb"), columns=COLOANE, categorii=False)
+
 df = df.dropna(subset=["lat", "lon"])
 
-df["An_solutie"] = pd.to_numeric(df["An_solutie"], errors="coerce")
 df = df.dropna(subset=["An_solutie"])
 df["An_solutie"] = df["An_solutie"].astype(int)
 